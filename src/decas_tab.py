@@ -1,11 +1,21 @@
-import os
-import pandas as pd
 from PySide6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QLabel, 
                               QComboBox, QSpinBox, QGroupBox, QCalendarWidget,
-                              QPushButton, QLineEdit, QScrollArea, QCompleter, QApplication,
-                              QCheckBox)
+                              QPushButton, QLineEdit, QScrollArea,
+                              QCheckBox, QTableView, QHeaderView, QAbstractItemView)
 from PySide6.QtCore import QDate, Qt
+import numpy as np
 from decameron_styles import GROUPBOX_STYLE, COMBOBOX_STYLE, LABEL_STYLE
+from pricing.cache import quote_cache
+from pricing.compare import compare_decas
+from pricing.engine import ADMIN_USD_PER_DECA, DECA_TO_USD
+from pricing.flexible import cheapest_decas_check_ins
+from pricing.room_mix import cheapest_room_mixes
+from pricing.search import HotelSearchIndex
+from pricing.seasons import AUTO_SEASON
+from pricing.tariffs import SEASONS
+from widgets import ComparisonDialog, FlexibleDatesDialog
+from models import ComparisonModel, DecasBreakdownModel, HotelSearchProxyModel, shared_hotel_model
+from recalc import RecalcScheduler
 
 class DateInput(QLineEdit):
     def __init__(self, parent=None):
@@ -34,7 +44,15 @@ class DecasTab(QWidget):
         self.shared_state = shared_state
         self.shared_state.add_observer(self)
         
-        self.df = pd.read_csv(os.path.join(os.path.dirname(os.path.dirname(__file__)), 'assets', 'data', 'conversion_decas.csv'))
+        # Las tarifas llegan después desde el cargador en segundo plano (set_tariffs)
+        self.tariffs = None
+        self.hotel_model = None
+        
+        # Última cotización mostrada; si no cambia no se vuelve a generar el texto
+        self.quote = None
+        
+        # Un solo recálculo por ráfaga de señales; oculta, la pestaña solo queda pendiente
+        self.recalc = RecalcScheduler(self.calculate_total, active=False, parent=self)
         
         # Usar fechas del shared_state
         self.check_in_date = self.shared_state.check_in
@@ -43,24 +61,54 @@ class DecasTab(QWidget):
         self.setup_ui()
         self.setup_connections()
         
-        # Inicializar los combos
-        self.hotel_combo.addItems(sorted(self.df['Hotel'].unique()))
-        self.season_combo.addItems(["Baja", "Media", "Alta"])
+        # Inicializar las temporadas sin modificar el shared_state
+        self.season_combo.blockSignals(True)
+        self.season_combo.addItems(list(SEASONS) + [AUTO_SEASON])
+        self.season_combo.setCurrentText(self.shared_state.season)
+        self.season_combo.blockSignals(False)
+        
+        self.set_loading("Cargando tarifas...")
+
+    def set_loading(self, message):
+        """Deshabilita la selección mientras no hay tarifas y muestra el estado"""
+        self.hotel_combo.setEnabled(False)
+        self.season_combo.setEnabled(False)
+        self.show_message(message)
+
+    def show_load_error(self, message):
+        self.show_message(f"Error cargando tarifas: {message}")
+
+    def show_message(self, message):
+        self.quote = None
+        self.breakdown_model.set_quote(None)
+        self.result_label.setText(message)
+
+    def set_tariffs(self, tariffs):
+        """Recibe el índice de tarifas y habilita la pestaña"""
+        self.tariffs = tariffs
+        
+        # Llenar el combo sin disparar cambios intermedios en el shared_state
+        self.hotel_combo.blockSignals(True)
+        self.hotel_model = shared_hotel_model(self.tariffs)
+        self.hotel_search.set_hotels(self.hotel_model, HotelSearchIndex.from_tariffs(self.tariffs))
         
         # Establecer valores iniciales desde shared_state
         if self.shared_state.hotel:
             self.hotel_combo.setCurrentText(self.shared_state.hotel)
         else:
             # Si no hay hotel seleccionado, establecer Isleño como default
-            isleno_index = self.hotel_combo.findText("Isleño")
+            isleno_index = self.hotel_combo.findText("DECAMERON ISLEÑO")
             if isleno_index >= 0:
-                self.hotel_combo.setCurrentText("Isleño")
-                self.shared_state.hotel = "Isleño"
+                self.hotel_combo.setCurrentIndex(isleno_index)
+        self.hotel_combo.blockSignals(False)
         
-        self.season_combo.setCurrentText(self.shared_state.season)
+        self.hotel_combo.setEnabled(True)
+        self.season_combo.setEnabled(True)
+        if not self.shared_state.hotel:
+            self.shared_state.hotel = self.hotel_combo.currentText()
         
         # Calcular total inicial
-        self.calculate_total()
+        self.recalc.schedule()
         
     def setup_ui(self):
         # Contenedor principal con scroll
@@ -93,11 +141,8 @@ class DecasTab(QWidget):
         self.hotel_combo.setInsertPolicy(QComboBox.NoInsert)
         self.hotel_combo.setMinimumWidth(300)
         self.hotel_combo.setStyleSheet(COMBOBOX_STYLE)
-        completer = QCompleter(self.hotel_combo.model(), self.hotel_combo)
-        completer.setCaseSensitivity(Qt.CaseInsensitive)
-        completer.setFilterMode(Qt.MatchContains)
-        completer.setCompletionMode(QCompleter.PopupCompletion)
-        self.hotel_combo.setCompleter(completer)
+        # Búsqueda sin tildes por nombre, país y categoría (el índice llega con las tarifas)
+        self.hotel_search = HotelSearchProxyModel.install(self.hotel_combo)
         
         season_label = QLabel("Temporada:")
         season_label.setStyleSheet(LABEL_STYLE)
@@ -144,6 +189,14 @@ class DecasTab(QWidget):
         
         dates_layout.addLayout(dates_container)
         
+        # Búsqueda de las entradas más baratas con la misma cantidad de noches
+        flexible_layout = QHBoxLayout()
+        self.flexible_dates_button = QPushButton("Buscar fechas más baratas")
+        self.flexible_dates_button.clicked.connect(self.show_flexible_dates)
+        flexible_layout.addWidget(self.flexible_dates_button)
+        flexible_layout.addStretch()
+        dates_layout.addLayout(flexible_layout)
+        
         # Calendario popup (inicialmente oculto)
         self.calendar = QCalendarWidget()
         self.calendar.setMinimumDate(QDate.currentDate())
@@ -241,7 +294,7 @@ class DecasTab(QWidget):
                     background: #e0e0e0;
                 }
             """)
-            spinner.valueChanged.connect(self.calculate_total)
+            spinner.valueChanged.connect(self.recalc.schedule_debounced)
             
             self.room_spinners[tipo] = spinner
             
@@ -250,6 +303,23 @@ class DecasTab(QWidget):
             room_layout.addStretch()
             rooms_layout.addLayout(room_layout)
         
+        # Mezcla más barata de habitaciones para un grupo
+        group_layout = QHBoxLayout()
+        group_layout.setSpacing(12)
+        self.guests_spinner = QSpinBox()
+        self.guests_spinner.setRange(1, 2000)
+        self.guests_spinner.setValue(2)
+        self.guests_spinner.setMinimumWidth(100)
+        self.guests_spinner.wheelEvent = lambda event: custom_wheel_event(self.guests_spinner, event)
+        self.guests_spinner.setFocusPolicy(Qt.ClickFocus)
+        self.room_mix_button = QPushButton("Mejor combinación")
+        self.room_mix_button.clicked.connect(self.show_room_mixes)
+        group_layout.addWidget(QLabel("Huéspedes:"))
+        group_layout.addWidget(self.guests_spinner)
+        group_layout.addWidget(self.room_mix_button)
+        group_layout.addStretch()
+        rooms_layout.addLayout(group_layout)
+        
         rooms_group.setLayout(rooms_layout)
         main_layout.addWidget(rooms_group)
         
@@ -267,13 +337,21 @@ class DecasTab(QWidget):
         admin_checkbox_layout = QHBoxLayout()
         self.include_admin_checkbox = QCheckBox("Incluir administración anual en el cálculo")
         self.include_admin_checkbox.setChecked(True)  # Por defecto activado
-        self.include_admin_checkbox.toggled.connect(self.calculate_total)
+        self.include_admin_checkbox.toggled.connect(self.recalc.schedule)
         admin_checkbox_layout.addWidget(self.include_admin_checkbox)
         admin_checkbox_layout.addStretch()
         
         admin_layout.addWidget(admin_description)
         admin_layout.addLayout(admin_checkbox_layout)
         
+        # Comparar la misma mezcla de habitaciones en todos los hoteles
+        compare_layout = QHBoxLayout()
+        self.compare_button = QPushButton("Comparar hoteles")
+        self.compare_button.clicked.connect(self.show_comparison)
+        compare_layout.addWidget(self.compare_button)
+        compare_layout.addStretch()
+        admin_layout.addLayout(compare_layout)
+        
         admin_group.setLayout(admin_layout)
         main_layout.addWidget(admin_group)
         
@@ -283,6 +361,21 @@ class DecasTab(QWidget):
         result_layout = QVBoxLayout()
         result_layout.setContentsMargins(15, 15, 15, 15)
         
+        # Tabla con el desglose por noche; solo se pintan las filas visibles
+        self.breakdown_model = DecasBreakdownModel(self)
+        self.breakdown_view = QTableView()
+        self.breakdown_view.setModel(self.breakdown_model)
+        self.breakdown_view.setMinimumHeight(250)
+        self.breakdown_view.setAlternatingRowColors(True)
+        self.breakdown_view.setSelectionMode(QAbstractItemView.NoSelection)
+        self.breakdown_view.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        self.breakdown_view.verticalHeader().hide()
+        # Filas de altura fija para no medir cada fila al desplazarse
+        self.breakdown_view.verticalHeader().setSectionResizeMode(QHeaderView.Fixed)
+        self.breakdown_view.verticalHeader().setDefaultSectionSize(24)
+        self.breakdown_view.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
+        result_layout.addWidget(self.breakdown_view)
+        
         # Scroll area para los resultados
         result_scroll = QScrollArea()
         result_scroll.setWidgetResizable(True)
@@ -357,8 +450,10 @@ class DecasTab(QWidget):
             if date >= self.check_out_date:
                 self.check_out_date = date.addDays(1)
                 self.check_out_input.setText(self.check_out_date.toString("dd/MM/yyyy"))
-            # Actualizar shared_state
-            self.shared_state.check_in = date
+            # Actualizar shared_state con ambas fechas en un solo cambio
+            with self.shared_state.batch():
+                self.shared_state.check_in = date
+                self.shared_state.check_out = self.check_out_date
         else:
             if date <= self.check_in_date:
                 date = self.check_in_date.addDays(1)
@@ -368,11 +463,104 @@ class DecasTab(QWidget):
             self.shared_state.check_out = date
         
         self.calendar.hide()
-        self.calculate_total()
+        self.recalc.schedule()
+
+    def show_flexible_dates(self):
+        """Muestra las entradas más baratas de los próximos meses para la estadía actual"""
+        nights = self.check_in_date.daysTo(self.check_out_date)
+        if self.tariffs is None or nights <= 0:
+            return
+        
+        rooms = {tipo: spinner.value() for tipo, spinner in self.room_spinners.items()}
+        try:
+            options = cheapest_decas_check_ins(self.tariffs, self.hotel_combo.currentText(),
+                                               self.season_combo.currentText(), nights,
+                                               QDate.currentDate().toPython(), rooms)
+        except ValueError as e:
+            # Hotel o temporada que el tarifario no tiene
+            self.show_message(str(e))
+            return
+        dialog = FlexibleDatesDialog(
+            options, lambda decas: f"{decas:,.0f} decas (${decas * DECA_TO_USD:,.2f})", self)
+        if dialog.exec() and dialog.selected is not None:
+            self.set_stay(QDate(dialog.selected.check_in), QDate(dialog.selected.check_out))
+
+    def show_comparison(self):
+        """Cotiza la mezcla de habitaciones actual en todos los hoteles en una tabla ordenable"""
+        if self.tariffs is None or self.check_in_date.daysTo(self.check_out_date) <= 0:
+            return
+        
+        rooms = {tipo: spinner.value() for tipo, spinner in self.room_spinners.items()}
+        try:
+            comparison = compare_decas(self.tariffs, self.season_combo.currentText(),
+                                       self.check_in_date.toPython(), self.check_out_date.toPython(), rooms,
+                                       include_admin=self.include_admin_checkbox.isChecked())
+        except ValueError as e:
+            # Fechas fuera del calendario de temporadas
+            self.show_message(str(e))
+            return
+        usd = lambda value: f"${value:,.2f}"
+        model = ComparisonModel([
+            ("Hotel", comparison.hotels, str),
+            ("Decas", comparison.total_decas, lambda value: f"{value:,.0f}"),
+            ("USD", comparison.total_usd, usd),
+            ("Administración", comparison.admin_usd, usd),
+            ("Total USD", comparison.total_with_admin, usd),
+            ("Total COP", comparison.total_cop, lambda value: f"${value:,.0f}"),
+        ])
+        dialog = ComparisonDialog(f"Comparación de hoteles - temporada {self.season_combo.currentText()}", model, self)
+        if dialog.exec() and dialog.selected is not None:
+            self.hotel_combo.setCurrentText(comparison.hotels[dialog.selected])
+
+    def show_room_mixes(self):
+        """Lista las mezclas de habitaciones más baratas para el número de huéspedes"""
+        if self.tariffs is None or self.check_in_date.daysTo(self.check_out_date) <= 0:
+            return
+        
+        try:
+            mixes = cheapest_room_mixes(self.tariffs, self.hotel_combo.currentText(),
+                                        self.season_combo.currentText(), self.check_in_date.toPython(),
+                                        self.check_out_date.toPython(), self.guests_spinner.value())
+        except ValueError as e:
+            # Fechas fuera del calendario de temporadas
+            self.show_message(str(e))
+            return
+        counts = lambda room_type: np.array([mix.rooms.get(room_type, 0) for mix in mixes])
+        integer = lambda value: f"{value:,.0f}"
+        model = ComparisonModel([
+            ("Dobles", counts('Doble'), integer),
+            ("Triples", counts('Triple'), integer),
+            ("Cuádruples", counts('Cuádruple'), integer),
+            ("Capacidad", np.array([mix.capacity for mix in mixes]), integer),
+            ("Decas", np.array([mix.total_decas for mix in mixes]), integer),
+            ("USD", np.array([mix.total_usd for mix in mixes]), lambda value: f"${value:,.2f}"),
+        ])
+        dialog = ComparisonDialog(
+            f"Combinaciones para {self.guests_spinner.value()} huéspedes - {self.hotel_combo.currentText()}",
+            model, self, hint="Haga clic en un encabezado para ordenar; doble clic para usar la combinación.",
+            choose_text="Usar combinación")
+        # La tabla se ordena por la primera columna al activar el orden; se muestra por decas
+        dialog.table.sortByColumn(4, Qt.AscendingOrder)
+        if dialog.exec() and dialog.selected is not None:
+            for room_type, spinner in self.room_spinners.items():
+                count = mixes[dialog.selected].rooms.get(room_type, 0)
+                spinner.setMaximum(max(spinner.maximum(), count))
+                spinner.setValue(count)
+
+    def set_stay(self, check_in, check_out):
+        """Cambia ambas fechas y las publica juntas en el shared state"""
+        self.check_in_date = check_in
+        self.check_out_date = check_out
+        self.check_in_input.setText(check_in.toString("dd/MM/yyyy"))
+        self.check_out_input.setText(check_out.toString("dd/MM/yyyy"))
+        with self.shared_state.batch():
+            self.shared_state.check_in = check_in
+            self.shared_state.check_out = check_out
+        self.recalc.schedule()
 
     def calculate_total(self):
         hotel = self.hotel_combo.currentText()
-        if not hotel:
+        if not hotel or self.tariffs is None:
             return
             
         check_in_date = self.check_in_date
@@ -380,112 +568,95 @@ class DecasTab(QWidget):
         days = check_in_date.daysTo(check_out_date)
         
         if days <= 0:
-            self.result_label.setText("Por favor seleccione fechas válidas")
+            self.show_message("Por favor seleccione fechas válidas")
+            return
+        
+        rooms = {tipo: spinner.value() for tipo, spinner in self.room_spinners.items()}
+        try:
+            quote = quote_cache.quote_decas(self.tariffs, hotel, self.season_combo.currentText(),
+                                            check_in_date.toPython(), check_out_date.toPython(), rooms,
+                                            include_admin=self.include_admin_checkbox.isChecked())
+        except ValueError as e:
+            # Fechas fuera del calendario de temporadas o tipo de habitación que el hotel no ofrece
+            self.show_message(str(e))
             return
-            
-        # Calcular tarifas por tipo de habitación
-        total_general = 0.0
-        total_decas = 0
-        desglose = []
         
-        # Obtener datos del hotel
-        datos_hotel = self.df[self.df['Hotel'] == hotel]
-        
-        for tipo, spinner in self.room_spinners.items():
-            num_habitaciones = spinner.value()
-            if num_habitaciones > 0:
-                subtotal_tipo = 0.0
-                desglose_tipo = []
-                
-                # Procesar días
-                current_date = check_in_date
-                while current_date < check_out_date:
-                    # Si es sábado (6) o domingo (7)
-                    if current_date.dayOfWeek() >= 6:
-                        datos_dia = datos_hotel[datos_hotel['Dias de la Semana'] == 'Fin de semana']
-                    else:
-                        datos_dia = datos_hotel[datos_hotel['Dias de la Semana'] == 'Entre Semana']
-                    
-                    if not datos_dia.empty:
-                        tarifa_decas = float(datos_dia[tipo].iloc[0])
-                        total_decas += tarifa_decas
-                        tarifa_usd = tarifa_decas * 5  # Convertir decas a USD
-                        subtotal_tipo += tarifa_usd
-                        desglose_tipo.append(f"{current_date.toString('dd/MM/yyyy')}: ${tarifa_usd:.2f} (${tarifa_decas:.2f} decas)")
-                    
-                    current_date = current_date.addDays(1)
-                
-                # Multiplicar por número de habitaciones
-                total_tipo = subtotal_tipo * num_habitaciones
-                total_decas = total_decas * num_habitaciones
-                total_general += total_tipo
-                
-                # Agregar al desglose
-                if num_habitaciones > 0:
-                    desglose.append(f"\n{tipo}s ({num_habitaciones}):")
-                    desglose.extend([f"  {linea}" for linea in desglose_tipo])
-                    if num_habitaciones > 1:
-                        desglose.append(f"  Subtotal por habitación: ${subtotal_tipo:.2f}")
+        # La caché devuelve la misma cotización para las mismas entradas: el texto ya está en pantalla
+        if quote is self.quote:
+            return
+        self.quote = quote
+        self.breakdown_model.set_quote(quote, self.tariffs.weekend_days)
+        self.result_label.setText(self.render_summary(quote))
+
+    def render_summary(self, quote):
+        """Genera el texto de totales; el detalle por noche está en la tabla"""
+        desglose = []
+        for line in quote.lines:
+            desglose.append(f"{line.room_type}s ({line.rooms}): ${line.usd:.2f}")
+            if line.rooms > 1:
+                desglose.append(f"  Subtotal por habitación: ${line.usd_per_room:.2f}")
+            if line.week_blocks:
+                weeks = len(line.week_blocks)
+                desglose.append(f"  Semana Completa: {weeks} {'bloque' if weeks == 1 else 'bloques'}, "
+                                f"ahorro {line.week_savings * line.rooms:.0f} decas")
+            if line.unpriced_nights:
+                desglose.append(f"  Sin tarifa: {line.unpriced_nights} "
+                                f"{'noche' if line.unpriced_nights == 1 else 'noches'}, no incluidas en el total")
+        
+        if any(line.unpriced_nights for line in quote.lines):
+            desglose.append("\nAdvertencia: el hotel no tiene tarifa para algunas noches; "
+                            "el total no las incluye")
         
         # Mostrar el total de decas
-        desglose.append(f"\nTOTAL DECAS: {total_decas:.0f}")
+        desglose.append(f"\nTOTAL DECAS: {quote.total_decas:.0f}")
         
         # Mostrar el total general en USD
-        desglose.append(f"TOTAL USD: ${total_general:.0f}")
+        desglose.append(f"TOTAL USD: ${quote.total_usd:.0f}")
         
-        # Calcular y mostrar la administración anual
-        if hasattr(self, 'include_admin_checkbox') and self.include_admin_checkbox.isChecked():
-            admin_decas = max(70, total_decas)
-            admin_usd = admin_decas * 0.9
+        # Mostrar la administración anual
+        if quote.include_admin:
             desglose.append(f"\nADMINISTRACIÓN ANUAL:")
-            desglose.append(f"  Decas: {admin_decas:.0f}")
-            desglose.append(f"  USD (0.9 × Deca): ${admin_usd:.2f}")
-            
-            # Añadir al total general
-            total_general += admin_usd
-            desglose.append(f"\nTOTAL USD (con administración): ${total_general:.2f}")
+            desglose.append(f"  Decas: {quote.admin_decas:.0f}")
+            desglose.append(f"  USD ({ADMIN_USD_PER_DECA} × Deca): ${quote.admin_usd:.2f}")
+            desglose.append(f"\nTOTAL USD (con administración): ${quote.total_with_admin:.2f}")
         
-        # Calcular y mostrar el total en COP
-        total_cop = total_general * 4000
-        desglose.append(f"TOTAL COP: ${total_cop:,.0f}")
+        # Mostrar el total en COP
+        desglose.append(f"TOTAL COP: ${quote.total_cop:,.0f}")
         
-        self.result_label.setText("\n".join(desglose))
+        return "\n".join(desglose)
 
     def _on_hotel_changed(self, hotel):
         """Actualiza el hotel en el shared state"""
         self.shared_state.hotel = hotel
-        self.calculate_total()
+        self.recalc.schedule()
 
     def _on_season_changed(self, season):
         """Actualiza la temporada en el shared state"""
         self.shared_state.season = season
-        self.calculate_total()
+        self.recalc.schedule()
 
-    def on_hotel_changed(self, hotel):
-        """Recibe notificación de cambio de hotel desde shared state"""
-        if hotel != self.hotel_combo.currentText():
-            self.hotel_combo.setCurrentText(hotel)
-            self.calculate_total()
-            
-    def on_season_changed(self, season):
-        """Recibe notificación de cambio de temporada desde shared state"""
-        if season != self.season_combo.currentText():
-            self.season_combo.setCurrentText(season)
-            self.calculate_total()
+    def on_state_changed(self, changes):
+        """Recibe en una sola notificación los cambios del shared state"""
+        if "hotel" in changes and changes["hotel"] != self.hotel_combo.currentText():
+            self.hotel_combo.setCurrentText(changes["hotel"])
+        if "season" in changes and changes["season"] != self.season_combo.currentText():
+            self.season_combo.setCurrentText(changes["season"])
+        if "check_in" in changes and changes["check_in"] != self.check_in_date:
+            self.check_in_date = changes["check_in"]
+            self.check_in_input.setText(self.check_in_date.toString("dd/MM/yyyy"))
+        if "check_out" in changes and changes["check_out"] != self.check_out_date:
+            self.check_out_date = changes["check_out"]
+            self.check_out_input.setText(self.check_out_date.toString("dd/MM/yyyy"))
+        self.recalc.schedule()
 
-    def on_check_in_changed(self, date):
-        """Recibe notificación de cambio de fecha de entrada desde shared state"""
-        if date != self.check_in_date:
-            self.check_in_date = date
-            self.check_in_input.setText(date.toString("dd/MM/yyyy"))
-            self.calculate_total()
+    def showEvent(self, event):
+        super().showEvent(event)
+        # Recalcular solo al hacerse visible si algo cambió mientras estaba oculta
+        self.recalc.set_active(True)
 
-    def on_check_out_changed(self, date):
-        """Recibe notificación de cambio de fecha de salida desde shared state"""
-        if date != self.check_out_date:
-            self.check_out_date = date
-            self.check_out_input.setText(date.toString("dd/MM/yyyy"))
-            self.calculate_total()
+    def hideEvent(self, event):
+        super().hideEvent(event)
+        self.recalc.set_active(False)
 
 def custom_wheel_event(spinbox, event):
     spinbox.clearFocus()
@@ -1,12 +1,47 @@
+import time
+
+# Inicio del proceso, para medir el tiempo hasta mostrar la ventana
+_START_TIME = time.perf_counter()
+
 import sys
 import os
+import importlib
+import logging
 from PySide6.QtWidgets import QApplication, QMainWindow, QWidget, QVBoxLayout, QTabWidget
-from PySide6.QtCore import Qt
+from PySide6.QtCore import QTimer
 
 from widgets import BannerWidget
 from shared_state import SharedState
-from todo_incluido_tab import TodoIncluidoTab
-from decas_tab import DecasTab
+from tariff_loader import TariffLoader, TariffWatcher, DECAS, SEASON_CALENDAR, TODO_INCLUIDO
+
+logger = logging.getLogger(__name__)
+
+# Presupuesto de arranque: tiempo máximo aceptable hasta ver la ventana
+STARTUP_BUDGET_MS = float(os.environ.get("MULTIVACIONES_STARTUP_BUDGET_MS", 1500))
+
+# Espera tras mostrar la ventana antes de construir las pestañas no visibles
+IDLE_BUILD_DELAY_MS = 500
+
+# (título, módulo, clase, atributo, tarifario) de cada pestaña; los módulos se importan al construirla
+TABS = [
+    ("Decas", "decas_tab", "DecasTab", "decas_tab", DECAS),
+    ("Todo Incluido", "todo_incluido_tab", "TodoIncluidoTab", "todo_incluido_tab", TODO_INCLUIDO),
+]
+
+class LazyTab(QWidget):
+    """Contenedor que construye la pestaña real la primera vez que se necesita"""
+    def __init__(self, factory, parent=None):
+        super().__init__(parent)
+        self.factory = factory
+        self.widget = None
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(0, 0, 0, 0)
+
+    def ensure_built(self):
+        if self.widget is None:
+            self.widget = self.factory()
+            self.layout().addWidget(self.widget)
+        return self.widget
 
 class HotelSelector(QMainWindow):
     def __init__(self):
@@ -31,33 +66,119 @@ class HotelSelector(QMainWindow):
         # Crear el estado compartido
         self.shared_state = SharedState()
         
-        # Crear el widget de pestañas
-        self.tabs = QTabWidget()
+        # Cargar los tarifarios en segundo plano mientras se pinta la ventana
+        self.tariffs = {}
+        self.tariff_errors = {}
+        self.tariff_loader = TariffLoader(parent=self)
+        self.tariff_loader.loaded.connect(self.on_tariffs_loaded)
+        self.tariff_loader.failed.connect(self.on_tariffs_failed)
+        self.tariff_loader.start()
         
-        # Crear las pestañas
-        self.todo_incluido_tab = TodoIncluidoTab(self.shared_state)
-        self.decas_tab = DecasTab(self.shared_state)
+        # Recargar el tarifario cuyo CSV cambie mientras la aplicación está abierta
+        self.tariff_watcher = TariffWatcher(parent=self)
+        self.tariff_watcher.changed.connect(self.reload_tariffs)
         
-        # Agregar las pestañas
-        self.tabs.addTab(self.decas_tab, "Decas")
-        self.tabs.addTab(self.todo_incluido_tab, "Todo Incluido")
+        # Crear el widget de pestañas; cada pestaña se construye al necesitarla
+        self.tabs = QTabWidget()
+        self.lazy_tabs = []
+        self.tab_datasets = {}
+        for title, module_name, class_name, attribute, dataset in TABS:
+            setattr(self, attribute, None)
+            self.tab_datasets[attribute] = dataset
+            lazy_tab = LazyTab(lambda m=module_name, c=class_name, a=attribute: self.create_tab(m, c, a))
+            self.lazy_tabs.append(lazy_tab)
+            self.tabs.addTab(lazy_tab, title)
+        self.tabs.currentChanged.connect(self.on_tab_changed)
+        self._shown = False
         
         # Agregar tabs al layout principal
         main_layout.addWidget(self.tabs)
+
+    def create_tab(self, module_name, class_name, attribute):
+        tab_class = getattr(importlib.import_module(module_name), class_name)
+        tab = tab_class(self.shared_state)
+        setattr(self, attribute, tab)
         
+        # Entregar las tarifas si ya llegaron
+        dataset = self.tab_datasets[attribute]
+        if dataset in self.tariffs:
+            tab.set_tariffs(self.tariffs[dataset])
+        elif dataset in self.tariff_errors:
+            tab.show_load_error(self.tariff_errors[dataset])
+        return tab
+
+    def built_tabs(self, dataset):
+        return [getattr(self, attribute) for attribute, name in self.tab_datasets.items()
+                if name == dataset and getattr(self, attribute) is not None]
+
+    def on_tariffs_loaded(self, dataset, tariffs):
+        # Se vigila el CSV desde la primera carga; así el arranque no importa nada más
+        self.tariff_watcher.watch(dataset)
+        self.tariff_watcher.watch(SEASON_CALENDAR)
+        if dataset == SEASON_CALENDAR:
+            # Las cotizaciones con temporada automática cambian en todas las pestañas
+            for attribute in self.tab_datasets:
+                tab = getattr(self, attribute)
+                if tab is not None:
+                    tab.recalc.schedule()
+            return
+        self.tariffs[dataset] = tariffs
+        self.tariff_errors.pop(dataset, None)
+        for tab in self.built_tabs(dataset):
+            tab.set_tariffs(tariffs)
+
+    def on_tariffs_failed(self, dataset, message):
+        logger.error("Error cargando tarifas (%s): %s", dataset, message)
+        if dataset in self.tariffs or dataset == SEASON_CALENDAR:
+            # Una recarga fallida conserva las tarifas (o el calendario) que ya estaban en uso
+            return
+        self.tariff_errors[dataset] = message
+        for tab in self.built_tabs(dataset):
+            tab.show_load_error(message)
+
+    def reload_tariffs(self, dataset):
+        logger.info("Recargando tarifas (%s)", dataset)
+        self.tariff_loader.start((dataset,))
+
+    def on_tab_changed(self, index):
+        if index >= 0:
+            self.lazy_tabs[index].ensure_built()
+
+    def build_current_tab(self):
+        """Construye la pestaña visible justo después de pintar la ventana"""
+        self.lazy_tabs[self.tabs.currentIndex()].ensure_built()
+        logger.info("Pestaña activa lista en %.0f ms", (time.perf_counter() - _START_TIME) * 1000)
+        QTimer.singleShot(IDLE_BUILD_DELAY_MS, self.build_pending_tabs)
+
+    def build_pending_tabs(self):
+        for lazy_tab in self.lazy_tabs:
+            lazy_tab.ensure_built()
+
+    def showEvent(self, event):
+        super().showEvent(event)
+        if not self._shown:
+            self._shown = True
+            QTimer.singleShot(0, self.report_startup)
+            QTimer.singleShot(0, self.build_current_tab)
+
+    def report_startup(self):
+        elapsed_ms = (time.perf_counter() - _START_TIME) * 1000
+        logger.info("Ventana visible en %.0f ms (presupuesto %.0f ms)", elapsed_ms, STARTUP_BUDGET_MS)
+        if elapsed_ms > STARTUP_BUDGET_MS:
+            logger.warning("El arranque superó el presupuesto por %.0f ms", elapsed_ms - STARTUP_BUDGET_MS)
+
     def load_styles(self):
         try:
             style_path = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'assets', 'styles', 'styles.css')
-            print(f"Intentando cargar estilos desde: {style_path}")
-            print(f"El archivo existe: {os.path.exists(style_path)}")
             with open(style_path, 'r') as f:
                 styles = f.read()
                 QApplication.instance().setStyleSheet(styles)
-                print("Estilos cargados exitosamente")
+            logger.debug("Estilos cargados desde %s", style_path)
         except Exception as e:
-            print(f"Error loading styles: {e}")
+            logger.warning("No se pudieron cargar los estilos: %s", e)
 
 if __name__ == '__main__':
+    logging.basicConfig(format="%(levelname)s: %(message)s")
     app = QApplication(sys.argv)
     window = HotelSelector()
     window.show()
@@ -0,0 +1,321 @@
+import math
+import weakref
+from datetime import timedelta
+import numpy as np
+from PySide6.QtCore import (QAbstractListModel, QAbstractTableModel, QModelIndex,
+                            QSortFilterProxyModel, Qt)
+from PySide6.QtWidgets import QCompleter
+from pricing.engine import DECA_TO_USD
+from pricing.nights import WEEKEND_NIGHTS, night_types
+from pricing.search import normalize
+from pricing.seasons import AUTO_SEASON, load_season_calendar, night_seasons
+from pricing.tariffs import DAY_TYPES, FULL_WEEK, SEASONS
+from pricing.weeks import WEEK_NIGHTS
+
+class NameListModel(QAbstractListModel):
+    """Lista de nombres de solo lectura; no copia la lista"""
+    def __init__(self, names, parent=None):
+        super().__init__(parent)
+        self.names = names
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.names)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if index.isValid() and role in (Qt.DisplayRole, Qt.EditRole):
+            return self.names[index.row()]
+        return None
+
+class HotelListModel(NameListModel):
+    """Hoteles de un índice de tarifas, con un modelo de habitaciones por hotel creado al pedirlo"""
+    def __init__(self, hotels, hotel_rooms, parent=None):
+        super().__init__(hotels, parent)
+        self.hotel_rooms = hotel_rooms
+        self._room_models = {}
+
+    def room_model(self, hotel_id):
+        """Habitaciones del hotel (lista vacía si no existe); el mismo modelo se reutiliza"""
+        model = self._room_models.get(hotel_id)
+        if model is None:
+            rooms = self.hotel_rooms[hotel_id] if hotel_id >= 0 else []
+            model = self._room_models[hotel_id] = NameListModel(rooms, self)
+        return model
+
+# Un modelo de hoteles por índice de tarifas, compartido por todas las vistas
+_hotel_models = weakref.WeakKeyDictionary()
+
+def shared_hotel_model(tariffs):
+    """Modelo de hoteles compartido para el índice; se crea la primera vez que se pide"""
+    model = _hotel_models.get(tariffs)
+    if model is None:
+        model = _hotel_models[tariffs] = HotelListModel(tariffs.hotels, tariffs.hotel_rooms)
+    return model
+
+class DecasBreakdownModel(QAbstractTableModel):
+    """Desglose noche por noche de una cotización en decas.
+
+    Hay una fila por noche y tipo de habitación, ordenadas por tipo. Las
+    celdas se calculan al pedirlas a partir de la cotización, así la vista
+    solo trabaja con las filas visibles. Cada noche usa las tarifas de su
+    temporada; las noches de un bloque de semana completa muestran el precio
+    del bloque en su primera noche.
+    """
+    NIGHT, ROOM, SEASON, DAY_TYPE, DECAS, USD = range(6)
+    HEADERS = ("Noche", "Habitación", "Temporada", "Tipo de día", "Decas", "USD")
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.quote = None
+        self._day_types = []
+        self._seasons = []
+        self._calendar = None    # Calendario con que se calcularon _seasons (solo con AUTO_SEASON)
+        self._rates = []         # Por línea: {temporada: (entre semana, fin de semana)}
+        self._weeks = []         # Por línea: {noche: (noche de inicio, bloque)} de las noches en bloques
+        self.weekend_days = WEEKEND_NIGHTS
+
+    @staticmethod
+    def _season_calendar(quote):
+        return load_season_calendar() if quote is not None and quote.season == AUTO_SEASON else None
+
+    def _load(self, quote, dates_changed=True):
+        if dates_changed:
+            self._day_types = night_types(quote.check_in, quote.check_out, self.weekend_days) if quote else []
+            self._calendar = self._season_calendar(quote)
+            self._seasons = ([SEASONS[i] for i in night_seasons(quote.check_in, quote.check_out, quote.season,
+                                                                self._calendar)]
+                             if quote else [])
+        self._rates = [{season.season: (season.weekday_rate, season.weekend_rate) for season in line.seasons}
+                       for line in quote.lines] if quote else []
+        self._weeks = [_week_nights(quote.check_in, line) for line in quote.lines] if quote else []
+
+    def set_quote(self, quote, weekend_days=WEEKEND_NIGHTS):
+        """Muestra otra cotización; si la forma no cambia solo avisa las celdas que cambiaron"""
+        old = self.quote
+        if weekend_days != self.weekend_days:
+            # Con otras noches de fin de semana cambian todos los tipos de día
+            self.weekend_days = weekend_days
+            old = None
+        if old is None or quote is None or not self._same_shape(old, quote):
+            self.beginResetModel()
+            self.quote = quote
+            self._load(quote)
+            self.endResetModel()
+            return
+
+        self.quote = quote
+        # Tras recargar temporadas.csv las mismas fechas pueden caer en otras temporadas
+        dates_changed = (old.check_in != quote.check_in or old.season != quote.season
+                         or self._season_calendar(quote) is not self._calendar)
+        self._load(quote, dates_changed)
+        first_column = self.NIGHT if dates_changed else self.DAY_TYPE
+        nights = quote.nights
+        for i, (old_line, line) in enumerate(zip(old.lines, quote.lines)):
+            if dates_changed or not _same_rates(old_line, line):
+                self.dataChanged.emit(self.index(i * nights, first_column),
+                                      self.index((i + 1) * nights - 1, self.USD))
+
+    @staticmethod
+    def _same_shape(old, quote):
+        return (old.nights == quote.nights
+                and [line.room_type for line in old.lines] == [line.room_type for line in quote.lines])
+
+    def rowCount(self, parent=QModelIndex()):
+        if parent.isValid() or self.quote is None:
+            return 0
+        return self.quote.nights * len(self.quote.lines)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.HEADERS)
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if role == Qt.DisplayRole and orientation == Qt.Horizontal:
+            return self.HEADERS[section]
+        return None
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid() or self.quote is None:
+            return None
+        line_index, night = divmod(index.row(), self.quote.nights)
+        line = self.quote.lines[line_index]
+        day_type = self._day_types[night]
+        column = index.column()
+
+        if role == Qt.TextAlignmentRole:
+            if column in (self.DECAS, self.USD):
+                return int(Qt.AlignRight | Qt.AlignVCenter)
+            return None
+        if role != Qt.DisplayRole:
+            return None
+
+        if column == self.NIGHT:
+            return (self.quote.check_in + timedelta(days=night)).strftime('%d/%m/%Y')
+        if column == self.ROOM:
+            return f"{line.room_type} × {line.rooms}"
+        season = self._seasons[night]
+        if column == self.SEASON:
+            return season
+        week = self._weeks[line_index].get(night)
+        if column == self.DAY_TYPE:
+            return DAY_TYPES[FULL_WEEK if week else day_type]
+
+        # Decas y USD de todas las habitaciones de ese tipo en esa noche
+        if week:
+            start, block = week
+            if night != start:
+                return "Incluida"
+            rate = block.decas
+        else:
+            rate = self._rates[line_index].get(season, (math.nan, math.nan))[day_type]
+        if math.isnan(rate):
+            return "Sin tarifa"
+        decas = rate * line.rooms
+        if column == self.DECAS:
+            return f"{decas:,.0f}"
+        return f"${decas * DECA_TO_USD:,.2f}"
+
+def _week_nights(check_in, line):
+    """{noche: (noche de inicio, bloque)} de las noches que cubren los bloques de semana completa"""
+    nights = {}
+    for block in line.week_blocks:
+        start = (block.first_night - check_in).days
+        nights.update((night, (start, block)) for night in range(start, start + WEEK_NIGHTS))
+    return nights
+
+def _season_rates(line):
+    return [(season.season, season.weekday_rate, season.weekend_rate) for season in line.seasons]
+
+def _same_rates(old_line, line):
+    """Compara cantidades, bloques y tarifas por temporada de dos líneas; NaN cuenta como igual a NaN"""
+    old_rates, rates = _season_rates(old_line), _season_rates(line)
+    return (old_line.rooms == line.rooms and old_line.week_blocks == line.week_blocks
+            and len(old_rates) == len(rates)
+            and all(a == b or (isinstance(a, float) and math.isnan(a) and math.isnan(b))
+                    for old_season, season in zip(old_rates, rates) for a, b in zip(old_season, season)))
+
+class ComparisonModel(QAbstractTableModel):
+    """Tabla ordenable con una comparación entre hoteles.
+
+    ``columns`` es una lista de (encabezado, valores, formato); los valores
+    numéricos son arreglos de NumPy y se ordenan con argsort sin copiar filas.
+    """
+    def __init__(self, columns, parent=None):
+        super().__init__(parent)
+        self.headers = [header for header, _, _ in columns]
+        self.values = [values for _, values, _ in columns]
+        self.formats = [value_format for _, _, value_format in columns]
+        self.order = np.arange(len(self.values[0]) if self.values else 0)
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.order)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.headers)
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if role == Qt.DisplayRole and orientation == Qt.Horizontal:
+            return self.headers[section]
+        return None
+
+    def source_row(self, row):
+        """Fila de los datos originales que se muestra en la fila ``row``"""
+        return int(self.order[row])
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        values = self.values[index.column()]
+        if role == Qt.TextAlignmentRole:
+            if isinstance(values, np.ndarray):
+                return int(Qt.AlignRight | Qt.AlignVCenter)
+            return None
+        if role != Qt.DisplayRole:
+            return None
+        return self.formats[index.column()](values[self.order[index.row()]])
+
+    def sort(self, column, order=Qt.AscendingOrder):
+        values = self.values[column]
+        if isinstance(values, np.ndarray):
+            new_order = np.argsort(values, kind='stable')
+        else:
+            new_order = np.array(sorted(range(len(values)), key=lambda i: values[i].casefold()), dtype=int)
+        if order == Qt.DescendingOrder:
+            new_order = new_order[::-1]
+
+        self.layoutAboutToBeChanged.emit()
+        # Las filas seleccionadas siguen a sus datos después de ordenar
+        positions = np.empty_like(new_order)
+        positions[new_order] = np.arange(len(new_order))
+        old_indexes = self.persistentIndexList()
+        new_indexes = [self.index(int(positions[self.order[i.row()]]), i.column()) for i in old_indexes]
+        self.order = new_order
+        self.changePersistentIndexList(old_indexes, new_indexes)
+        self.layoutChanged.emit()
+
+class HotelSearchProxyModel(QSortFilterProxyModel):
+    """Filtra y ordena la lista de hoteles de un combo con un HotelSearchIndex.
+
+    Las filas del modelo fuente deben seguir el orden de los hoteles del
+    índice (el orden en que se agregaron al combo).
+    """
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.search_index = None
+        self.query = ""
+        self.ranks = None        # {fila: posición en los resultados}; None = sin filtrar
+        self.combo = None
+        self.completer = None
+
+    @classmethod
+    def install(cls, combo):
+        """Reemplaza el filtrado del completer del combo por la búsqueda indexada"""
+        proxy = cls(combo)
+        proxy.combo = combo
+        proxy.setSourceModel(combo.model())
+        completer = QCompleter(proxy, combo)
+        # El proxy ya filtra y ordena; el completer solo muestra sus filas
+        completer.setCompletionMode(QCompleter.UnfilteredPopupCompletion)
+        combo.setCompleter(completer)
+        proxy.completer = completer
+        
+        def on_text_edited(text):
+            proxy.set_query(text)
+            if text:
+                completer.complete()
+        combo.lineEdit().textEdited.connect(on_text_edited)
+        return proxy
+
+    def set_hotels(self, model, search_index):
+        """Pone el modelo de hoteles en el combo y lo usa como fuente de la búsqueda"""
+        self.combo.setModel(model)
+        self.setSourceModel(model)
+        # QComboBox.setModel también cambia el modelo del completer; se vuelve a poner el proxy
+        self.completer.setModel(self)
+        self.set_search_index(search_index)
+
+    def set_search_index(self, search_index):
+        self.search_index = search_index
+        self.query = ""
+        self.ranks = None
+        self.invalidate()
+
+    def set_query(self, text):
+        if self.search_index is None:
+            return
+        query = normalize(text)
+        within = None
+        if self.ranks is not None and self.query and query.startswith(self.query):
+            # Al seguir escribiendo basta con buscar entre los resultados anteriores
+            within = self.ranks.keys()
+        results = self.search_index.search(query, within)
+        self.query = query
+        self.ranks = {hotel_id: position for position, (hotel_id, _) in enumerate(results)}
+        self.invalidate()
+        self.sort(0)
+
+    def filterAcceptsRow(self, source_row, source_parent):
+        return self.ranks is None or source_row in self.ranks
+
+    def lessThan(self, left, right):
+        if self.ranks is None:
+            return left.row() < right.row()
+        return self.ranks[left.row()] < self.ranks[right.row()]
@@ -0,0 +1,28 @@
+"""Modos sin interfaz gráfica: ``python -m multivaciones <comando>``"""
+import argparse
+import logging
+import sys
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='multivaciones')
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    serve = commands.add_parser('serve', help='Servicio HTTP local de cotización')
+    serve.add_argument('--host', default='127.0.0.1', help='Dirección (por defecto 127.0.0.1)')
+    serve.add_argument('--port', type=int, default=8765, help='Puerto (por defecto 8765)')
+    serve.add_argument('--workers', type=int, default=4,
+                       help='Hilos para calcular cotizaciones (por defecto 4)')
+    serve.add_argument('--reload-interval', type=float, default=2.0,
+                       help='Segundos entre revisiones de los CSV de tarifas; 0 desactiva la recarga')
+
+    args = parser.parse_args(argv)
+    if args.command == 'serve':
+        from pricing.server import serve as run_server
+        logging.basicConfig(level=logging.INFO, format='%(asctime)s %(levelname)s %(message)s')
+        run_server(args.host, args.port, args.workers, args.reload_interval)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
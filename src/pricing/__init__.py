@@ -0,0 +1,20 @@
+# Lógica de tarifas y cotización, independiente de la interfaz Qt
+from .tariffs import (TariffIndex, SEASONS, DAY_TYPES, DECAS_ROOM_TYPES,
+                      WEEKDAY, WEEKEND, FULL_WEEK, parse_weekdays,
+                      load_decas_tariffs, load_todo_incluido_tariffs)
+from .holidays import colombian_holidays, easter_sunday
+from .nights import WEEKEND_NIGHTS, DayTypeCalendar, count_nights, night_types
+from .seasons import (AUTO_SEASON, SeasonCalendar, load_season_calendar, reload_season_calendar,
+                      stay_profile)
+from .weeks import WeekBlock
+from .engine import (DecasQuote, DecasRoomLine, AllInclusiveQuote, ChildLine, SeasonNights,
+                     quote_decas, quote_all_inclusive)
+from .breakdown import NightRun, night_runs
+from .cache import QuoteCache, quote_cache
+from .flexible import (CheckInOption, cheapest_all_inclusive_check_ins,
+                       cheapest_all_inclusive_group_check_ins, cheapest_decas_check_ins)
+from .groups import GroupQuote, GroupRoomLine, parse_guests, quote_all_inclusive_group, read_guests_csv
+from .room_mix import ROOM_CAPACITY, RoomMix, cheapest_room_mixes
+from .compare import AllInclusiveComparison, DecasComparison, compare_all_inclusive, compare_decas
+from .search import HotelSearchIndex
+from .reload import TariffReloader
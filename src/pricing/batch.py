@@ -0,0 +1,274 @@
+"""Cotización masiva de itinerarios en una sola pasada de NumPy.
+
+Las funciones reciben un DataFrame (o un diccionario de columnas) con un
+itinerario por fila y devuelven un DataFrame con los totales, alineado con
+el índice de entrada. Los hoteles, habitaciones o temporadas desconocidos y
+las fechas inválidas producen NaN en los totales. La temporada "Automática"
+toma la temporada de cada noche del calendario; las estadías que el
+calendario no cubre también dan NaN. En Decas, las estadías de una semana
+o más se reparten entre noches sueltas y bloques de semana completa como en
+``quote_decas``, con la programación dinámica sobre todas esas filas a la
+vez.
+"""
+import numpy as np
+import pandas as pd
+
+from .engine import (ADMIN_MIN_DECAS, ADMIN_USD_PER_DECA, DECA_TO_USD, DEFAULT_COP_PER_USD,
+                     _covers_stay, child_rates)
+from .nights import count_nights_array, night_types_grid
+from .seasons import AUTO_SEASON, load_season_calendar
+from .tariffs import DECAS_ROOM_TYPES, FULL_WEEK, SEASONS, WEEKDAY, WEEKEND
+from .weeks import WEEK_NIGHTS, cheapest_split, week_starts
+
+
+def _frame(itineraries):
+    if isinstance(itineraries, pd.DataFrame):
+        return itineraries
+    return pd.DataFrame(itineraries)
+
+
+def _column(df, name, default):
+    if name in df:
+        return df[name].to_numpy()
+    return np.full(len(df), default)
+
+
+def _flag(df, name, default):
+    """Columna booleana; acepta textos como "true", "1" o "sí" (p. ej. desde CSV)"""
+    if name not in df:
+        return np.full(len(df), default)
+    values = df[name]
+    if values.dtype == object:
+        text = values.astype(str).str.strip().str.casefold()
+        return text.isin(('1', 'true', 'si', 'sí', 'yes', 'x')).to_numpy()
+    if values.dtype.kind in 'iuf':
+        # 0/1 con vacíos: los vacíos quedan como NA y toman el valor por defecto
+        values = values.ne(0).where(values.notna())
+    return values.astype('boolean').fillna(default).to_numpy(bool)
+
+
+def _ids(names, values):
+    """Convierte nombres a índices enteros; -1 si no existen"""
+    return pd.Index(names).get_indexer(pd.Series(values).astype(str).str.strip())
+
+
+def _room_rates(rates, hotel_ids, room_ids):
+    """Tarifas (temporada, tipo de día) por fila: arreglo (filas, temporadas, 2); NaN si no existen"""
+    valid = (hotel_ids >= 0) & (room_ids >= 0)
+    found = rates[np.where(valid, hotel_ids, 0), np.where(valid, room_ids, 0), :, :FULL_WEEK]
+    return np.where(valid[:, None, None], found, np.nan)
+
+
+def _stays(df, weekend_days):
+    """Devuelve (noches, noches entre semana, noches de fin de semana, perfiles,
+    índices de temporada, temporadas válidas).
+
+    Los perfiles tienen las noches de cada fila por (temporada, tipo de
+    día); el índice de temporada es -1 si no es fija. Una temporada es
+    válida si es conocida o si es "Automática" y el calendario cubre la
+    estadía.
+    """
+    check_in = pd.to_datetime(df['check_in']).to_numpy().astype('datetime64[D]')
+    check_out = pd.to_datetime(df['check_out']).to_numpy().astype('datetime64[D]')
+    nights, weekday_nights, weekend_nights = count_nights_array(check_in, check_out, weekend_days)
+
+    names = pd.Series(df['season']).astype(str).str.strip().to_numpy()
+    season_ids = pd.Index(SEASONS).get_indexer(names)
+    fixed = np.flatnonzero(season_ids >= 0)
+    profiles = np.zeros((len(df), len(SEASONS), 2), dtype=np.int64)
+    profiles[fixed, season_ids[fixed], WEEKDAY] = weekday_nights[fixed]
+    profiles[fixed, season_ids[fixed], WEEKEND] = weekend_nights[fixed]
+    valid = season_ids >= 0
+
+    auto = names == AUTO_SEASON
+    if auto.any():
+        covered, auto_profiles = load_season_calendar().stay_profiles(check_in[auto], check_out[auto],
+                                                                      weekend_days)
+        profiles[auto] = auto_profiles
+        valid[auto] = covered
+    return nights, weekday_nights, weekend_nights, profiles, season_ids, valid
+
+
+def _night_grid(df, rows, nights, season_ids, weekend_days):
+    """Temporada y tipo de día de cada noche de las filas ``rows``.
+
+    Devuelve dos arreglos (filas, noches de la estadía más larga); las
+    noches después de la salida y las que el calendario no cubre tienen
+    temporada -1.
+    """
+    check_in = pd.to_datetime(df['check_in'].iloc[rows]).to_numpy().astype('datetime64[D]')
+    nights = nights[rows]
+    count = int(nights.max())
+    types = night_types_grid(check_in, nights, count, weekend_days)
+    seasons = np.repeat(season_ids[rows, None], count, axis=1)
+    names = pd.Series(df['season']).iloc[rows].astype(str).str.strip().to_numpy()
+    auto = np.flatnonzero(names == AUTO_SEASON)
+    if len(auto):
+        calendar = load_season_calendar()
+        days = len(calendar.season_ids)
+        offsets = ((check_in[auto] - np.datetime64(calendar.first_day, 'D')).astype(np.int64)[:, None]
+                   + np.arange(count))
+        inside = (offsets >= 0) & (offsets < days)
+        seasons[auto] = np.where(inside, calendar.season_ids[np.clip(offsets, 0, days - 1)], -1)
+    seasons[np.arange(count) >= nights[:, None]] = -1
+    return seasons, types
+
+
+def _week_savings(rates, hotel_ids, room_ids, rows, seasons, types):
+    """Decas por habitación que ahorran los bloques de semana completa en las filas ``rows``"""
+    hotel_ids, room_ids = hotel_ids[rows], room_ids[rows]
+    valid = ((hotel_ids >= 0) & (room_ids >= 0))[:, None]
+    hotel_ids, room_ids = np.where(valid[:, 0], hotel_ids, 0)[:, None], np.where(valid[:, 0], room_ids, 0)[:, None]
+    known = valid & (seasons >= 0)
+    season_ids = np.where(known, seasons, 0)
+    nightly = np.where(known, np.nan_to_num(rates[hotel_ids, room_ids, season_ids, types]), 0.0)
+    weekly = np.where(week_starts(np.where(known, seasons, -1)),
+                      rates[hotel_ids, room_ids, season_ids, FULL_WEEK], np.nan)
+    cheapest, _ = cheapest_split(nightly, weekly)
+    return np.maximum(nightly.sum(axis=1) - cheapest, 0.0)
+
+
+def _stay_rates(profiles, room_rates, season_ids, valid):
+    """Tarifa por noche de cada tipo de día y fila; promedio por noche si la estadía cruza temporadas"""
+    by_season = profiles.sum(axis=2)
+    nights = profiles.sum(axis=1)
+    primary_ids = np.where(season_ids >= 0, season_ids, by_season.argmax(axis=1))
+    primary = room_rates[np.arange(len(profiles)), primary_ids]
+    averaged = (profiles * np.nan_to_num(room_rates)).sum(axis=1) / np.maximum(nights, 1)
+    single = (np.count_nonzero(by_season, axis=1) <= 1)[:, None]
+    rates = np.where(single | (nights == 0), primary, averaged)
+    return np.where(valid[:, None], rates, np.nan)
+
+
+def _stay_amount(profiles, room_rates):
+    """Importe por fila; las noches sin tarifa no se cobran"""
+    return (profiles * np.nan_to_num(room_rates)).sum(axis=(1, 2))
+
+
+def _children(ages, size):
+    """Devuelve (niños por fila, suma de fracciones del precio base por fila).
+
+    Cada celda puede ser una lista de edades o un texto como "3;8".
+    """
+    ages = pd.Series(ages).reset_index(drop=True)
+    if ages.dtype == object:
+        split = ages.str.split(r'[;,\s]+', regex=True)
+        ages = split.where(split.notna(), ages)
+    flat = pd.to_numeric(ages.explode(), errors='coerce').dropna()
+    rows = flat.index.to_numpy()
+    counts = np.bincount(rows, minlength=size)
+    fractions = np.bincount(rows, weights=child_rates(flat.to_numpy()), minlength=size)
+    return counts, fractions
+
+
+def quote_all_inclusive_batch(tariffs, itineraries):
+    """Cotiza itinerarios Todo Incluido.
+
+    Columnas: hotel, room, season, check_in, check_out y, opcionalmente,
+    adults, children_ages, offer_2x1, discount y cop_per_usd.
+    """
+    df = _frame(itineraries)
+    size = len(df)
+    nights, weekday_nights, weekend_nights, profiles, season_ids, valid = _stays(df, tariffs.weekend_days)
+
+    hotel_ids = _ids(tariffs.hotels, df['hotel'])
+    room_ids = _ids(tariffs.rooms, df['room'])
+    room_rates = _room_rates(tariffs.rates, hotel_ids, room_ids)
+    rates = _stay_rates(profiles, room_rates, season_ids, valid)
+    weekday_rate, weekend_rate = rates[:, WEEKDAY], rates[:, WEEKEND]
+    # Igual que quote_all_inclusive: cada noche de la estadía necesita tarifa
+    covered = _covers_stay(room_rates, profiles)
+    subtotal = np.where(valid & covered & (nights > 0), _stay_amount(profiles, room_rates), np.nan)
+
+    adults = _column(df, 'adults', 2).astype(float)
+    offer_2x1 = _flag(df, 'offer_2x1', False)
+    discount = np.where(offer_2x1, 0.0, _column(df, 'discount', 0).astype(float))
+    adult_factor = np.where(offer_2x1, 0.5, 1.0 - discount / 100.0)
+    price_per_adult = subtotal * adult_factor
+    total_adults = price_per_adult * adults
+
+    if 'children_ages' in df:
+        children, child_fraction = _children(df['children_ages'], size)
+    else:
+        children, child_fraction = np.zeros(size, dtype=int), np.zeros(size)
+    total_children = subtotal * child_fraction
+
+    cop_per_usd = _column(df, 'cop_per_usd', DEFAULT_COP_PER_USD).astype(float)
+    total_usd = total_adults + total_children
+    return pd.DataFrame({
+        'nights': nights,
+        'weekday_nights': weekday_nights,
+        'weekend_nights': weekend_nights,
+        'weekday_rate': weekday_rate,
+        'weekend_rate': weekend_rate,
+        'subtotal': subtotal,
+        'price_per_adult': price_per_adult,
+        'total_adults': total_adults,
+        'children': children,
+        'total_children': total_children,
+        'total_usd': total_usd,
+        'total_cop': total_usd * cop_per_usd,
+    }, index=df.index)
+
+
+def quote_decas_batch(tariffs, itineraries):
+    """Cotiza itinerarios en decas.
+
+    Columnas: hotel, season, check_in, check_out, una columna por tipo de
+    habitación (Doble, Triple, Cuádruple) con el número de habitaciones y,
+    opcionalmente, include_admin y cop_per_usd.
+    """
+    df = _frame(itineraries)
+    size = len(df)
+    nights, weekday_nights, weekend_nights, profiles, season_ids, valid = _stays(df, tariffs.weekend_days)
+
+    hotel_ids = _ids(tariffs.hotels, df['hotel'])
+    result = {
+        'nights': nights,
+        'weekday_nights': weekday_nights,
+        'weekend_nights': weekend_nights,
+    }
+
+    # Solo las estadías de una semana o más pueden usar bloques de semana completa
+    long_stays = np.flatnonzero(nights >= WEEK_NIGHTS)
+    if len(long_stays) and not np.isnan(tariffs.rates[..., FULL_WEEK]).all():
+        seasons, types = _night_grid(df, long_stays, nights, season_ids, tariffs.weekend_days)
+    else:
+        long_stays = None
+
+    # Tipos de habitación que ofrece cada hotel, como TariffIndex.rooms_of
+    offered = ~np.isnan(tariffs.rates).all(axis=(2, 3))
+    total_decas = np.zeros(size)
+    for room_type in DECAS_ROOM_TYPES:
+        rooms = _column(df, room_type, 0).astype(float)
+        room_id = tariffs.room_id(room_type)
+        room_ids = np.full(size, room_id)
+        # Igual que quote_decas: pedir un tipo que el hotel no ofrece deja la fila sin cotización
+        valid &= (rooms <= 0) | ((room_id >= 0) & offered[np.maximum(hotel_ids, 0), max(room_id, 0)])
+        # Igual que quote_decas: las noches sin tarifa no se cobran
+        decas_per_room = _stay_amount(profiles, _room_rates(tariffs.rates, hotel_ids, room_ids))
+        if long_stays is not None and rooms[long_stays].any():
+            decas_per_room[long_stays] -= _week_savings(tariffs.rates, hotel_ids, room_ids, long_stays,
+                                                        seasons, types)
+        decas = rooms * decas_per_room
+        result[f'decas_{room_type}'] = decas
+        total_decas += decas
+
+    valid = (hotel_ids >= 0) & valid & (nights > 0)
+    total_decas = np.where(valid, total_decas, np.nan)
+    total_usd = total_decas * DECA_TO_USD
+    include_admin = _flag(df, 'include_admin', True)
+    admin_decas = np.where(include_admin, np.maximum(ADMIN_MIN_DECAS, total_decas), 0.0)
+    admin_usd = admin_decas * ADMIN_USD_PER_DECA
+    total_with_admin = total_usd + admin_usd
+    cop_per_usd = _column(df, 'cop_per_usd', DEFAULT_COP_PER_USD).astype(float)
+
+    result.update({
+        'total_decas': total_decas,
+        'total_usd': total_usd,
+        'admin_decas': admin_decas,
+        'admin_usd': admin_usd,
+        'total_with_admin': total_with_admin,
+        'total_cop': total_with_admin * cop_per_usd,
+    })
+    return pd.DataFrame(result, index=df.index)
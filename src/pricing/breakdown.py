@@ -0,0 +1,64 @@
+"""Desglose estructurado de una estadía en tramos de noches.
+
+Las noches consecutivas de la misma temporada y tipo de día (y por lo tanto
+con la misma tarifa) se agrupan en un tramo, de modo que un mes de estadía son unos
+pocos tramos en lugar de treinta líneas. El texto se genera en la interfaz
+solo cuando se muestra.
+"""
+import math
+from dataclasses import dataclass
+from datetime import timedelta
+from functools import lru_cache
+from itertools import groupby
+
+from .nights import WEEKEND_NIGHTS, night_types
+from .seasons import AUTO_SEASON, load_season_calendar, night_seasons
+from .tariffs import SEASONS
+
+
+@dataclass(frozen=True)
+class NightRun:
+    """Noches consecutivas con la misma temporada y tipo de día"""
+    first_night: object      # datetime.date de la primera noche
+    nights: int
+    day_type: int
+    season: str = None       # Solo si se pidió la temporada de cada noche
+
+    @property
+    def last_night(self):
+        return self.first_night + timedelta(days=self.nights - 1)
+
+    def amount(self, rate):
+        """Importe del tramo a la tarifa dada; los tramos sin tarifa no se cobran"""
+        return 0.0 if math.isnan(rate) else self.nights * rate
+
+
+def night_runs(check_in, check_out, weekend_days=WEEKEND_NIGHTS, season=None, calendar=None):
+    """Agrupa las noches de la estadía en tramos; devuelve una tupla de NightRun.
+
+    Con ``season`` (una temporada o AUTO_SEASON) los tramos también se
+    cortan donde cambia la temporada.
+    """
+    if season == AUTO_SEASON:
+        # El calendario forma parte de la clave: al recargarlo no se reusan tramos viejos
+        calendar = calendar or load_season_calendar()
+    else:
+        calendar = None
+    return _night_runs(check_in, check_out, weekend_days, season, calendar)
+
+
+@lru_cache(maxsize=128)
+def _night_runs(check_in, check_out, weekend_days, season, calendar):
+    types = night_types(check_in, check_out, weekend_days)
+    if season is None:
+        seasons = [None] * len(types)
+    else:
+        seasons = [SEASONS[i] if i >= 0 else season
+                   for i in night_seasons(check_in, check_out, season, calendar)]
+    runs = []
+    first_night = check_in
+    for (night_season, day_type), group in groupby(zip(seasons, types)):
+        nights = sum(1 for _ in group)
+        runs.append(NightRun(first_night, nights, day_type, night_season))
+        first_night += timedelta(days=nights)
+    return tuple(runs)
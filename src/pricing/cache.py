@@ -0,0 +1,105 @@
+"""Caché LRU de cotizaciones.
+
+Las cotizaciones se guardan con una clave normalizada de la solicitud
+(índice de tarifas, hotel, habitación o mezcla de habitaciones, temporada,
+fechas, personas, ofertas y tasa de cambio). La clave incluye el propio
+índice de tarifas y, con AUTO_SEASON, el calendario de temporadas, así que
+un índice o calendario recargado nunca devuelve resultados viejos;
+``invalidate()`` además libera las entradas anteriores.
+
+Las cotizaciones devueltas se comparten entre llamadas y no deben
+modificarse.
+"""
+import threading
+from collections import OrderedDict, namedtuple
+
+from .engine import DEFAULT_COP_PER_USD, quote_all_inclusive, quote_decas
+from .seasons import AUTO_SEASON, load_season_calendar
+from .tariffs import DECAS_ROOM_TYPES
+
+DEFAULT_MAXSIZE = 512
+
+CacheInfo = namedtuple('CacheInfo', ['hits', 'misses', 'maxsize', 'currsize'])
+
+
+def _season_calendar(season):
+    """Calendario con que se cotiza la temporada; None si es fija"""
+    return load_season_calendar() if season == AUTO_SEASON else None
+
+
+def decas_key(tariffs, hotel, season, check_in, check_out, rooms,
+              include_admin=True, cop_per_usd=DEFAULT_COP_PER_USD, calendar=None):
+    counts = tuple(max(int(rooms.get(room_type, 0)), 0) for room_type in DECAS_ROOM_TYPES)
+    return ('decas', tariffs, hotel, season, calendar, check_in, check_out,
+            counts, bool(include_admin), float(cop_per_usd))
+
+
+def all_inclusive_key(tariffs, hotel, room, season, check_in, check_out,
+                      adults=2, children_ages=(), offer_2x1=False, discount=0,
+                      cop_per_usd=DEFAULT_COP_PER_USD, calendar=None):
+    # Con 2x1 el descuento no aplica; ambas formas dan la misma cotización
+    discount = 0 if offer_2x1 else int(discount)
+    return ('todo_incluido', tariffs, hotel, room, season, calendar,
+            check_in, check_out, int(adults), tuple(int(age) for age in children_ages),
+            bool(offer_2x1), discount, float(cop_per_usd))
+
+
+class QuoteCache:
+    """Caché LRU acotada y segura entre hilos, con contadores de aciertos y fallos"""
+
+    def __init__(self, maxsize=DEFAULT_MAXSIZE):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get_or_compute(self, key, compute):
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return self._entries[key]
+            self.misses += 1
+        # Se calcula fuera del candado; dos hilos pueden calcular la misma clave a la vez
+        value = compute()
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+        return value
+
+    def quote_decas(self, tariffs, hotel, season, check_in, check_out, rooms,
+                    include_admin=True, cop_per_usd=DEFAULT_COP_PER_USD):
+        # Se cotiza con el mismo calendario de la clave, aunque se recargue mientras tanto
+        calendar = _season_calendar(season)
+        key = decas_key(tariffs, hotel, season, check_in, check_out, rooms,
+                        include_admin, cop_per_usd, calendar)
+        return self.get_or_compute(key, lambda: quote_decas(
+            tariffs, hotel, season, check_in, check_out, rooms,
+            include_admin=include_admin, cop_per_usd=cop_per_usd, calendar=calendar))
+
+    def quote_all_inclusive(self, tariffs, hotel, room, season, check_in, check_out,
+                            adults=2, children_ages=(), offer_2x1=False, discount=0,
+                            cop_per_usd=DEFAULT_COP_PER_USD):
+        calendar = _season_calendar(season)
+        key = all_inclusive_key(tariffs, hotel, room, season, check_in, check_out,
+                                adults, children_ages, offer_2x1, discount, cop_per_usd, calendar)
+        return self.get_or_compute(key, lambda: quote_all_inclusive(
+            tariffs, hotel, room, season, check_in, check_out,
+            adults=adults, children_ages=children_ages, offer_2x1=offer_2x1,
+            discount=discount, cop_per_usd=cop_per_usd, calendar=calendar))
+
+    def invalidate(self):
+        """Descarta todas las entradas (p. ej. al recargar las tarifas)"""
+        with self._lock:
+            self._entries.clear()
+
+    def info(self):
+        with self._lock:
+            return CacheInfo(self.hits, self.misses, self.maxsize, len(self._entries))
+
+
+# Caché compartida por las pestañas y el servicio de cotización
+quote_cache = QuoteCache()
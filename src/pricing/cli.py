@@ -0,0 +1,144 @@
+"""Cotizador masivo por línea de comandos (``multivaciones-quote``).
+
+Lee itinerarios en CSV o JSON Lines desde un archivo o la entrada estándar,
+los cotiza por bloques con las mismas reglas de las pestañas Decas y Todo
+Incluido y escribe cada bloque en cuanto está listo, con memoria constante.
+"""
+import argparse
+import os
+import sys
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+import pandas as pd
+
+from .batch import quote_all_inclusive_batch, quote_decas_batch
+from .tariffs import (DECAS_CSV, TODO_INCLUIDO_CSV, load_decas_tariffs,
+                      load_todo_incluido_tariffs)
+
+PRODUCTS = {
+    'todo-incluido': (load_todo_incluido_tariffs, quote_all_inclusive_batch, TODO_INCLUIDO_CSV),
+    'decas': (load_decas_tariffs, quote_decas_batch, DECAS_CSV),
+}
+
+# Tarifas cargadas en cada proceso de trabajo
+_worker_state = {}
+
+
+def _init_worker(product, tariffs_path):
+    load, quote, _ = PRODUCTS[product]
+    _worker_state['tariffs'] = load(tariffs_path)
+    _worker_state['quote'] = quote
+
+
+def _price_chunk(chunk):
+    result = _worker_state['quote'](_worker_state['tariffs'], chunk)
+    return pd.concat([chunk, result], axis=1)
+
+
+def _detect_format(path, fmt):
+    if fmt:
+        return fmt
+    if path and path != '-' and os.path.splitext(path)[1].lower() in ('.jsonl', '.ndjson'):
+        return 'jsonl'
+    return 'csv'
+
+
+def read_chunks(stream, fmt, chunk_size):
+    """Itera el archivo de entrada en DataFrames de a lo sumo chunk_size filas"""
+    if fmt == 'jsonl':
+        reader = pd.read_json(stream, lines=True, chunksize=chunk_size, dtype=False)
+    else:
+        reader = pd.read_csv(stream, chunksize=chunk_size, dtype={'children_ages': str})
+    with reader:
+        try:
+            yield from reader
+        except ValueError as e:
+            if fmt != 'jsonl' or isinstance(e, pd.errors.ParserError):
+                raise
+            # El lector de JSON Lines avisa las líneas mal formadas con un ValueError genérico
+            raise pd.errors.ParserError(str(e)) from e
+
+
+def write_chunk(chunk, stream, fmt, first):
+    if fmt == 'jsonl':
+        chunk.to_json(stream, orient='records', lines=True, date_format='iso', force_ascii=False)
+    else:
+        chunk.to_csv(stream, header=first, index=False)
+    stream.flush()
+
+
+def _priced_chunks(chunks, product, tariffs_path, workers):
+    """Cotiza los bloques en orden, en este proceso o en un pool acotado"""
+    if workers <= 1:
+        _init_worker(product, tariffs_path)
+        for chunk in chunks:
+            yield _price_chunk(chunk)
+        return
+
+    # Como máximo dos bloques en vuelo por proceso, para no leer todo el archivo
+    with ProcessPoolExecutor(workers, initializer=_init_worker,
+                             initargs=(product, tariffs_path)) as pool:
+        pending = deque()
+        for chunk in chunks:
+            pending.append(pool.submit(_price_chunk, chunk))
+            if len(pending) >= workers * 2:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(
+        prog='multivaciones-quote',
+        description='Cotiza itinerarios en lote desde CSV o JSON Lines.')
+    parser.add_argument('product', choices=sorted(PRODUCTS),
+                        help='Tarifario a usar')
+    parser.add_argument('input', nargs='?', default='-',
+                        help='Archivo de itinerarios (por defecto, la entrada estándar)')
+    parser.add_argument('-o', '--output', default='-',
+                        help='Archivo de salida (por defecto, la salida estándar)')
+    parser.add_argument('--format', choices=('csv', 'jsonl'),
+                        help='Formato de entrada; por defecto según la extensión')
+    parser.add_argument('--output-format', choices=('csv', 'jsonl'),
+                        help='Formato de salida; por defecto el mismo de la entrada')
+    parser.add_argument('--tariffs', help='CSV de tarifas alternativo')
+    parser.add_argument('--chunk-size', type=int, default=5000,
+                        help='Itinerarios por bloque (por defecto 5000)')
+    parser.add_argument('--workers', type=int, default=1,
+                        help='Procesos para cotizar en paralelo (por defecto 1)')
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    in_format = _detect_format(args.input, args.format)
+    out_format = args.output_format or in_format
+    tariffs_path = args.tariffs or PRODUCTS[args.product][2]
+
+    source = target = None
+    try:
+        source = sys.stdin if args.input == '-' else open(args.input, encoding='utf-8')
+        target = sys.stdout if args.output == '-' else open(args.output, 'w', encoding='utf-8', newline='')
+        chunks = read_chunks(source, in_format, args.chunk_size)
+        for i, priced in enumerate(_priced_chunks(chunks, args.product, tariffs_path, args.workers)):
+            write_chunk(priced, target, out_format, first=(i == 0))
+    except OSError as e:
+        print(f"Error de archivo: {e}", file=sys.stderr)
+        return 1
+    except (pd.errors.ParserError, pd.errors.EmptyDataError, UnicodeDecodeError) as e:
+        print(f"No se pudo leer {args.input} como {in_format.upper()}: {e}", file=sys.stderr)
+        return 2
+    except (KeyError, ValueError) as e:
+        print(f"Error cotizando itinerarios: {e}", file=sys.stderr)
+        return 2
+    finally:
+        if source not in (None, sys.stdin):
+            source.close()
+        if target not in (None, sys.stdout):
+            target.close()
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
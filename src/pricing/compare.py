@@ -0,0 +1,113 @@
+"""Comparación de todos los hoteles para las mismas fechas y personas.
+
+Cada función cotiza todos los hoteles (y habitaciones, en Todo Incluido)
+en una sola operación: el perfil de la estadía (noches por temporada y tipo
+de día) se multiplica por el arreglo de tarifas. Solo se listan las
+combinaciones que tienen tarifa para todas las noches de la estadía; los
+totales coinciden con ``quote_all_inclusive`` y ``quote_decas``, incluidos
+los bloques de semana completa de Decas, que se eligen para todos los
+hoteles en la misma pasada.
+"""
+from dataclasses import dataclass
+from typing import List
+
+import numpy as np
+
+from .engine import (ADMIN_MIN_DECAS, ADMIN_USD_PER_DECA, DECA_TO_USD, DEFAULT_COP_PER_USD,
+                     _check_season, _covers_stay, _stay_nights, child_rates, stay_rates)
+from .nights import night_types_array
+from .seasons import night_seasons, stay_profile
+from .tariffs import DECAS_ROOM_TYPES, FULL_WEEK, WEEKDAY, WEEKEND
+from .weeks import WEEK_NIGHTS, cheapest_split, stay_costs
+
+
+@dataclass
+class AllInclusiveComparison:
+    hotels: List[str]
+    rooms: List[str]
+    weekday_rate: np.ndarray       # Promedio por noche si la estadía cruza temporadas
+    weekend_rate: np.ndarray
+    price_per_person: np.ndarray   # Precio base por persona para toda la estadía
+    total_usd: np.ndarray
+    total_cop: np.ndarray
+
+
+@dataclass
+class DecasComparison:
+    hotels: List[str]
+    total_decas: np.ndarray
+    total_usd: np.ndarray
+    admin_usd: np.ndarray
+    total_with_admin: np.ndarray
+    total_cop: np.ndarray
+
+
+def _profile(tariffs, season, check_in, check_out, calendar):
+    _stay_nights(check_in, check_out)
+    _check_season(season)
+    return stay_profile(check_in, check_out, season, calendar, tariffs.weekend_days)
+
+
+def _stay_amount(rates, profile):
+    """Importe de la estadía para cada tarifa (..., temporada, tipo de día)"""
+    return np.einsum('sd,...sd->...', profile, np.nan_to_num(rates))
+
+
+def compare_all_inclusive(tariffs, season, check_in, check_out, adults=2, children_ages=(),
+                          offer_2x1=False, discount=0, cop_per_usd=DEFAULT_COP_PER_USD, calendar=None):
+    """Cotiza todas las combinaciones hotel/habitación con las mismas reglas de quote_all_inclusive"""
+    profile = _profile(tariffs, season, check_in, check_out, calendar)
+    rates = tariffs.rates[..., :FULL_WEEK]
+    hotel_ids, room_ids = np.nonzero(_covers_stay(rates, profile))
+    rates = rates[hotel_ids, room_ids]
+    per_night = np.nan_to_num(stay_rates(profile, rates))
+    weekday_rate, weekend_rate = per_night[:, WEEKDAY], per_night[:, WEEKEND]
+    subtotal = _stay_amount(rates, profile)
+
+    # El total es proporcional al precio base: adultos con su oferta más la fracción de cada niño
+    if offer_2x1:
+        adult_share = 0.5
+    else:
+        adult_share = 1 - discount / 100.0
+    people = adults * adult_share + float(child_rates(list(children_ages)).sum())
+    total_usd = subtotal * people
+    return AllInclusiveComparison(
+        [tariffs.hotels[h] for h in hotel_ids], [tariffs.rooms[r] for r in room_ids],
+        weekday_rate, weekend_rate, subtotal, total_usd, total_usd * cop_per_usd)
+
+
+def compare_decas(tariffs, season, check_in, check_out, rooms, include_admin=True,
+                  cop_per_usd=DEFAULT_COP_PER_USD, calendar=None):
+    """Cotiza la misma mezcla de habitaciones en todos los hoteles de Decas"""
+    profile = _profile(tariffs, season, check_in, check_out, calendar)
+    nights = (check_out - check_in).days
+    night_ids = types = None
+    available = np.ones(len(tariffs.hotels), dtype=bool)
+    total_decas = np.zeros(len(tariffs.hotels))
+    for room_type in DECAS_ROOM_TYPES:
+        count = rooms.get(room_type, 0)
+        room_id = tariffs.room_id(room_type)
+        if count <= 0 or room_id < 0:
+            continue
+        rates = tariffs.rates[:, room_id, :, :FULL_WEEK]
+        available &= _covers_stay(rates, profile)
+        amount = _stay_amount(rates, profile)
+        week_rates = tariffs.rates[:, room_id, :, FULL_WEEK]
+        if nights >= WEEK_NIGHTS and not np.isnan(week_rates).all():
+            if night_ids is None:
+                night_ids = night_seasons(check_in, check_out, season, calendar)
+                types = night_types_array(check_in, nights, tariffs.weekend_days)
+            cheapest, _ = cheapest_split(*stay_costs(rates, week_rates, night_ids, types))
+            amount = np.minimum(amount, cheapest)
+        total_decas += count * amount
+
+    hotel_ids = np.flatnonzero(available)
+    total_decas = total_decas[hotel_ids]
+    total_usd = total_decas * DECA_TO_USD
+    if include_admin:
+        admin_usd = np.maximum(total_decas, ADMIN_MIN_DECAS) * ADMIN_USD_PER_DECA
+    else:
+        admin_usd = np.zeros_like(total_decas)
+    total_with_admin = total_usd + admin_usd
+    return DecasComparison([tariffs.hotels[h] for h in hotel_ids], total_decas, total_usd,
+                           admin_usd, total_with_admin, total_with_admin * cop_per_usd)
@@ -0,0 +1,322 @@
+import math
+from dataclasses import dataclass, field
+from datetime import timedelta
+from typing import List
+
+import numpy as np
+
+from .nights import count_nights, night_types_array
+from .seasons import AUTO_SEASON, night_seasons, stay_profile
+from .tariffs import SEASONS, DECAS_ROOM_TYPES
+from .weeks import WEEK_NIGHTS, WeekBlock, cheapest_weeks
+
+# Reglas de Decas
+DECA_TO_USD = 5              # Valor de una deca en USD
+ADMIN_USD_PER_DECA = 0.9     # Administración anual por deca
+ADMIN_MIN_DECAS = 70         # Mínimo de decas cobradas en la administración
+
+# Reglas de Todo Incluido
+CHILD_FREE_AGE = 6           # Menores de 6 años no pagan
+CHILD_MAX_AGE = 12           # De 6 a 11 años pagan tarifa de niño
+CHILD_RATE = 0.75            # Porcentaje del precio base para niños
+
+DEFAULT_COP_PER_USD = 4000
+
+
+@dataclass
+class SeasonNights:
+    """Noches de la estadía que caen en una temporada, con sus tarifas"""
+    season: str
+    weekday_nights: int
+    weekend_nights: int
+    weekday_rate: float      # NaN si no hay tarifa
+    weekend_rate: float
+    amount: float            # Importe de esas noches a tarifa por noche; las noches sin tarifa no se cobran
+
+
+@dataclass
+class DecasRoomLine:
+    """Resultado de un tipo de habitación dentro de una cotización en decas"""
+    room_type: str
+    rooms: int
+    weekday_nights: int
+    weekend_nights: int
+    weekday_rate: float      # Decas por noche; NaN si no hay tarifa (promedio si cruza temporadas)
+    weekend_rate: float
+    decas_per_room: float    # Con los bloques de semana completa que convienen
+    usd_per_room: float
+    decas: float
+    usd: float
+    seasons: List[SeasonNights] = field(default_factory=list)
+    week_blocks: List[WeekBlock] = field(default_factory=list)
+    week_savings: float = 0.0   # Decas por habitación que ahorran los bloques
+    unpriced_nights: int = 0    # Noches sin tarifa, que no se cobran
+
+
+@dataclass
+class DecasQuote:
+    hotel: str
+    season: str
+    check_in: object
+    check_out: object
+    nights: int
+    lines: List[DecasRoomLine]
+    total_decas: float
+    total_usd: float
+    include_admin: bool
+    admin_decas: float
+    admin_usd: float
+    total_with_admin: float
+    cop_per_usd: float
+    total_cop: float
+
+
+@dataclass
+class ChildLine:
+    age: int
+    rate: float              # Fracción del precio base que paga (0, 0.75 o 1)
+    price: float
+
+
+@dataclass
+class AllInclusiveQuote:
+    hotel: str
+    room: str
+    season: str
+    check_in: object
+    check_out: object
+    nights: int
+    weekday_nights: int
+    weekend_nights: int
+    weekday_rate: float      # Promedio por noche si la estadía cruza temporadas
+    weekend_rate: float
+    subtotal: float          # Precio base por persona para toda la estadía
+    adults: int
+    offer_2x1: bool
+    discount: int            # Porcentaje de descuento aplicado a adultos
+    adult_savings: float     # Ahorro por adulto por oferta o descuento
+    price_per_adult: float
+    total_adults: float
+    children: List[ChildLine] = field(default_factory=list)
+    total_children: float = 0.0
+    total_usd: float = 0.0
+    cop_per_usd: float = DEFAULT_COP_PER_USD
+    total_cop: float = 0.0
+    seasons: List[SeasonNights] = field(default_factory=list)
+
+
+def _stay_nights(check_in, check_out):
+    nights = (check_out - check_in).days
+    if nights <= 0:
+        raise ValueError("La fecha de salida debe ser posterior a la de entrada")
+    return nights
+
+
+def _check_season(season):
+    if season != AUTO_SEASON and season not in SEASONS:
+        raise ValueError(f"Temporada desconocida: {season}")
+
+
+def _tariff_ids(tariffs, hotel, season, rooms=()):
+    """Índices del hotel y de las habitaciones; ValueError si el tarifario o el hotel no los tiene"""
+    _check_season(season)
+    hotel_id = tariffs.hotel_id(hotel)
+    if hotel_id < 0:
+        raise ValueError(f"Hotel desconocido: {hotel}")
+    room_ids = [tariffs.room_id(room) for room in rooms]
+    for room, room_id in zip(rooms, room_ids):
+        if room_id < 0:
+            raise ValueError(f"Habitación desconocida: {room}")
+        if room not in tariffs.rooms_of(hotel):
+            raise ValueError(f"El hotel {hotel} no tiene habitación {room}")
+    return hotel_id, room_ids
+
+
+def _requested_rooms(rooms):
+    """Tipos de habitación con al menos una habitación en una mezcla de Decas"""
+    return [room_type for room_type, count in rooms.items() if count > 0]
+
+
+def season_nights(profile, rates):
+    """Desglosa un perfil de estadía (temporadas × tipo de día) con las tarifas (temporada, tipo de día) de una habitación"""
+    lines = []
+    for season_id in np.flatnonzero(profile.sum(axis=1)):
+        weekday_nights, weekend_nights = (int(n) for n in profile[season_id])
+        weekday_rate, weekend_rate = (float(rate) for rate in rates[season_id])
+        amount = sum((n * rate for n, rate in ((weekday_nights, weekday_rate), (weekend_nights, weekend_rate))
+                      if not math.isnan(rate)), 0.0)
+        lines.append(SeasonNights(SEASONS[season_id], weekday_nights, weekend_nights,
+                                  weekday_rate, weekend_rate, amount))
+    return lines
+
+
+def unpriced_nights(seasons):
+    """Noches de un desglose por temporada que no tienen tarifa"""
+    return sum((nights for line in seasons
+                for nights, rate in ((line.weekday_nights, line.weekday_rate),
+                                     (line.weekend_nights, line.weekend_rate))
+                if math.isnan(rate)), 0)
+
+
+def _covers_stay(rates, profile):
+    """Máscara de tarifas (..., temporada, tipo de día) que cubren todas las noches de la estadía"""
+    return (~np.isnan(rates) | (profile == 0)).all(axis=(-2, -1))
+
+
+def stay_rates(profile, rates):
+    """Tarifa por noche de cada tipo de día para la estadía.
+
+    ``rates`` tiene forma (..., temporadas, 2). Si todas las noches son de
+    una temporada se devuelven sus tarifas; si la estadía cruza temporadas,
+    el promedio por noche de cada tipo de día (las noches sin tarifa cuentan
+    como cero).
+    """
+    by_season = profile.sum(axis=1)
+    if not by_season.any():
+        return np.full(rates.shape[:-2] + (2,), np.nan)
+    primary = int(by_season.argmax())
+    if np.count_nonzero(by_season) == 1:
+        return rates[..., primary, :]
+    nights = profile.sum(axis=0)
+    averaged = np.einsum('sd,...sd->...d', profile, np.nan_to_num(rates)) / np.maximum(nights, 1)
+    return np.where(nights > 0, averaged, rates[..., primary, :])
+
+
+def admin_fee(total_decas):
+    """Devuelve (decas cobradas, USD) de la administración anual"""
+    admin_decas = max(ADMIN_MIN_DECAS, total_decas)
+    return admin_decas, admin_decas * ADMIN_USD_PER_DECA
+
+
+def child_rate(age):
+    """Fracción del precio base que paga un niño según su edad"""
+    if age < CHILD_FREE_AGE:
+        return 0.0
+    if age < CHILD_MAX_AGE:
+        return CHILD_RATE
+    return 1.0
+
+
+def child_rates(ages):
+    """Fracción del precio base para un arreglo de edades"""
+    ages = np.asarray(ages, dtype=float)
+    return np.where(ages < CHILD_FREE_AGE, 0.0,
+                    np.where(ages < CHILD_MAX_AGE, CHILD_RATE, 1.0))
+
+
+def guest_rates(ages, offer_2x1=False, discount=0):
+    """Fracción del precio base de cada huésped con las reglas de quote_all_inclusive.
+
+    Una edad NaN es un adulto, con la oferta 2x1 o el descuento; con edad se
+    cobra como un niño de ``children_ages`` (desde 12 años, precio completo
+    sin oferta).
+    """
+    ages = np.asarray(ages, dtype=float)
+    adult_share = 0.5 if offer_2x1 else 1 - discount / 100.0
+    return np.where(np.isnan(ages), adult_share, child_rates(ages))
+
+
+def quote_decas(tariffs, hotel, season, check_in, check_out, rooms,
+                include_admin=True, cop_per_usd=DEFAULT_COP_PER_USD, calendar=None):
+    """Cotiza una estadía pagada en decas.
+
+    ``rooms`` asocia cada tipo de habitación (Doble, Triple, Cuádruple) con
+    el número de habitaciones. Las fechas son ``datetime.date``. Con la
+    temporada AUTO_SEASON cada noche se cobra con la temporada del
+    calendario. Si el hotel tiene tarifa de semana completa, la estadía se
+    reparte entre noches sueltas y bloques de siete noches de la forma que
+    cobra menos decas. Un hotel, tipo de habitación o temporada que el
+    tarifario no tiene, o un tipo de habitación pedido que el hotel no
+    ofrece, es un ValueError.
+    """
+    nights = _stay_nights(check_in, check_out)
+    hotel_id, _ = _tariff_ids(tariffs, hotel, season, _requested_rooms(rooms))
+    weekday_nights, weekend_nights = count_nights(check_in, check_out, tariffs.weekend_days)
+    profile = stay_profile(check_in, check_out, season, calendar, tariffs.weekend_days)
+    night_ids = types = None
+
+    lines = []
+    total_decas = 0.0
+    for room_type in DECAS_ROOM_TYPES:
+        count = rooms.get(room_type, 0)
+        if count <= 0:
+            continue
+        room_id = tariffs.room_id(room_type)
+        rates = tariffs.room_rates(hotel_id, room_id)
+        # Las noches sin tarifa no se cobran
+        seasons = season_nights(profile, rates)
+        nightly_decas = sum((line.amount for line in seasons), 0.0)
+        decas_per_room, blocks = nightly_decas, []
+        week_rates = tariffs.week_rates(hotel_id, room_id)
+        if nights >= WEEK_NIGHTS and not np.isnan(week_rates).all():
+            if night_ids is None:
+                night_ids = night_seasons(check_in, check_out, season, calendar)
+                types = night_types_array(check_in, nights, tariffs.weekend_days)
+            cheapest, starts = cheapest_weeks(rates, week_rates, night_ids, types)
+            if starts:
+                decas_per_room = cheapest
+                blocks = [WeekBlock(check_in + timedelta(days=start), SEASONS[night_ids[start]],
+                                    float(week_rates[night_ids[start]]))
+                          for start in starts]
+        weekday_rate, weekend_rate = (float(rate) for rate in stay_rates(profile, rates))
+        lines.append(DecasRoomLine(
+            room_type, count, weekday_nights, weekend_nights, weekday_rate, weekend_rate,
+            decas_per_room, decas_per_room * DECA_TO_USD,
+            decas_per_room * count, decas_per_room * DECA_TO_USD * count, seasons,
+            blocks, nightly_decas - decas_per_room, unpriced_nights(seasons)))
+        total_decas += decas_per_room * count
+
+    total_usd = total_decas * DECA_TO_USD
+    admin_decas, admin_usd = admin_fee(total_decas) if include_admin else (0.0, 0.0)
+    total_with_admin = total_usd + admin_usd
+    return DecasQuote(hotel, season, check_in, check_out, nights, lines,
+                      total_decas, total_usd, include_admin, admin_decas, admin_usd,
+                      total_with_admin, cop_per_usd, total_with_admin * cop_per_usd)
+
+
+def quote_all_inclusive(tariffs, hotel, room, season, check_in, check_out,
+                        adults=2, children_ages=(), offer_2x1=False, discount=0,
+                        cop_per_usd=DEFAULT_COP_PER_USD, calendar=None):
+    """Cotiza una estadía Todo Incluido en USD y COP.
+
+    La oferta 2x1 y el descuento porcentual solo aplican a los adultos; si
+    ambos se indican, prevalece el 2x1. Los niños de 12 años o más pagan el
+    precio base completo. Con la temporada AUTO_SEASON cada noche se cobra
+    con la temporada del calendario. Un hotel, habitación o temporada que
+    el tarifario no tiene, una habitación que el hotel no ofrece o una
+    noche sin tarifa es un ValueError.
+    """
+    nights = _stay_nights(check_in, check_out)
+    hotel_id, (room_id,) = _tariff_ids(tariffs, hotel, season, [room])
+    weekday_nights, weekend_nights = count_nights(check_in, check_out, tariffs.weekend_days)
+    profile = stay_profile(check_in, check_out, season, calendar, tariffs.weekend_days)
+    rates = tariffs.room_rates(hotel_id, room_id)
+    # A diferencia de Decas, en Todo Incluido cada noche de la estadía necesita tarifa
+    seasons = season_nights(profile, rates)
+    missing = unpriced_nights(seasons)
+    if missing:
+        raise ValueError(f"{hotel} no tiene tarifa de {room} para {missing} noche(s) de la estadía")
+    weekday_rate, weekend_rate = (0.0 if math.isnan(rate) else float(rate)
+                                  for rate in stay_rates(profile, rates))
+    subtotal = sum((line.amount for line in seasons), 0.0)
+
+    if offer_2x1:
+        discount = 0
+        adult_savings = subtotal / 2
+    elif discount:
+        adult_savings = subtotal * discount / 100.0
+    else:
+        adult_savings = 0.0
+    price_per_adult = subtotal - adult_savings
+    total_adults = price_per_adult * adults
+
+    children = [ChildLine(age, child_rate(age), subtotal * child_rate(age))
+                for age in children_ages]
+    total_children = sum(child.price for child in children)
+
+    total_usd = total_adults + total_children
+    return AllInclusiveQuote(
+        hotel, room, season, check_in, check_out, nights,
+        weekday_nights, weekend_nights, weekday_rate, weekend_rate, subtotal,
+        adults, offer_2x1, discount, adult_savings, price_per_adult, total_adults,
+        children, total_children, total_usd, cop_per_usd, total_usd * cop_per_usd, seasons)
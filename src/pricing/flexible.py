@@ -0,0 +1,139 @@
+"""Búsqueda de fechas flexibles: las entradas más baratas dentro de una ventana.
+
+Se arma un arreglo con la tarifa de cada fecha de la ventana (según su
+temporada y tipo de día) y sus sumas acumuladas; el costo de cada entrada
+posible es la diferencia de dos sumas, así que toda la ventana se evalúa en
+una pasada. Como en las cotizaciones, en Decas las noches sin tarifa no se
+cobran y en Todo Incluido se descartan las entradas con alguna noche sin
+tarifa.
+Con AUTO_SEASON la ventana se recorta al final del calendario de temporadas.
+En Decas, el ahorro de los bloques de semana completa se calcula para todas
+las entradas a la vez, con una ventana deslizante de la estadía.
+"""
+from dataclasses import dataclass
+from datetime import timedelta
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+from .engine import _requested_rooms, _tariff_ids
+from .nights import night_types_array
+from .seasons import AUTO_SEASON, load_season_calendar, night_seasons
+from .tariffs import DECAS_ROOM_TYPES, SEASONS
+from .weeks import WEEK_NIGHTS, cheapest_split, stay_costs
+
+DEFAULT_WINDOW_DAYS = 180
+DEFAULT_LIMIT = 10
+
+
+@dataclass
+class CheckInOption:
+    check_in: object
+    check_out: object
+    cost: float              # USD por persona (Todo Incluido) o decas (Decas)
+
+
+def _week_savings(rates, week_rates, seasons, types, nights, window_days):
+    """Decas por habitación que ahorran los bloques de semana completa en cada entrada de la ventana"""
+    nightly, weekly = stay_costs(rates, week_rates, seasons, types)
+    nightly = sliding_window_view(nightly, nights)[:window_days]
+    weekly = sliding_window_view(weekly, nights)[:window_days].copy()
+    # Un bloque tiene que terminar dentro de la estadía
+    weekly[:, nights - WEEK_NIGHTS + 1:] = np.nan
+    cheapest, _ = cheapest_split(nightly, weekly)
+    return nightly.sum(axis=1) - cheapest
+
+
+def _stay_costs(nightly, season, first_check_in, nights, window_days, weekend_days, calendar, weeks=(),
+                complete=False):
+    """Costo de cada estadía de ``nights`` noches que entra en la ventana.
+
+    ``nightly`` tiene la tarifa por (temporada, tipo de día), NaN si no hay;
+    ``weeks`` es una lista de (habitaciones, tarifas, tarifas de semana
+    completa) de los tipos de habitación que pueden usar bloques. Las
+    noches sin tarifa no se cobran o, con ``complete``, dejan la estadía
+    en NaN.
+    """
+    days = window_days + nights - 1
+    types = night_types_array(first_check_in, days, weekend_days)
+    seasons = night_seasons(first_check_in, first_check_in + timedelta(days=days), season, calendar)
+    rates = nightly[seasons, types]
+    prefix = np.concatenate(([0.0], np.cumsum(np.nan_to_num(rates))))
+    costs = prefix[nights:] - prefix[:window_days]
+    if complete:
+        unpriced = np.concatenate(([0], np.cumsum(np.isnan(rates))))
+        costs[unpriced[nights:] > unpriced[:window_days]] = np.nan
+    if nights >= WEEK_NIGHTS:
+        for count, rates, week_rates in weeks:
+            costs -= count * _week_savings(rates, week_rates, seasons, types, nights, window_days)
+    return costs
+
+
+def _cheapest(nightly, season, first_check_in, nights, window_days, limit, weekend_days, calendar=None,
+              weeks=(), complete=False):
+    if nights <= 0:
+        raise ValueError("La estadía debe tener al menos una noche")
+    if season == AUTO_SEASON:
+        calendar = calendar or load_season_calendar()
+        window_days = min(window_days, calendar.nights_left(first_check_in) - nights + 1)
+    if window_days <= 0 or np.isnan(nightly).all():
+        return []
+    costs = _stay_costs(nightly, season, first_check_in, nights, window_days,
+                        weekend_days, calendar, weeks, complete)
+    priced = np.flatnonzero(~np.isnan(costs))
+    # Redondeo para que los empates se ordenen por fecha y no por error de punto flotante
+    order = priced[np.argsort(np.round(costs[priced], 6), kind='stable')][:limit]
+    return [CheckInOption(first_check_in + timedelta(days=int(i)),
+                          first_check_in + timedelta(days=int(i) + nights), float(costs[i]))
+            for i in order]
+
+
+def cheapest_all_inclusive_check_ins(tariffs, hotel, room, season, nights, first_check_in,
+                                     window_days=DEFAULT_WINDOW_DAYS, limit=DEFAULT_LIMIT,
+                                     weekend_days=None, calendar=None):
+    """Entradas más baratas para Todo Incluido; el costo es el precio base por persona.
+
+    ``weekend_days`` por defecto son las noches de fin de semana del tarifario.
+    """
+    hotel_id, (room_id,) = _tariff_ids(tariffs, hotel, season, [room])
+    nightly = tariffs.room_rates(hotel_id, room_id)
+    return _cheapest(nightly, season, first_check_in, nights, window_days, limit,
+                     weekend_days or tariffs.weekend_days, calendar, complete=True)
+
+
+def cheapest_all_inclusive_group_check_ins(tariffs, hotel, season, nights, first_check_in, shares,
+                                           window_days=DEFAULT_WINDOW_DAYS, limit=DEFAULT_LIMIT,
+                                           weekend_days=None, calendar=None):
+    """Entradas más baratas para un grupo Todo Incluido; el costo es el total del grupo en USD.
+
+    ``shares`` tiene, por tipo de habitación, los huéspedes equivalentes que
+    pagan el precio base completo (``GroupRoomLine.shares``).
+    """
+    hotel_id, room_ids = _tariff_ids(tariffs, hotel, season, list(shares))
+    # Una noche sin tarifa en cualquiera de las habitaciones deja la noche sin tarifa
+    nightly = np.zeros((len(SEASONS), 2))
+    for room_id, room_shares in zip(room_ids, shares.values()):
+        nightly = nightly + room_shares * tariffs.room_rates(hotel_id, room_id)
+    return _cheapest(nightly, season, first_check_in, nights, window_days, limit,
+                     weekend_days or tariffs.weekend_days, calendar, complete=True)
+
+
+def cheapest_decas_check_ins(tariffs, hotel, season, nights, first_check_in, rooms,
+                             window_days=DEFAULT_WINDOW_DAYS, limit=DEFAULT_LIMIT,
+                             weekend_days=None, calendar=None):
+    """Entradas más baratas para una mezcla de habitaciones en decas, con semanas completas"""
+    hotel_id, _ = _tariff_ids(tariffs, hotel, season, _requested_rooms(rooms))
+    nightly = np.full((len(SEASONS), 2), np.nan)
+    weeks = []
+    for room_type in DECAS_ROOM_TYPES:
+        count = rooms.get(room_type, 0)
+        if count <= 0:
+            continue
+        room_id = tariffs.room_id(room_type)
+        rates = tariffs.room_rates(hotel_id, room_id)
+        nightly = np.where(np.isnan(rates), nightly, np.nan_to_num(nightly) + count * rates)
+        week_rates = tariffs.week_rates(hotel_id, room_id)
+        if not np.isnan(week_rates).all():
+            weeks.append((count, rates, week_rates))
+    return _cheapest(nightly, season, first_check_in, nights, window_days, limit,
+                     weekend_days or tariffs.weekend_days, calendar, weeks)
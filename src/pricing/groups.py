@@ -0,0 +1,190 @@
+"""Cotización Todo Incluido de grupos grandes.
+
+Un grupo es una lista de huéspedes con su edad y su tipo de habitación; se
+puede escribir a mano o importar de un CSV. El precio base por persona se
+calcula una vez por tipo de habitación y las reglas de niños y adultos de
+``quote_all_inclusive`` se aplican a todos los huéspedes con arreglos de
+NumPy: los huéspedes sin edad son adultos, con la oferta 2x1 o el
+descuento, y los que tienen edad se cobran como los niños de una reserva:
+los menores de 6 años no pagan, de 6 a 11 pagan el 75 % y desde los 12
+pagan el precio completo sin oferta.
+"""
+import csv
+import re
+from dataclasses import dataclass, field
+from typing import List
+
+import numpy as np
+
+from .engine import CHILD_FREE_AGE, DEFAULT_COP_PER_USD, _covers_stay, _stay_nights, _tariff_ids, guest_rates
+from .seasons import stay_profile
+
+# "A" o "adulto": un adulto sin edad; "10x8": diez huéspedes de 8 años
+_GUEST_TOKEN = re.compile(r'(?:(\d+)\s*[x×])?(\d+|a|adultos?)', re.IGNORECASE)
+
+
+@dataclass
+class GroupRoomLine:
+    """Huéspedes de un tipo de habitación dentro de un grupo"""
+    room: str
+    guests: int
+    adults: int
+    children: int
+    free_children: int
+    subtotal: float          # Precio base por persona para toda la estadía
+    price_per_adult: float
+    total_adults: float
+    total_children: float
+    total_usd: float
+    shares: float            # Huéspedes equivalentes que pagan el precio base completo
+
+
+@dataclass
+class GroupQuote:
+    hotel: str
+    season: str
+    check_in: object
+    check_out: object
+    nights: int
+    lines: List[GroupRoomLine]
+    guests: int
+    adults: int
+    children: int
+    offer_2x1: bool
+    discount: int
+    total_adults: float
+    total_children: float
+    total_usd: float
+    cop_per_usd: float
+    total_cop: float
+    prices: np.ndarray = field(default=None, repr=False)   # Precio de cada huésped, en el orden recibido
+
+
+def parse_guests(text, default_room):
+    """Lee huéspedes escritos a mano y devuelve (edades, habitaciones).
+
+    Cada línea tiene edades separadas por comas o espacios, opcionalmente
+    precedidas de "Habitación:"; sin habitación se usa ``default_room``. La
+    edad de un adulto sin edad es NaN.
+    """
+    ages, rooms = [], []
+    for number, line in enumerate(text.splitlines(), 1):
+        room, _, values = line.rpartition(':')
+        room = room.strip() or default_room
+        for token in filter(None, re.split(r'[,;\s]+', values.strip())):
+            match = _GUEST_TOKEN.fullmatch(token)
+            if match is None:
+                raise ValueError(f"Línea {number}: no se entiende '{token}'")
+            count = int(match.group(1) or 1)
+            age = match.group(2)
+            ages.extend([float(age) if age.isdigit() else np.nan] * count)
+            rooms.extend([room] * count)
+    return np.array(ages, dtype=float), np.array(rooms, dtype=object)
+
+
+def format_guests(ages, rooms):
+    """Texto que parse_guests vuelve a leer, agrupando huéspedes iguales de cada habitación"""
+    lines = []
+    rooms = np.asarray(rooms, dtype=object)
+    for room in dict.fromkeys(rooms):
+        room_ages = np.asarray(ages, dtype=float)[rooms == room]
+        adults = int(np.isnan(room_ages).sum())
+        values, counts = np.unique(room_ages[~np.isnan(room_ages)], return_counts=True)
+        tokens = [f"{adults}xA" if adults > 1 else "A"] if adults else []
+        tokens += [f"{count}x{value:.0f}" if count > 1 else f"{value:.0f}"
+                   for value, count in zip(values[::-1], counts[::-1])]
+        lines.append(f"{room}: {', '.join(tokens)}")
+    return "\n".join(lines)
+
+
+def read_guests_csv(csv_path, default_room):
+    """Lee un CSV con una fila por huésped: columna Edad (vacía para un adulto) y, opcional, Habitación"""
+    with open(csv_path, newline='', encoding='utf-8-sig') as f:
+        reader = csv.DictReader(f)
+        columns = {name.strip().casefold(): name for name in reader.fieldnames or []}
+        age_column = columns.get('edad') or columns.get('age')
+        room_column = columns.get('habitación') or columns.get('habitacion') or columns.get('room')
+        if age_column is None:
+            raise ValueError("El CSV de huéspedes necesita una columna Edad")
+        ages, rooms = [], []
+        for number, row in enumerate(reader, 2):
+            age = (row[age_column] or '').strip()
+            try:
+                ages.append(float(age) if age else np.nan)
+            except ValueError:
+                raise ValueError(f"Fila {number}: edad inválida '{age}'") from None
+            rooms.append(((row[room_column] or '').strip() if room_column else '') or default_room)
+    return np.array(ages, dtype=float), np.array(rooms, dtype=object)
+
+
+def _room_names(tariffs, hotel, rooms):
+    """Nombres de habitación del tarifario para cada nombre escrito (sin distinguir mayúsculas)"""
+    available = {room.casefold(): room for room in tariffs.rooms_of(hotel)}
+    names = []
+    for room in rooms:
+        name = available.get(str(room).strip().casefold())
+        if name is None:
+            raise ValueError(f"El hotel {hotel} no tiene habitación {room}")
+        names.append(name)
+    return names
+
+
+def quote_all_inclusive_group(tariffs, hotel, season, check_in, check_out, ages, rooms,
+                              offer_2x1=False, discount=0, cop_per_usd=DEFAULT_COP_PER_USD, calendar=None):
+    """Cotiza un grupo Todo Incluido con las reglas de quote_all_inclusive.
+
+    ``ages`` tiene la edad de cada huésped (NaN para un adulto sin edad) y
+    ``rooms`` su tipo de habitación, o un solo nombre para todo el grupo.
+    """
+    nights = _stay_nights(check_in, check_out)
+    hotel_id, _ = _tariff_ids(tariffs, hotel, season)
+    ages = np.asarray(ages, dtype=float)
+    if not len(ages):
+        raise ValueError("El grupo no tiene huéspedes")
+    if (ages < 0).any():
+        raise ValueError("Las edades no pueden ser negativas")
+    if isinstance(rooms, str):
+        rooms = [rooms] * len(ages)
+    if len(rooms) != len(ages):
+        raise ValueError("Cada huésped necesita un tipo de habitación")
+
+    # Tipos de habitación del tarifario, en el orden en que aparecen
+    written, written_index = np.unique(np.asarray(rooms, dtype=object).astype(str), return_inverse=True)
+    canonical = np.array(_room_names(tariffs, hotel, written), dtype=object)[written_index.ravel()]
+    names, first, room_index = np.unique(canonical.astype(str), return_index=True, return_inverse=True)
+    order = np.argsort(first)
+    names = names[order].tolist()
+    room_index = np.argsort(order)[room_index.ravel()]
+
+    # Igual que quote_all_inclusive: cada noche de la estadía necesita tarifa
+    profile = stay_profile(check_in, check_out, season, calendar, tariffs.weekend_days)
+    rates = np.stack([tariffs.room_rates(hotel_id, tariffs.room_id(name)) for name in names])
+    for name, covered in zip(names, _covers_stay(rates, profile)):
+        if not covered:
+            raise ValueError(f"{hotel} no tiene tarifa de {name} para todas las noches de la estadía")
+    subtotals = np.einsum('sd,rsd->r', profile, np.nan_to_num(rates))
+
+    discount = 0 if offer_2x1 else discount
+    adult_share = float(guest_rates(np.nan, offer_2x1, discount))
+    adults = np.isnan(ages)
+    guest_shares = guest_rates(ages, offer_2x1, discount)
+    prices = subtotals[room_index] * guest_shares
+
+    size = len(names)
+    room_adults = np.bincount(room_index, weights=adults, minlength=size).astype(int)
+    room_guests = np.bincount(room_index, minlength=size)
+    free = np.bincount(room_index, weights=ages < CHILD_FREE_AGE, minlength=size).astype(int)
+    adult_totals = np.bincount(room_index, weights=np.where(adults, prices, 0.0), minlength=size)
+    child_totals = np.bincount(room_index, weights=np.where(adults, 0.0, prices), minlength=size)
+    shares = np.bincount(room_index, weights=guest_shares, minlength=size)
+    lines = [GroupRoomLine(name, int(guests), int(adult_count), int(guests - adult_count), int(free_count),
+                           float(subtotal), float(subtotal * adult_share), float(adult_total),
+                           float(child_total), float(adult_total + child_total), float(room_shares))
+             for name, guests, adult_count, free_count, subtotal, adult_total, child_total, room_shares
+             in zip(names, room_guests, room_adults, free, subtotals, adult_totals, child_totals, shares)]
+
+    total_adults, total_children = float(adult_totals.sum()), float(child_totals.sum())
+    total_usd = total_adults + total_children
+    return GroupQuote(hotel, season, check_in, check_out, nights, lines, len(ages), int(adults.sum()),
+                      int(len(ages) - adults.sum()), offer_2x1, discount, total_adults, total_children,
+                      total_usd, cop_per_usd, total_usd * cop_per_usd, prices)
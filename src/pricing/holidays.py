@@ -0,0 +1,46 @@
+"""Festivos de Colombia, calculados para cualquier año.
+
+Hay festivos fijos (1 de enero, 1 de mayo, 20 de julio, 7 de agosto, 8 y
+25 de diciembre), festivos que la Ley Emiliani traslada al lunes siguiente
+(Reyes, San José, San Pedro y San Pablo, Asunción, Día de la Raza, Todos los
+Santos e Independencia de Cartagena) y festivos que dependen de la Pascua:
+Jueves y Viernes Santo, y Ascensión, Corpus Christi y Sagrado Corazón, que
+también se celebran en lunes.
+"""
+from datetime import date, timedelta
+from functools import lru_cache
+
+FIXED_HOLIDAYS = ((1, 1), (5, 1), (7, 20), (8, 7), (12, 8), (12, 25))
+EMILIANI_HOLIDAYS = ((1, 6), (3, 19), (6, 29), (8, 15), (10, 12), (11, 1), (11, 11))
+# Días desde el domingo de Pascua
+EASTER_HOLIDAYS = (-3, -2, 43, 64, 71)
+
+
+def easter_sunday(year):
+    """Domingo de Pascua (algoritmo anónimo del calendario gregoriano)"""
+    a = year % 19
+    b, c = divmod(year, 100)
+    d, e = divmod(b, 4)
+    f = (b + 8) // 25
+    g = (b - f + 1) // 3
+    h = (19 * a + b - d - g + 15) % 30
+    i, k = divmod(c, 4)
+    l = (32 + 2 * e + 2 * i - h - k) % 7
+    m = (a + 11 * h + 22 * l) // 451
+    month, day = divmod(h + l - 7 * m + 114, 31)
+    return date(year, month, day + 1)
+
+
+def next_monday(day):
+    """El mismo día si es lunes; si no, el lunes siguiente"""
+    return day + timedelta(days=(7 - day.weekday()) % 7)
+
+
+@lru_cache(maxsize=None)
+def colombian_holidays(year):
+    """Conjunto de fechas festivas del año"""
+    easter = easter_sunday(year)
+    holidays = {date(year, month, day) for month, day in FIXED_HOLIDAYS}
+    holidays.update(next_monday(date(year, month, day)) for month, day in EMILIANI_HOLIDAYS)
+    holidays.update(easter + timedelta(days=offset) for offset in EASTER_HOLIDAYS)
+    return frozenset(holidays)
@@ -0,0 +1,165 @@
+"""Tipo de día (entre semana o fin de semana) de cada noche.
+
+Una noche se cobra como fin de semana si cae en ``weekend_days`` (por
+defecto viernes y sábado, como en la columna 'Días' de los CSV) o si el día
+siguiente es festivo en Colombia, como el domingo de un puente. Para los
+años de CALENDAR_YEARS el tipo de cada noche está precalculado en un arreglo
+de bits con sus conteos acumulados: consultar una noche o contar las de una
+estadía toma tiempo constante. Fuera de ese rango solo se aplica el patrón
+semanal, sin festivos.
+"""
+from datetime import date, timedelta
+from functools import lru_cache
+
+import numpy as np
+
+from .holidays import colombian_holidays
+from .tariffs import WEEKDAY, WEEKEND, WEEKEND_NIGHTS
+
+CALENDAR_YEARS = (2000, 2099)
+
+
+def _week_pattern(start_weekday, weekend_days):
+    """Tipos de día de siete noches consecutivas a partir de start_weekday"""
+    return tuple(
+        WEEKEND if (start_weekday - 1 + i) % 7 + 1 in weekend_days else WEEKDAY
+        for i in range(7)
+    )
+
+
+class DayTypeCalendar:
+    """Tipo de día de cada noche desde ``first_day``: un bit por noche (1 = fin de semana)"""
+
+    def __init__(self, first_day, weekend):
+        weekend = np.asarray(weekend, dtype=bool)
+        self.first_day = first_day
+        self.size = len(weekend)
+        self.bits = np.packbits(weekend)
+        # prefix[i]: noches de fin de semana antes de la noche i
+        self.prefix = np.concatenate(([0], np.cumsum(weekend, dtype=np.int32)))
+
+    @classmethod
+    def build(cls, first_year, last_year, weekend_days=WEEKEND_NIGHTS):
+        first_day = date(first_year, 1, 1)
+        size = (date(last_year + 1, 1, 1) - first_day).days
+        weekdays = (first_day.weekday() + np.arange(size)) % 7 + 1
+        weekend = np.isin(weekdays, list(weekend_days))
+        # La noche anterior a un festivo se cobra como fin de semana
+        eves = [(holiday - first_day).days - 1
+                for year in range(first_year, last_year + 2) for holiday in colombian_holidays(year)]
+        eves = np.array([offset for offset in eves if 0 <= offset < size], dtype=np.int64)
+        weekend[eves] = True
+        return cls(first_day, weekend)
+
+    def _offset(self, day):
+        return (day - self.first_day).days
+
+    def covers(self, check_in, check_out):
+        return self._offset(check_in) >= 0 and self._offset(check_out) <= self.size
+
+    def day_type(self, night):
+        """WEEKDAY o WEEKEND de una noche dentro del calendario"""
+        i = self._offset(night)
+        return int(self.bits[i >> 3] >> (7 - (i & 7)) & 1)
+
+    def count(self, check_in, check_out):
+        """(noches entre semana, noches de fin de semana) de una estadía dentro del calendario"""
+        start, end = self._offset(check_in), self._offset(check_out)
+        weekend = int(self.prefix[end] - self.prefix[start])
+        return end - start - weekend, weekend
+
+    def types(self, first_night, count):
+        """Tipo de día de ``count`` noches desde first_night; los bits ya valen WEEKDAY (0) o WEEKEND (1)"""
+        start = self._offset(first_night)
+        first_byte = start >> 3
+        bits = np.unpackbits(self.bits[first_byte:(start + count + 7) >> 3])
+        return bits[start - (first_byte << 3):][:count]
+
+
+@lru_cache(maxsize=None)
+def day_type_calendar(weekend_days=WEEKEND_NIGHTS):
+    """Calendario de tipos de día de CALENDAR_YEARS, construido la primera vez que se pide"""
+    return DayTypeCalendar.build(*CALENDAR_YEARS, frozenset(weekend_days))
+
+
+def count_nights(check_in, check_out, weekend_days=WEEKEND_NIGHTS):
+    """Cuenta (noches entre semana, noches de fin de semana) de la estadía.
+
+    Dentro del calendario es la resta de dos conteos acumulados; fuera de él
+    se resuelve con aritmética sobre el día de la semana de entrada y el
+    número de noches. En ningún caso se recorre la estadía noche por noche.
+    """
+    nights = (check_out - check_in).days
+    if nights <= 0:
+        return 0, 0
+    calendar = day_type_calendar(weekend_days)
+    if calendar.covers(check_in, check_out):
+        return calendar.count(check_in, check_out)
+    full_weeks, remainder = divmod(nights, 7)
+    pattern = _week_pattern(check_in.isoweekday(), weekend_days)
+    weekend = full_weeks * len(weekend_days) + pattern[:remainder].count(WEEKEND)
+    return nights - weekend, weekend
+
+
+def night_types(check_in, check_out, weekend_days=WEEKEND_NIGHTS):
+    """Devuelve el tipo de día de cada noche; solo para desgloses detallados"""
+    return night_types_array(check_in, (check_out - check_in).days, weekend_days).tolist()
+
+
+def night_types_array(first_night, count, weekend_days=WEEKEND_NIGHTS):
+    """Tipo de día de ``count`` noches consecutivas desde first_night, como arreglo de enteros"""
+    count = max(count, 0)
+    calendar = day_type_calendar(weekend_days)
+    if calendar.covers(first_night, first_night + timedelta(days=count)):
+        return calendar.types(first_night, count)
+    pattern = np.array(_week_pattern(first_night.isoweekday(), weekend_days), dtype=np.uint8)
+    return np.resize(pattern, count)
+
+
+def night_types_grid(check_in, nights, count, weekend_days=WEEKEND_NIGHTS):
+    """Tipo de día de las primeras ``count`` noches de varias estadías: arreglo (estadías, count).
+
+    ``check_in`` es un arreglo ``datetime64[D]`` y ``nights`` el largo de
+    cada estadía; como en night_types_array, las estadías que el calendario
+    no cubre usan solo el patrón semanal.
+    """
+    calendar = day_type_calendar(weekend_days)
+    start = (np.asarray(check_in, dtype='datetime64[D]')
+             - np.datetime64(calendar.first_day, 'D')).astype(np.int64)
+    covered = (start >= 0) & (start + np.asarray(nights) <= calendar.size)
+    days = start[:, None] + np.arange(count)
+    offsets = np.clip(days, 0, calendar.size - 1)
+    from_calendar = calendar.bits[offsets >> 3] >> (7 - (offsets & 7)) & 1
+    # El calendario empieza un 1 de enero; el día de la semana sale de su desfase
+    weekdays = (days + calendar.first_day.weekday()) % 7 + 1
+    from_pattern = np.isin(weekdays, list(weekend_days)).astype(np.uint8)
+    return np.where(covered[:, None], from_calendar, from_pattern)
+
+
+def count_nights_array(check_in, check_out, weekend_days=WEEKEND_NIGHTS):
+    """Versión vectorizada de count_nights para arreglos ``datetime64[D]``.
+
+    Devuelve (noches, noches entre semana, noches de fin de semana) como
+    arreglos de enteros; las estadías inválidas cuentan cero noches.
+    """
+    start = np.asarray(check_in, dtype='datetime64[D]').astype(np.int64)
+    end = np.asarray(check_out, dtype='datetime64[D]').astype(np.int64)
+    nights = np.maximum(end - start, 0)
+    # 1970-01-01 fue jueves (ISO 4)
+    start_weekday = (start + 3) % 7
+    # partial[w, k]: noches de fin de semana en las primeras k noches desde el día w
+    partial = np.array([
+        np.concatenate(([0], np.cumsum(np.array(_week_pattern(w + 1, weekend_days)) == WEEKEND)))
+        for w in range(7)
+    ])
+    full_weeks, remainder = np.divmod(nights, 7)
+    weekend = full_weeks * len(weekend_days) + partial[start_weekday, remainder]
+
+    # Las estadías dentro del calendario cuentan también los festivos
+    calendar = day_type_calendar(weekend_days)
+    first = np.datetime64(calendar.first_day, 'D').astype(np.int64)
+    covered = (start >= first) & (start + nights <= first + calendar.size)
+    offset = np.where(covered, start - first, 0)
+    from_calendar = calendar.prefix[offset + np.where(covered, nights, 0)] - calendar.prefix[offset]
+    weekend = np.where(covered, from_calendar, weekend)
+    return nights, nights - weekend, weekend
@@ -0,0 +1,32 @@
+"""Recarga de tarifarios cuando cambia su CSV, sin depender de Qt.
+
+Se usa en los modos sin interfaz: se revisa periódicamente la fecha y el
+tamaño del archivo y solo se vuelve a leer el tarifario que cambió. Si el
+contenido es el mismo, la caché compilada evita reconstruir el índice.
+"""
+import os
+
+
+def file_stamp(path):
+    """(fecha de modificación, tamaño) del archivo, o None si no existe"""
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+
+class TariffReloader:
+    def __init__(self, csv_path, load):
+        self.csv_path = csv_path
+        self.load = load
+        self._stamp = file_stamp(csv_path)
+
+    def changed(self):
+        stamp = file_stamp(self.csv_path)
+        return stamp is not None and stamp != self._stamp
+
+    def reload(self):
+        """Vuelve a cargar el tarifario; si falla no se reintenta hasta el próximo cambio"""
+        self._stamp = file_stamp(self.csv_path)
+        return self.load(self.csv_path)
@@ -0,0 +1,145 @@
+"""Mezcla de habitaciones más barata para un grupo en Decas.
+
+Cada tipo de habitación tiene un costo por estadía (el de ``quote_decas``
+con una habitación, incluidos los bloques de semana completa) y una
+capacidad. Elegir cuántas habitaciones de cada tipo reservar es una mochila
+entera acotada: se recorre la capacidad total con programación dinámica,
+guardando en cada capacidad las ``limit`` mezclas más baratas. Sin límite
+de disponibilidad, las habitaciones de un tipo se agregan en paquetes de 1,
+2, 4, ... (cada cantidad tiene una sola representación binaria), así cada
+paso desplaza el arreglo completo y el tiempo crece con el logaritmo del
+número de habitaciones.
+
+Solo se listan mezclas sin habitaciones de sobra: si se quita cualquiera,
+ya no caben todos. Para eso se resuelve una vez por cada tipo como
+"habitación más pequeña de la mezcla"; con ese tipo fijo, una mezcla es
+necesaria si su capacidad es menor que los huéspedes más esa capacidad.
+"""
+from dataclasses import dataclass
+from typing import Dict
+
+import numpy as np
+
+from .engine import DECA_TO_USD, _stay_nights, quote_decas
+from .tariffs import DECAS_ROOM_TYPES
+
+# Huéspedes por habitación
+ROOM_CAPACITY = {"Doble": 2, "Triple": 3, "Cuádruple": 4}
+DEFAULT_LIMIT = 10
+
+
+@dataclass
+class RoomMix:
+    rooms: Dict[str, int]    # Habitaciones por tipo, solo los tipos usados
+    capacity: int            # Huéspedes que caben
+    total_decas: float
+    total_usd: float
+
+
+def _shifted(cost, counts, room, rooms, capacity, price):
+    """Las mezclas con ``rooms`` habitaciones más del tipo, en su nueva capacidad"""
+    shift = rooms * capacity
+    new_cost = np.full_like(cost, np.inf)
+    new_counts = np.zeros_like(counts)
+    new_cost[shift:] = cost[:-shift] + rooms * price
+    new_counts[shift:] = counts[:-shift]
+    new_counts[shift:, :, room] += rooms
+    return new_cost, new_counts
+
+
+def _keep_best(cost, counts, new_cost, new_counts):
+    """Deja en cada capacidad las mejores mezclas entre las actuales y las nuevas"""
+    limit = cost.shape[1]
+    merged_cost = np.concatenate((cost, new_cost), axis=1)
+    merged_counts = np.concatenate((counts, new_counts), axis=1)
+    best = np.argsort(merged_cost, axis=1, kind='stable')[:, :limit]
+    cost[:] = np.take_along_axis(merged_cost, best, axis=1)
+    counts[:] = np.take_along_axis(merged_counts, best[..., None], axis=1)
+
+
+def _add_rooms(cost, counts, room, capacity, price, bound):
+    """Agrega hasta ``bound`` habitaciones de un tipo a las mezclas (capacidad, k mejores).
+
+    Si el límite no alcanza a restringir dentro de las capacidades posibles,
+    las habitaciones se agregan en paquetes de 1, 2, 4, ...; si restringe,
+    se prueba cada cantidad, porque descartar mezclas que se pasan del
+    límite después de guardar solo las k mejores perdería soluciones.
+    """
+    size = len(cost)
+    if bound >= (size - 1) // capacity:
+        package = 1
+        while package * capacity < size:
+            _keep_best(cost, counts, *_shifted(cost, counts, room, package, capacity, price))
+            package *= 2
+    else:
+        old_cost, old_counts = cost.copy(), counts.copy()
+        for rooms in range(1, bound + 1):
+            _keep_best(cost, counts, *_shifted(old_cost, old_counts, room, rooms, capacity, price))
+
+
+def cheapest_mixes(costs, capacities, guests, max_rooms=None, limit=DEFAULT_LIMIT):
+    """Mezclas más baratas para ``guests`` huéspedes.
+
+    ``costs[t]`` es el costo de una habitación del tipo t (NaN si no se
+    puede usar), ``capacities[t]`` sus huéspedes y ``max_rooms[t]`` el
+    máximo de habitaciones (None sin límite). Devuelve [(costo,
+    habitaciones por tipo)] de la más barata a la más cara.
+    """
+    if guests <= 0:
+        raise ValueError("El grupo debe tener al menos un huésped")
+    types = len(costs)
+    max_rooms = max_rooms or [None] * types
+    # Una mezcla sin habitaciones de sobra nunca tiene más habitaciones que huéspedes
+    bounds = [guests if bound is None else min(bound, guests) for bound in max_rooms]
+    order = sorted((t for t in range(types)
+                    if not np.isnan(costs[t]) and capacities[t] > 0 and bounds[t] > 0),
+                   key=lambda t: (capacities[t], t))
+
+    mixes = []
+    for position, first in enumerate(order):
+        # Capacidades posibles: hasta guests + capacidad de la más pequeña - 1
+        size = guests + capacities[first]
+        cost = np.full((size, limit), np.inf)
+        counts = np.zeros((size, limit, types), dtype=np.int64)
+        cost[capacities[first], 0] = costs[first]
+        counts[capacities[first], 0, first] = 1
+        for room in order[position:]:
+            _add_rooms(cost, counts, room, capacities[room], costs[room], bounds[room] - (room == first))
+        found = np.isfinite(cost[guests:])
+        mixes.extend(zip(cost[guests:][found].tolist(), map(tuple, counts[guests:][found].tolist())))
+
+    # A igual costo, primero la que usa menos habitaciones
+    mixes.sort(key=lambda mix: (round(mix[0], 6), sum(mix[1]), mix[1]))
+    return mixes[:limit]
+
+
+def cheapest_room_mixes(tariffs, hotel, season, check_in, check_out, guests,
+                        capacity=None, max_rooms=None, limit=DEFAULT_LIMIT, calendar=None):
+    """Mezclas de habitaciones más baratas para un grupo en un hotel y fechas.
+
+    ``capacity`` cambia los huéspedes por habitación de algún tipo (por
+    ejemplo, como máximo 3 en una Cuádruple) y ``max_rooms`` limita las
+    habitaciones disponibles de un tipo. Los tipos que el hotel no ofrece o
+    sin tarifa para alguna noche de la estadía no se usan.
+    """
+    _stay_nights(check_in, check_out)
+    capacity = {**ROOM_CAPACITY, **(capacity or {})}
+    max_rooms = max_rooms or {}
+    offered = tariffs.rooms_of(hotel)
+    quote = quote_decas(tariffs, hotel, season, check_in, check_out,
+                        {room_type: 1 for room_type in DECAS_ROOM_TYPES if room_type in offered},
+                        include_admin=False, calendar=calendar)
+    lines = {line.room_type: line for line in quote.lines}
+    costs = []
+    for room_type in DECAS_ROOM_TYPES:
+        line = lines.get(room_type)
+        # Igual que la comparación de hoteles: hace falta tarifa para todas las noches
+        complete = line and line.seasons and not line.unpriced_nights
+        costs.append(line.decas_per_room if complete else np.nan)
+
+    mixes = cheapest_mixes(costs, [capacity[room_type] for room_type in DECAS_ROOM_TYPES], guests,
+                           [max_rooms.get(room_type) for room_type in DECAS_ROOM_TYPES], limit)
+    return [RoomMix({room_type: count for room_type, count in zip(DECAS_ROOM_TYPES, counts) if count},
+                    sum(count * capacity[room_type] for room_type, count in zip(DECAS_ROOM_TYPES, counts)),
+                    decas, decas * DECA_TO_USD)
+            for decas, counts in mixes]
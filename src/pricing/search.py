@@ -0,0 +1,93 @@
+"""Índice de búsqueda de hoteles por nombre, país y categoría.
+
+El texto se normaliza sin tildes ni mayúsculas ("isleno" encuentra
+"ISLEÑO"). Cada hotel se indexa por sus n-gramas de hasta tres letras, así
+una búsqueda solo verifica los hoteles que comparten todos los n-gramas de
+la consulta en lugar de recorrer la lista completa. Los resultados se
+ordenan poniendo primero los que empiezan por la consulta.
+"""
+import re
+import unicodedata
+from collections import defaultdict
+
+NGRAM_SIZE = 3
+
+# Rangos de coincidencia, de mejor a peor
+NAME_PREFIX, WORD_PREFIX, DETAIL_MATCH, SUBSTRING = range(4)
+
+
+def normalize(text):
+    """Minúsculas sin tildes, con cualquier signo convertido en un espacio"""
+    decomposed = unicodedata.normalize('NFKD', str(text))
+    without_marks = ''.join(c for c in decomposed if not unicodedata.combining(c))
+    return ' '.join(re.split(r'[^0-9a-z]+', without_marks.casefold())).strip()
+
+
+def _ngrams(text):
+    return {text[i:i + n] for n in range(1, NGRAM_SIZE + 1) for i in range(len(text) - n + 1)}
+
+
+class HotelSearchIndex:
+    """Búsqueda de hoteles; los resultados son posiciones en la lista ``hotels``"""
+
+    def __init__(self, hotels, countries=None, categories=None):
+        self.hotels = list(hotels)
+        countries = countries or [''] * len(self.hotels)
+        categories = categories or [''] * len(self.hotels)
+        self.names = [normalize(hotel) for hotel in self.hotels]
+        self.name_words = [name.split() for name in self.names]
+        self.details = [(normalize(country), normalize(category))
+                        for country, category in zip(countries, categories)]
+        self.texts = [' '.join(filter(None, (name,) + detail))
+                      for name, detail in zip(self.names, self.details)]
+
+        self.postings = defaultdict(set)
+        for hotel_id, text in enumerate(self.texts):
+            for gram in _ngrams(text):
+                self.postings[gram].add(hotel_id)
+
+    @classmethod
+    def from_tariffs(cls, tariffs):
+        return cls(tariffs.hotels, tariffs.countries, tariffs.categories)
+
+    def _candidates(self, term):
+        # Basta con los n-gramas más largos: contienen a los cortos
+        size = min(len(term), NGRAM_SIZE)
+        grams = {term[i:i + size] for i in range(len(term) - size + 1)}
+        postings = sorted((self.postings.get(gram, set()) for gram in grams), key=len)
+        return set.intersection(*postings) if postings else set()
+
+    def _rank(self, hotel_id, query, terms):
+        name = self.names[hotel_id]
+        if name.startswith(query):
+            return NAME_PREFIX
+        words = self.name_words[hotel_id]
+        if all(any(word.startswith(term) for word in words) for term in terms):
+            return WORD_PREFIX
+        country, category = self.details[hotel_id]
+        if all(any(word.startswith(term) for word in words + country.split()) or term == category
+               for term in terms):
+            return DETAIL_MATCH
+        return SUBSTRING
+
+    def search(self, query, within=None):
+        """Devuelve [(posición, rango)] ordenado por rango y nombre.
+
+        ``within`` limita la búsqueda a posiciones ya encontradas, p. ej. al
+        seguir escribiendo sobre una consulta anterior.
+        """
+        query = normalize(query)
+        if not query:
+            return [(hotel_id, NAME_PREFIX) for hotel_id in
+                    sorted(within if within is not None else range(len(self.hotels)),
+                           key=self.names.__getitem__)]
+        terms = query.split()
+        found = set(within) if within is not None else None
+        for term in terms:
+            candidates = self._candidates(term)
+            found = candidates if found is None else found & candidates
+        matches = [hotel_id for hotel_id in found
+                   if all(term in self.texts[hotel_id] for term in terms)]
+        ranked = [(hotel_id, self._rank(hotel_id, query, terms)) for hotel_id in matches]
+        ranked.sort(key=lambda item: (item[1], self.names[item[0]]))
+        return ranked
@@ -0,0 +1,158 @@
+"""Calendario de temporadas: la temporada de cada noche de una estadía.
+
+temporadas.csv lista rangos de fechas (Desde y Hasta, inclusive) con su
+temporada; los días que no aparecen son temporada Baja. El calendario cubre
+los años completos del archivo y se guarda como un arreglo denso con el
+índice de temporada de cada día, más una tabla acumulada de noches por
+temporada y tipo de día. Así el perfil de cualquier estadía (cuántas noches
+de cada temporada y tipo) es la resta de dos filas, sin importar su largo.
+"""
+import csv
+import os
+from datetime import date, timedelta
+
+import numpy as np
+
+from .nights import WEEKEND_NIGHTS, count_nights, night_types_array
+from .tariffs import DATA_DIR, SEASONS
+
+SEASON_CALENDAR_CSV = os.path.join(DATA_DIR, 'temporadas.csv')
+
+# Temporada que se toma del calendario noche por noche
+AUTO_SEASON = "Automática"
+DEFAULT_SEASON = "Baja"
+
+
+class SeasonCalendar:
+    """Temporada de cada día desde ``first_day``, como arreglo de índices de SEASONS"""
+
+    def __init__(self, first_day, season_ids):
+        self.first_day = first_day
+        self.season_ids = np.asarray(season_ids, dtype=np.int8)
+        self._tables = {}
+
+    @classmethod
+    def from_ranges(cls, ranges):
+        """ranges: [(desde, hasta, temporada)]; los rangos posteriores prevalecen"""
+        ranges = list(ranges)
+        if not ranges:
+            raise ValueError("El calendario de temporadas está vacío")
+        first_day = date(min(start for start, _, _ in ranges).year, 1, 1)
+        last_day = date(max(end for _, end, _ in ranges).year, 12, 31)
+        season_ids = np.full((last_day - first_day).days + 1, SEASONS.index(DEFAULT_SEASON), dtype=np.int8)
+        for start, end, season in ranges:
+            if season not in SEASONS:
+                raise ValueError(f"Temporada desconocida en el calendario: {season}")
+            season_ids[(start - first_day).days:(end - first_day).days + 1] = SEASONS.index(season)
+        return cls(first_day, season_ids)
+
+    @property
+    def last_day(self):
+        return self.first_day + timedelta(days=len(self.season_ids) - 1)
+
+    def _offsets(self, check_in, check_out):
+        start = (check_in - self.first_day).days
+        end = (check_out - self.first_day).days
+        if start < 0 or end > len(self.season_ids):
+            raise ValueError(
+                f"El calendario de temporadas solo cubre del {self.first_day:%d/%m/%Y} "
+                f"al {self.last_day:%d/%m/%Y}; elija la temporada manualmente")
+        return start, max(end, start)
+
+    def season_on(self, day):
+        start, _ = self._offsets(day, day + timedelta(days=1))
+        return SEASONS[self.season_ids[start]]
+
+    def night_seasons(self, check_in, check_out):
+        """Índice de temporada de cada noche de la estadía"""
+        start, end = self._offsets(check_in, check_out)
+        return self.season_ids[start:end]
+
+    def nights_left(self, day):
+        """Noches que cubre el calendario desde ``day`` (0 si está fuera)"""
+        offset = (day - self.first_day).days
+        return max(len(self.season_ids) - offset, 0) if offset >= 0 else 0
+
+    def profile_table(self, weekend_days=WEEKEND_NIGHTS):
+        """Noches acumuladas por (temporada, tipo de día): arreglo (días + 1, temporadas, 2)"""
+        table = self._tables.get(weekend_days)
+        if table is None:
+            days = len(self.season_ids)
+            types = night_types_array(self.first_day, days, weekend_days)
+            nights = np.zeros((days + 1, len(SEASONS), 2), dtype=np.int32)
+            nights[np.arange(1, days + 1), self.season_ids, types] = 1
+            table = self._tables[weekend_days] = np.cumsum(nights, axis=0)
+        return table
+
+    def stay_profile(self, check_in, check_out, weekend_days=WEEKEND_NIGHTS):
+        """Noches de la estadía por (temporada, tipo de día), en tiempo constante"""
+        start, end = self._offsets(check_in, check_out)
+        table = self.profile_table(weekend_days)
+        return table[end] - table[start]
+
+    def stay_profiles(self, check_in, check_out, weekend_days=WEEKEND_NIGHTS):
+        """Versión vectorizada de stay_profile para arreglos ``datetime64[D]``.
+
+        Devuelve (estadías dentro del calendario, perfiles); las estadías
+        fuera del calendario o inválidas tienen un perfil vacío.
+        """
+        first_day = np.datetime64(self.first_day, 'D')
+        start = (np.asarray(check_in, dtype='datetime64[D]') - first_day).astype(np.int64)
+        end = (np.asarray(check_out, dtype='datetime64[D]') - first_day).astype(np.int64)
+        covered = (start >= 0) & (end <= len(self.season_ids)) & (end > start)
+        table = self.profile_table(weekend_days)
+        profiles = table[np.where(covered, end, 0)] - table[np.where(covered, start, 0)]
+        return covered, profiles
+
+
+def read_season_calendar(csv_path):
+    with open(csv_path, newline='', encoding='utf-8') as f:
+        ranges = [(date.fromisoformat(row['Desde'].strip()), date.fromisoformat(row['Hasta'].strip()),
+                   row['Temporada'].strip())
+                  for row in csv.DictReader(f)]
+    return SeasonCalendar.from_ranges(ranges)
+
+
+# Calendarios cargados, por ruta del CSV
+_calendars = {}
+
+
+def load_season_calendar(csv_path=SEASON_CALENDAR_CSV):
+    """Carga el calendario una vez por proceso (hasta reload_season_calendar).
+
+    Cada recarga crea otro SeasonCalendar, así que el objeto sirve como
+    versión del calendario en las claves de caché.
+    """
+    calendar = _calendars.get(csv_path)
+    if calendar is None:
+        calendar = _calendars[csv_path] = read_season_calendar(csv_path)
+    return calendar
+
+
+def reload_season_calendar(csv_path=SEASON_CALENDAR_CSV):
+    """Vuelve a leer el calendario tras un cambio en disco; si el CSV no es válido se conserva el anterior"""
+    calendar = _calendars[csv_path] = read_season_calendar(csv_path)
+    return calendar
+
+
+def night_seasons(check_in, check_out, season, calendar=None):
+    """Índice de temporada de cada noche; -1 si la temporada fija no existe"""
+    if season == AUTO_SEASON:
+        return (calendar or load_season_calendar()).night_seasons(check_in, check_out)
+    season_id = SEASONS.index(season) if season in SEASONS else -1
+    return np.full(max((check_out - check_in).days, 0), season_id, dtype=np.int8)
+
+
+def stay_profile(check_in, check_out, season, calendar=None, weekend_days=WEEKEND_NIGHTS):
+    """Noches por (temporada, tipo de día) como arreglo (temporadas, 2).
+
+    Con AUTO_SEASON la temporada de cada noche sale del calendario; con una
+    temporada fija todas las noches son de ella. Las noches de una temporada
+    desconocida no se cuentan.
+    """
+    if season == AUTO_SEASON:
+        return (calendar or load_season_calendar()).stay_profile(check_in, check_out, weekend_days)
+    profile = np.zeros((len(SEASONS), 2), dtype=np.int32)
+    if season in SEASONS:
+        profile[SEASONS.index(season)] = count_nights(check_in, check_out, weekend_days)
+    return profile
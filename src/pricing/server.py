@@ -0,0 +1,320 @@
+"""Servicio HTTP local de cotización basado en asyncio.
+
+Expone las reglas de Decas y Todo Incluido como endpoints JSON:
+
+    GET  /health                       estado y contadores de la caché
+    POST /quote/todo-incluido          un itinerario
+    POST /quote/decas                  un itinerario
+    POST /quote/todo-incluido/batch    {"itineraries": [...]}
+    POST /quote/decas/batch            {"itineraries": [...]}
+
+Las tarifas se cargan al iniciar y se recargan solas cuando cambia su CSV.
+Las conexiones HTTP/1.1 se mantienen abiertas (keep-alive) y los cálculos
+corren en un pool de hilos acotado, con un límite de solicitudes en curso.
+"""
+import asyncio
+import dataclasses
+import datetime
+import json
+import logging
+import math
+from concurrent.futures import ThreadPoolExecutor
+from http import HTTPStatus
+
+from .cache import quote_cache
+from .engine import DEFAULT_COP_PER_USD
+from .reload import TariffReloader
+from .seasons import SEASON_CALENDAR_CSV, reload_season_calendar
+from .tariffs import (DECAS_CSV, TODO_INCLUIDO_CSV, load_decas_tariffs,
+                      load_todo_incluido_tariffs)
+
+logger = logging.getLogger(__name__)
+
+MAX_HEADER_LINES = 100
+MAX_BODY_BYTES = 16 * 1024 * 1024
+DEFAULT_RELOAD_INTERVAL = 2.0
+
+
+class HTTPError(Exception):
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+        self.message = message
+
+
+def _date(value, name):
+    try:
+        return datetime.date.fromisoformat(str(value))
+    except ValueError:
+        raise HTTPError(HTTPStatus.BAD_REQUEST, f"Fecha inválida en '{name}': {value}")
+
+
+def _required(item, name):
+    if name not in item:
+        raise HTTPError(HTTPStatus.BAD_REQUEST, f"Falta el campo '{name}'")
+    return item[name]
+
+
+def _to_json(value):
+    """Convierte resultados (dataclasses, fechas, NaN) en valores serializables"""
+    if dataclasses.is_dataclass(value):
+        return _to_json(dataclasses.asdict(value))
+    if isinstance(value, dict):
+        return {key: _to_json(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_to_json(item) for item in value]
+    if isinstance(value, (datetime.date, datetime.datetime)):
+        return value.isoformat()
+    if isinstance(value, float) and math.isnan(value):
+        return None
+    return value
+
+
+def _itineraries(body):
+    items = body.get('itineraries', [])
+    if not isinstance(items, list):
+        raise HTTPError(HTTPStatus.BAD_REQUEST, "'itineraries' debe ser una lista")
+    return items
+
+
+class QuoteService:
+    """Cotizaciones a partir de diccionarios JSON, sin dependencias de red"""
+
+    def __init__(self, todo_incluido_tariffs, decas_tariffs, cache=quote_cache):
+        self.todo_incluido_tariffs = todo_incluido_tariffs
+        self.decas_tariffs = decas_tariffs
+        self.cache = cache
+
+    def quote_todo_incluido(self, item):
+        tariffs = self.todo_incluido_tariffs
+        hotel, room, season = _required(item, 'hotel'), _required(item, 'room'), _required(item, 'season')
+        return self.cache.quote_all_inclusive(
+            tariffs, hotel, room, season,
+            _date(_required(item, 'check_in'), 'check_in'),
+            _date(_required(item, 'check_out'), 'check_out'),
+            adults=int(item.get('adults', 2)),
+            children_ages=[int(age) for age in item.get('children_ages', ())],
+            offer_2x1=bool(item.get('offer_2x1', False)),
+            discount=int(item.get('discount', 0)),
+            cop_per_usd=float(item.get('cop_per_usd', DEFAULT_COP_PER_USD)))
+
+    def quote_decas(self, item):
+        tariffs = self.decas_tariffs
+        hotel, season = _required(item, 'hotel'), _required(item, 'season')
+        rooms = item.get('rooms', {})
+        if not isinstance(rooms, dict):
+            raise HTTPError(HTTPStatus.BAD_REQUEST, "'rooms' debe ser un objeto {tipo: habitaciones}")
+        return self.cache.quote_decas(
+            tariffs, hotel, season,
+            _date(_required(item, 'check_in'), 'check_in'),
+            _date(_required(item, 'check_out'), 'check_out'),
+            {room: int(count) for room, count in rooms.items()},
+            include_admin=bool(item.get('include_admin', True)),
+            cop_per_usd=float(item.get('cop_per_usd', DEFAULT_COP_PER_USD)))
+
+    def batch_todo_incluido(self, items):
+        from .batch import quote_all_inclusive_batch
+        return self._batch(quote_all_inclusive_batch, self.todo_incluido_tariffs, items)
+
+    def batch_decas(self, items):
+        from .batch import quote_decas_batch
+        # Las habitaciones llegan como {"rooms": {...}}; el lote usa una columna por tipo
+        if any(not isinstance(item, dict) or not isinstance(item.get('rooms', {}), dict) for item in items):
+            raise HTTPError(HTTPStatus.BAD_REQUEST, "Cada itinerario debe ser un objeto con 'rooms' como objeto")
+        rows = [{**{k: v for k, v in item.items() if k != 'rooms'}, **item.get('rooms', {})}
+                for item in items]
+        return self._batch(quote_decas_batch, self.decas_tariffs, rows)
+
+    @staticmethod
+    def _batch(quote, tariffs, items):
+        import pandas as pd
+
+        if not items:
+            return []
+        result = quote(tariffs, pd.DataFrame(items))
+        return result.astype(object).where(result.notna(), None).to_dict('records')
+
+
+class QuoteServer:
+    def __init__(self, service, max_workers=4, max_pending=64, keep_alive_timeout=15.0):
+        self.service = service
+        self.keep_alive_timeout = keep_alive_timeout
+        self._pool = ThreadPoolExecutor(max_workers, thread_name_prefix='quote')
+        self._max_pending = max_pending
+        self._pending = None
+        self._server = None
+        self.routes = {
+            ('POST', '/quote/todo-incluido'): lambda body: service.quote_todo_incluido(body),
+            ('POST', '/quote/decas'): lambda body: service.quote_decas(body),
+            ('POST', '/quote/todo-incluido/batch'): lambda body: service.batch_todo_incluido(_itineraries(body)),
+            ('POST', '/quote/decas/batch'): lambda body: service.batch_decas(_itineraries(body)),
+        }
+
+    async def start(self, host='127.0.0.1', port=8765):
+        self._pending = asyncio.Semaphore(self._max_pending)
+        self._server = await asyncio.start_server(self._handle_connection, host, port)
+        return self._server
+
+    @property
+    def port(self):
+        return self._server.sockets[0].getsockname()[1]
+
+    async def close(self):
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+        self._pool.shutdown(wait=False)
+
+    async def _handle_connection(self, reader, writer):
+        try:
+            while True:
+                try:
+                    request_line = await asyncio.wait_for(reader.readline(), self.keep_alive_timeout)
+                except asyncio.TimeoutError:
+                    break
+                if not request_line:
+                    break
+                try:
+                    keep_alive = await self._handle_request(request_line, reader, writer)
+                except (ConnectionError, asyncio.IncompleteReadError):
+                    raise
+                except Exception:
+                    # Un error inesperado responde 500 y cierra la conexión en vez de dejarla colgada
+                    logger.exception("Error atendiendo la solicitud")
+                    self._write_response(writer, HTTPStatus.INTERNAL_SERVER_ERROR,
+                                         {'error': "Error interno del servidor"}, False)
+                    keep_alive = False
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    async def _handle_request(self, request_line, reader, writer):
+        keep_alive = False
+        try:
+            parts = request_line.decode('latin-1').split()
+            if len(parts) != 3:
+                raise HTTPError(HTTPStatus.BAD_REQUEST, "Solicitud mal formada")
+            method, path, version = parts
+            headers = await self._read_headers(reader)
+            connection = headers.get('connection', '').lower()
+            keep_alive = connection != 'close' if version == 'HTTP/1.1' else connection == 'keep-alive'
+
+            try:
+                length = int(headers.get('content-length', 0))
+            except ValueError:
+                raise HTTPError(HTTPStatus.BAD_REQUEST, "Content-Length inválido")
+            if length < 0:
+                raise HTTPError(HTTPStatus.BAD_REQUEST, "Content-Length inválido")
+            if length > MAX_BODY_BYTES:
+                raise HTTPError(HTTPStatus.REQUEST_ENTITY_TOO_LARGE, "Cuerpo demasiado grande")
+            body = await reader.readexactly(length) if length else b''
+
+            status, payload = await self._dispatch(method, path.split('?', 1)[0], body)
+        except HTTPError as e:
+            status, payload = e.status, {'error': e.message}
+        self._write_response(writer, status, payload, keep_alive)
+        return keep_alive
+
+    @staticmethod
+    async def _read_headers(reader):
+        headers = {}
+        for _ in range(MAX_HEADER_LINES):
+            line = await reader.readline()
+            if line in (b'\r\n', b'\n', b''):
+                return headers
+            name, _, value = line.decode('latin-1').partition(':')
+            headers[name.strip().lower()] = value.strip()
+        raise HTTPError(HTTPStatus.REQUEST_HEADER_FIELDS_TOO_LARGE, "Demasiados encabezados")
+
+    async def _dispatch(self, method, path, body):
+        if method == 'GET' and path == '/health':
+            return HTTPStatus.OK, {'status': 'ok', 'cache': self.service.cache.info()._asdict()}
+        handler = self.routes.get((method, path))
+        if handler is None:
+            if any(route_path == path for _, route_path in self.routes):
+                raise HTTPError(HTTPStatus.METHOD_NOT_ALLOWED, "Método no permitido")
+            raise HTTPError(HTTPStatus.NOT_FOUND, "Ruta no encontrada")
+        try:
+            data = json.loads(body or b'{}')
+        except ValueError:
+            raise HTTPError(HTTPStatus.BAD_REQUEST, "El cuerpo no es JSON válido")
+        if not isinstance(data, dict):
+            raise HTTPError(HTTPStatus.BAD_REQUEST, "Se esperaba un objeto JSON")
+
+        async with self._pending:
+            loop = asyncio.get_running_loop()
+            try:
+                result = await loop.run_in_executor(self._pool, handler, data)
+            except HTTPError:
+                raise
+            except (KeyError, TypeError, ValueError, AttributeError) as e:
+                raise HTTPError(HTTPStatus.BAD_REQUEST, str(e))
+        return HTTPStatus.OK, _to_json(result)
+
+    @staticmethod
+    def _write_response(writer, status, payload, keep_alive):
+        body = json.dumps(payload, ensure_ascii=False).encode('utf-8')
+        head = (
+            f"HTTP/1.1 {status.value} {status.phrase}\r\n"
+            "Content-Type: application/json; charset=utf-8\r\n"
+            f"Content-Length: {len(body)}\r\n"
+            f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n"
+            "\r\n"
+        )
+        writer.write(head.encode('latin-1') + body)
+
+
+async def watch_tariffs(service, interval=DEFAULT_RELOAD_INTERVAL):
+    """Recarga en segundo plano el tarifario cuyo CSV cambió y lo reemplaza en el servicio.
+
+    El calendario de temporadas no es un atributo del servicio: al recargarlo
+    ``load_season_calendar`` pasa a devolver el nuevo.
+    """
+    reloaders = {
+        'todo_incluido_tariffs': TariffReloader(TODO_INCLUIDO_CSV, load_todo_incluido_tariffs),
+        'decas_tariffs': TariffReloader(DECAS_CSV, load_decas_tariffs),
+        None: TariffReloader(SEASON_CALENDAR_CSV, reload_season_calendar),
+    }
+    loop = asyncio.get_running_loop()
+    while True:
+        await asyncio.sleep(interval)
+        for attribute, reloader in reloaders.items():
+            if not reloader.changed():
+                continue
+            try:
+                index = await loop.run_in_executor(None, reloader.reload)
+            except Exception as e:
+                logger.error("Error recargando %s: %s", reloader.csv_path, e)
+                continue
+            # Las solicitudes en curso terminan con el índice anterior; las nuevas usan este
+            if attribute is not None:
+                setattr(service, attribute, index)
+            service.cache.invalidate()
+            logger.info("Tarifas recargadas desde %s", reloader.csv_path)
+
+
+async def _serve_forever(host, port, workers, reload_interval):
+    service = QuoteService(load_todo_incluido_tariffs(), load_decas_tariffs())
+    server = QuoteServer(service, max_workers=workers)
+    await server.start(host, port)
+    logger.info("Servicio de cotización escuchando en http://%s:%s", host, server.port)
+    watcher = None
+    if reload_interval > 0:
+        watcher = asyncio.ensure_future(watch_tariffs(service, reload_interval))
+    try:
+        await asyncio.Event().wait()
+    finally:
+        if watcher is not None:
+            watcher.cancel()
+        await server.close()
+
+
+def serve(host='127.0.0.1', port=8765, workers=4, reload_interval=DEFAULT_RELOAD_INTERVAL):
+    try:
+        asyncio.run(_serve_forever(host, port, workers, reload_interval))
+    except KeyboardInterrupt:
+        pass
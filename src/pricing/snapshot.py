@@ -0,0 +1,119 @@
+"""Caché compilada en disco del índice de tarifas.
+
+La primera carga de un CSV guarda el índice ya construido (nombres
+codificados y arreglo de tarifas) en un archivo ``.npz`` dentro de
+``.cache/`` junto al CSV. Las cargas siguientes leen ese archivo
+directamente. La caché se invalida sola si cambian la fecha de
+modificación o el contenido (SHA-256) del CSV.
+"""
+import hashlib
+import json
+import os
+import tempfile
+
+import numpy as np
+
+from .tariffs import TariffIndex
+
+# Se incrementa cuando cambia la estructura guardada del índice
+SNAPSHOT_VERSION = 3
+CACHE_DIR_NAME = '.cache'
+# Permisos de la caché: legible por otros usuarios de una instalación compartida
+SNAPSHOT_MODE = 0o644
+
+
+def file_hash(path):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def snapshot_path(csv_path, cache_dir=None):
+    cache_dir = cache_dir or os.path.join(os.path.dirname(os.path.abspath(csv_path)), CACHE_DIR_NAME)
+    name = os.path.splitext(os.path.basename(csv_path))[0]
+    return os.path.join(cache_dir, f"{name}.npz")
+
+
+def _umask():
+    """Umask del proceso; en Linux se lee sin cambiarla, porque os.umask afecta a todos los hilos"""
+    try:
+        with open('/proc/self/status') as f:
+            for line in f:
+                if line.startswith('Umask:'):
+                    return int(line.split()[1], 8)
+    except (OSError, ValueError):
+        pass
+    mask = os.umask(0)
+    os.umask(mask)
+    return mask
+
+
+def _source_stamp(csv_path):
+    stat = os.stat(csv_path)
+    return {'mtime_ns': stat.st_mtime_ns, 'size': stat.st_size}
+
+
+def save_snapshot(index, csv_path, cache_dir=None, sha256=None):
+    """Guarda el índice de forma atómica; devuelve False si no se pudo escribir"""
+    path = snapshot_path(csv_path, cache_dir)
+    meta = dict(_source_stamp(csv_path), version=SNAPSHOT_VERSION,
+                sha256=sha256 or file_hash(csv_path))
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix='.tmp')
+    except OSError:
+        return False
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            np.savez(f, meta=np.array(json.dumps(meta)), hotels=np.array(index.hotels, dtype=str),
+                     rooms=np.array(index.rooms, dtype=str), rates=index.rates,
+                     countries=np.array(index.countries, dtype=str),
+                     categories=np.array(index.categories, dtype=str),
+                     weekend_days=np.array(sorted(index.weekend_days), dtype=np.int64))
+        # mkstemp crea el archivo con 0600 y os.replace conserva ese modo
+        os.chmod(tmp_path, SNAPSHOT_MODE & ~_umask())
+        os.replace(tmp_path, path)
+    except OSError:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        return False
+    return True
+
+
+def _index_from(data):
+    return TariffIndex(data['hotels'].tolist(), data['rooms'].tolist(), data['rates'],
+                       data['countries'].tolist(), data['categories'].tolist(),
+                       data['weekend_days'].tolist())
+
+
+def load_snapshot(csv_path, cache_dir=None):
+    """Devuelve el índice guardado si sigue vigente para el CSV, o None"""
+    path = snapshot_path(csv_path, cache_dir)
+    try:
+        with np.load(path, allow_pickle=False) as data:
+            meta = json.loads(str(data['meta']))
+            if meta.get('version') != SNAPSHOT_VERSION:
+                return None
+            stamp = _source_stamp(csv_path)
+            if any(meta.get(key) != value for key, value in stamp.items()):
+                # Cambió la fecha o el tamaño: solo se descarta si cambió el contenido
+                sha256 = file_hash(csv_path)
+                if meta.get('sha256') != sha256:
+                    return None
+                index = _index_from(data)
+                save_snapshot(index, csv_path, cache_dir, sha256)
+                return index
+            return _index_from(data)
+    except (OSError, ValueError, KeyError):
+        return None
+
+
+def load_cached(csv_path, build, cache_dir=None):
+    """Carga el índice desde la caché o lo construye con build(csv_path) y lo guarda"""
+    index = load_snapshot(csv_path, cache_dir)
+    if index is None:
+        index = build(csv_path)
+        save_snapshot(index, csv_path, cache_dir)
+    return index
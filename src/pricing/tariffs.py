@@ -0,0 +1,206 @@
+import os
+import re
+
+import numpy as np
+
+# Carpeta con los CSV de tarifas del repositorio
+DATA_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))), 'assets', 'data')
+TODO_INCLUIDO_CSV = os.path.join(DATA_DIR, 'todo_incluido.csv')
+DECAS_CSV = os.path.join(DATA_DIR, 'conversion_decas.csv')
+
+# Temporadas y tipos de día en el orden en que se indexan las tarifas
+SEASONS = ("Baja", "Media", "Alta")
+WEEKDAY, WEEKEND, FULL_WEEK = 0, 1, 2
+DAY_TYPES = ("Entre Semana", "Fin de Semana", "Semana Completa")
+
+# Noches que se cobran como fin de semana (ISO: 1 = lunes ... 7 = domingo): viernes y sábado
+WEEKEND_NIGHTS = frozenset((5, 6))
+# Letras de la columna 'Días' y de las etiquetas como "Fin de Semana (V-S)"
+WEEKDAY_LETTERS = {'l': 1, 'm': 2, 'mi': 3, 'j': 4, 'v': 5, 's': 6, 'd': 7}
+
+# Columnas de tipo de habitación en conversion_decas.csv
+DECAS_ROOM_TYPES = ("Doble", "Triple", "Cuádruple")
+
+
+class TariffIndex:
+    """Tarifas indexadas por enteros (hotel, habitación, temporada, tipo de día).
+
+    Se construye una sola vez al cargar el CSV; las consultas posteriores son
+    accesos directos al arreglo ``rates`` sin tocar pandas.
+    """
+
+    def __init__(self, hotels, rooms, rates, countries=None, categories=None, weekend_days=None):
+        self.hotels = list(hotels)
+        self.rooms = list(rooms)
+        # Noches que el tarifario cobra como fin de semana (ISO), según su columna de días
+        self.weekend_days = frozenset(weekend_days) if weekend_days else WEEKEND_NIGHTS
+        # País y categoría de cada hotel, en el orden de hotels; '' si el CSV no los trae
+        self.countries = list(countries) if countries is not None else [''] * len(self.hotels)
+        self.categories = list(categories) if categories is not None else [''] * len(self.hotels)
+        # Arreglo (hotel, habitación, temporada, tipo de día); NaN = sin tarifa
+        self.rates = rates
+        self.hotel_ids = {name: i for i, name in enumerate(self.hotels)}
+        self.room_ids = {name: i for i, name in enumerate(self.rooms)}
+        self.season_ids = {name: i for i, name in enumerate(SEASONS)}
+
+        # Habitaciones con alguna tarifa, por hotel, ordenadas por nombre
+        available = ~np.isnan(rates).all(axis=(2, 3))
+        self.hotel_rooms = [
+            sorted((self.rooms[r] for r in np.flatnonzero(row)))
+            for row in available
+        ]
+
+    def hotel_id(self, hotel):
+        return self.hotel_ids.get(hotel, -1)
+
+    def room_id(self, room):
+        return self.room_ids.get(room, -1)
+
+    def season_id(self, season):
+        return self.season_ids.get(season, -1)
+
+    def rooms_of(self, hotel):
+        """Devuelve los tipos de habitación con tarifa para el hotel"""
+        hotel_id = self.hotel_id(hotel)
+        return self.hotel_rooms[hotel_id] if hotel_id >= 0 else []
+
+    def rate(self, hotel_id, room_id, season_id, day_type):
+        """Tarifa por noche, o NaN si no existe la combinación"""
+        if hotel_id < 0 or room_id < 0 or season_id < 0:
+            return float("nan")
+        return float(self.rates[hotel_id, room_id, season_id, day_type])
+
+    def room_rates(self, hotel_id, room_id):
+        """Tarifas (temporada, entre semana / fin de semana) de una habitación; NaN si no existe"""
+        if hotel_id < 0 or room_id < 0:
+            return np.full((len(SEASONS), 2), np.nan)
+        return self.rates[hotel_id, room_id, :, :FULL_WEEK]
+
+    def week_rates(self, hotel_id, room_id):
+        """Tarifa de semana completa de una habitación por temporada; NaN si no hay"""
+        if hotel_id < 0 or room_id < 0:
+            return np.full(len(SEASONS), np.nan)
+        return self.rates[hotel_id, room_id, :, FULL_WEEK]
+
+    def rates_for(self, hotel, room, season):
+        """Devuelve (tarifa entre semana, tarifa fin de semana) por nombre"""
+        hotel_id = self.hotel_id(hotel)
+        room_id = self.room_id(room)
+        season_id = self.season_id(season)
+        return (self.rate(hotel_id, room_id, season_id, WEEKDAY),
+                self.rate(hotel_id, room_id, season_id, WEEKEND))
+
+
+def parse_day_types(label):
+    """Traduce el texto de 'Dias de la Semana' a los tipos de día que cubre"""
+    text = str(label).strip().casefold()
+    if text.startswith("entre semana"):
+        return (WEEKDAY,)
+    if text.startswith("fin de semana"):
+        return (WEEKEND,)
+    if text.startswith("semana completa"):
+        return (FULL_WEEK,)
+    if text.startswith("todos los d"):
+        return (WEEKDAY, WEEKEND)
+    return ()
+
+
+def parse_weekdays(text):
+    """Días ISO de un texto como "V, S" o "Fin de Semana (V-S)"; lo que no es un día se ignora"""
+    text = str(text).strip().casefold()
+    match = re.search(r'\(([^)]*)\)', text)
+    if match:
+        text = match.group(1)
+    return frozenset(WEEKDAY_LETTERS[token] for token in re.split(r'[^a-zñ]+', text)
+                     if token in WEEKDAY_LETTERS)
+
+
+def _weekend_days(rows):
+    """rows: (tipos de día, texto de días) por fila; días de la primera fila de fin de semana"""
+    for day_types, text in rows:
+        if day_types == (WEEKEND,):
+            days = parse_weekdays(text)
+            if days:
+                return days
+    return WEEKEND_NIGHTS
+
+
+def _build_index(hotels, rooms, records, details=None, weekend_days=None):
+    """details opcional: {hotel: (país, categoría)}"""
+    hotels = sorted(set(hotels))
+    rooms = sorted(set(rooms))
+    hotel_ids = {name: i for i, name in enumerate(hotels)}
+    room_ids = {name: i for i, name in enumerate(rooms)}
+    rates = np.full((len(hotels), len(rooms), len(SEASONS), len(DAY_TYPES)), np.nan)
+    for hotel, room, season, day_types, value in records:
+        if season not in SEASONS:
+            continue
+        for day_type in day_types:
+            rates[hotel_ids[hotel], room_ids[room], SEASONS.index(season), day_type] = value
+    details = details or {}
+    return TariffIndex(hotels, rooms, rates,
+                       [details.get(hotel, ('', ''))[0] for hotel in hotels],
+                       [details.get(hotel, ('', ''))[1] for hotel in hotels],
+                       weekend_days)
+
+
+def build_todo_incluido_index(df):
+    """Construye el índice a partir del DataFrame de todo_incluido.csv"""
+    records = []
+    columns = [df[f'Tarifa {season}'] for season in SEASONS]
+    for i, (hotel, room, label) in enumerate(zip(df['Hotel'], df['Tipo de Habitacion'], df['Dias de la Semana'])):
+        day_types = parse_day_types(label)
+        for season, column in zip(SEASONS, columns):
+            records.append((hotel, room, season, day_types, float(column.iat[i])))
+    # Las etiquetas traen los días, p. ej. "Fin de Semana (V-S)"
+    weekend_days = _weekend_days((parse_day_types(label), label) for label in df['Dias de la Semana'])
+    return _build_index(df['Hotel'], df['Tipo de Habitacion'], records, weekend_days=weekend_days)
+
+
+def build_decas_index(df):
+    """Construye el índice a partir del DataFrame de conversion_decas.csv"""
+    import pandas as pd
+
+    values = {tipo: pd.to_numeric(df[tipo], errors='coerce') for tipo in DECAS_ROOM_TYPES}
+    records = []
+    for i, (hotel, season, label) in enumerate(zip(df['Hotel'], df['Temporada'], df['Dias de la Semana'])):
+        day_types = parse_day_types(label)
+        for tipo in DECAS_ROOM_TYPES:
+            records.append((hotel, tipo, str(season).strip(), day_types, float(values[tipo].iat[i])))
+
+    # País y categoría de la primera fila de cada hotel
+    details = {}
+    if 'País' in df and 'Categoria' in df:
+        for hotel, country, category in zip(df['Hotel'], df['País'], df['Categoria']):
+            details.setdefault(hotel, (str(country).strip(), str(category).strip()))
+    weekend_days = None
+    if 'Días' in df:
+        weekend_days = _weekend_days((parse_day_types(label), days)
+                                     for label, days in zip(df['Dias de la Semana'], df['Días']))
+    return _build_index(df['Hotel'], DECAS_ROOM_TYPES, records, details, weekend_days)
+
+
+def read_todo_incluido_tariffs(csv_path):
+    import pandas as pd
+    return build_todo_incluido_index(pd.read_csv(csv_path))
+
+
+def read_decas_tariffs(csv_path):
+    import pandas as pd
+    return build_decas_index(pd.read_csv(csv_path))
+
+
+def load_todo_incluido_tariffs(csv_path=TODO_INCLUIDO_CSV, use_cache=True):
+    """Carga el índice Todo Incluido, desde la caché compilada si está vigente"""
+    if not use_cache:
+        return read_todo_incluido_tariffs(csv_path)
+    from .snapshot import load_cached
+    return load_cached(csv_path, read_todo_incluido_tariffs)
+
+
+def load_decas_tariffs(csv_path=DECAS_CSV, use_cache=True):
+    """Carga el índice de Decas, desde la caché compilada si está vigente"""
+    if not use_cache:
+        return read_decas_tariffs(csv_path)
+    from .snapshot import load_cached
+    return load_cached(csv_path, read_decas_tariffs)
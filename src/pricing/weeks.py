@@ -0,0 +1,99 @@
+"""Combinación más barata de noches sueltas y bloques de "Semana Completa".
+
+En Decas algunos hoteles tienen tarifa de semana completa: siete noches
+seguidas por un precio fijo. La estadía se cubre con noches sueltas y
+bloques de siete noches dentro de una misma temporada, y se busca la
+combinación que cobra menos decas con programación dinámica: el mejor costo
+de las primeras i noches es el de i - 1 noches más la noche i, o el de
+i - 7 noches más un bloque. El tiempo es lineal en el largo de la estadía y
+las funciones trabajan sobre ejes adicionales (hoteles, filas de un lote o
+fechas de entrada) en la misma pasada.
+"""
+from dataclasses import dataclass
+
+import numpy as np
+
+WEEK_NIGHTS = 7
+
+
+@dataclass(frozen=True)
+class WeekBlock:
+    """Bloque de siete noches cobrado con la tarifa de semana completa"""
+    first_night: object      # datetime.date de la primera noche
+    season: str
+    decas: float             # Decas por habitación
+
+
+def week_starts(seasons):
+    """Noches donde puede empezar un bloque: caben siete noches de la misma temporada conocida"""
+    seasons = np.asarray(seasons)
+    nights = seasons.shape[-1]
+    fits = np.zeros(seasons.shape, dtype=bool)
+    if nights >= WEEK_NIGHTS:
+        last = nights - WEEK_NIGHTS + 1
+        first = seasons[..., :last]
+        same = first >= 0
+        for k in range(1, WEEK_NIGHTS):
+            same &= seasons[..., k:last + k] == first
+        fits[..., :last] = same
+    return fits
+
+
+def stay_costs(rates, week_rates, seasons, types):
+    """Costo de cada noche y de cada bloque que empieza en ella.
+
+    ``rates`` (..., temporadas, 2) y ``week_rates`` (..., temporadas) son
+    tarifas por habitación; ``seasons`` y ``types`` traen la temporada (-1 si
+    no se conoce) y el tipo de día de cada noche. Como en la cotización por
+    noches, las noches sin tarifa no se cobran; los bloques sin tarifa son NaN.
+    """
+    seasons = np.asarray(seasons)
+    known = seasons >= 0
+    season_ids = np.where(known, seasons, 0)
+    nightly = np.where(known, np.nan_to_num(rates[..., season_ids, types]), 0.0)
+    weekly = np.where(week_starts(seasons), week_rates[..., season_ids], np.nan)
+    return nightly, weekly
+
+
+def cheapest_split(nightly, weekly):
+    """Costo mínimo de cubrir las noches con noches sueltas y bloques.
+
+    ``nightly[..., j]`` es el costo de la noche j y ``weekly[..., j]`` el de
+    un bloque que empieza en la noche j (NaN si no se puede). Devuelve
+    (costo mínimo, took), donde ``took[..., i]`` indica que en la mejor
+    solución de las primeras i noches las últimas siete son un bloque. Ante
+    un empate se prefieren las noches sueltas.
+    """
+    nightly = np.asarray(nightly, dtype=float)
+    weekly = np.asarray(weekly, dtype=float)
+    nights = nightly.shape[-1]
+    best = np.zeros(nightly.shape[:-1] + (nights + 1,))
+    took = np.zeros(best.shape, dtype=bool)
+    for i in range(1, nights + 1):
+        best[..., i] = best[..., i - 1] + nightly[..., i - 1]
+        if i >= WEEK_NIGHTS:
+            week = best[..., i - WEEK_NIGHTS] + weekly[..., i - WEEK_NIGHTS]
+            # NaN nunca es menor: los bloques sin tarifa no se eligen
+            use = week < best[..., i]
+            best[..., i] = np.where(use, week, best[..., i])
+            took[..., i] = use
+    return best[..., nights], took
+
+
+def block_starts(took):
+    """Noches donde empiezan los bloques elegidos (took de una sola estadía)"""
+    starts = []
+    i = len(took) - 1
+    while i > 0:
+        if took[i]:
+            i -= WEEK_NIGHTS
+            starts.append(i)
+        else:
+            i -= 1
+    return starts[::-1]
+
+
+def cheapest_weeks(rates, week_rates, seasons, types):
+    """Decas por habitación de una estadía y noches donde empiezan los bloques elegidos"""
+    cost, took = cheapest_split(*stay_costs(rates, week_rates, seasons, types))
+    return float(cost), block_starts(took)
@@ -0,0 +1,54 @@
+import os
+from PySide6.QtCore import QObject, QTimer
+
+# Espera tras el último cambio de un spinner antes de recalcular (arrastres y teclas repetidas)
+DEFAULT_DEBOUNCE_MS = int(os.environ.get("MULTIVACIONES_RECALC_DEBOUNCE_MS", 120))
+
+class RecalcScheduler(QObject):
+    """Agrupa las solicitudes de recálculo: marca la vista como pendiente y recalcula una sola vez.
+
+    Mientras la vista está inactiva (oculta) las solicitudes solo la marcan
+    como desactualizada; el recálculo se hace una vez al activarla.
+    """
+    def __init__(self, callback, debounce_ms=DEFAULT_DEBOUNCE_MS, active=True, parent=None):
+        super().__init__(parent)
+        self.callback = callback
+        self.debounce_ms = debounce_ms
+        self.active = active
+        self.dirty = False
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.timeout.connect(self.flush)
+
+    def schedule(self):
+        """Recalcula en la siguiente vuelta del bucle de eventos, una vez por ráfaga de señales"""
+        self.dirty = True
+        if not self.active:
+            return
+        if not (self._timer.isActive() and self._timer.interval() == 0):
+            self._timer.start(0)
+
+    def schedule_debounced(self):
+        """Recalcula cuando el valor deja de cambiar durante debounce_ms"""
+        self.dirty = True
+        if not self.active:
+            return
+        if self._timer.isActive() and self._timer.interval() == 0:
+            # Ya hay un recálculo inmediato pendiente que incluirá este cambio
+            return
+        self._timer.start(self.debounce_ms)
+
+    def flush(self):
+        """Ejecuta ahora el recálculo pendiente, si lo hay"""
+        self._timer.stop()
+        if self.dirty:
+            self.dirty = False
+            self.callback()
+
+    def set_active(self, active):
+        """Activa o suspende la vista; al activarla recalcula enseguida si quedó desactualizada"""
+        self.active = active
+        if not active:
+            self._timer.stop()
+        elif self.dirty:
+            self.flush()
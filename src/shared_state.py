@@ -1,20 +1,69 @@
+from contextlib import contextmanager
 from PySide6.QtCore import QDate
 
+# Propiedades observables; cada una avisa con on_<propiedad>_changed(valor)
+PROPERTIES = ("hotel", "season", "check_in", "check_out")
+
 class SharedState:
     def __init__(self):
         self.selected_hotel = ""
-        self.selected_season = "Baja"
+        # "Automática" toma la temporada de cada noche del calendario (pricing.seasons.AUTO_SEASON)
+        self.selected_season = "Automática"
         self.selected_check_in = QDate.currentDate()
         self.selected_check_out = QDate.currentDate().addDays(1)
         self.observers = []
 
+        # Tablas de callbacks resueltas una sola vez al suscribirse
+        self._callbacks = {name: [] for name in PROPERTIES}
+        self._state_callbacks = []
+
+        # Cambios acumulados dentro de batch()
+        self._batch_depth = 0
+        self._pending = {}
+
     def add_observer(self, observer):
+        """Suscribe un observador; si define on_state_changed(cambios) recibe un solo aviso por cambio"""
         self.observers.append(observer)
+        state_callback = getattr(observer, "on_state_changed", None)
+        if state_callback is not None:
+            self._state_callbacks.append(state_callback)
+            return
+        for name in PROPERTIES:
+            callback = getattr(observer, f"on_{name}_changed", None)
+            if callback is not None:
+                self._callbacks[name].append(callback)
+
+    @contextmanager
+    def batch(self):
+        """Aplica varios cambios juntos y notifica al final, una vez por observador"""
+        self._batch_depth += 1
+        try:
+            yield self
+        finally:
+            self._batch_depth -= 1
+            if self._batch_depth == 0 and self._pending:
+                changes, self._pending = self._pending, {}
+                self._deliver(changes)
 
     def notify_observers(self, property_name):
-        for observer in self.observers:
-            if hasattr(observer, f"on_{property_name}_changed"):
-                getattr(observer, f"on_{property_name}_changed")(getattr(self, f"selected_{property_name}"))
+        self._deliver({property_name: getattr(self, f"selected_{property_name}")})
+
+    def _deliver(self, changes):
+        for callback in self._state_callbacks:
+            callback(changes)
+        for name, value in changes.items():
+            for callback in self._callbacks[name]:
+                callback(value)
+
+    def _set(self, name, value):
+        attribute = f"selected_{name}"
+        if getattr(self, attribute) == value:
+            return
+        setattr(self, attribute, value)
+        if self._batch_depth:
+            self._pending[name] = value
+        else:
+            self._deliver({name: value})
 
     @property
     def hotel(self):
@@ -22,8 +71,7 @@ class SharedState:
 
     @hotel.setter
     def hotel(self, value):
-        self.selected_hotel = value
-        self.notify_observers("hotel")
+        self._set("hotel", value)
 
     @property
     def season(self):
@@ -31,8 +79,7 @@ class SharedState:
 
     @season.setter
     def season(self, value):
-        self.selected_season = value
-        self.notify_observers("season")
+        self._set("season", value)
 
     @property
     def check_in(self):
@@ -40,8 +87,7 @@ class SharedState:
 
     @check_in.setter
     def check_in(self, value):
-        self.selected_check_in = value
-        self.notify_observers("check_in")
+        self._set("check_in", value)
 
     @property
     def check_out(self):
@@ -49,5 +95,4 @@ class SharedState:
 
     @check_out.setter
     def check_out(self, value):
-        self.selected_check_out = value
-        self.notify_observers("check_out") 
\ No newline at end of file
+        self._set("check_out", value)
@@ -0,0 +1,97 @@
+import os
+from concurrent.futures import ThreadPoolExecutor
+from PySide6.QtCore import QFileSystemWatcher, QObject, QTimer, Signal
+
+DECAS = "decas"
+TODO_INCLUIDO = "todo_incluido"
+SEASON_CALENDAR = "temporadas"    # Calendario de temporadas; lo usan ambas pestañas
+
+# Espera tras el último cambio de un CSV antes de recargarlo (los editores escriben en varias pasadas)
+RELOAD_DELAY_MS = 300
+
+def dataset_path(name):
+    """Ruta del CSV de un tarifario"""
+    from pricing.seasons import SEASON_CALENDAR_CSV
+    from pricing.tariffs import DECAS_CSV, TODO_INCLUIDO_CSV
+    return {DECAS: DECAS_CSV, TODO_INCLUIDO: TODO_INCLUIDO_CSV, SEASON_CALENDAR: SEASON_CALENDAR_CSV}[name]
+
+def load_dataset(name):
+    """Carga un tarifario por nombre; pandas y NumPy se importan aquí, fuera del hilo de la interfaz"""
+    from pricing.cache import quote_cache
+    from pricing.seasons import reload_season_calendar
+    from pricing.tariffs import load_decas_tariffs, load_todo_incluido_tariffs
+    loaders = {DECAS: load_decas_tariffs, TODO_INCLUIDO: load_todo_incluido_tariffs,
+               SEASON_CALENDAR: reload_season_calendar}
+    index = loaders[name]()
+    # Las cotizaciones guardadas con las tarifas anteriores ya no sirven
+    quote_cache.invalidate()
+    return index
+
+class TariffLoader(QObject):
+    """Carga los tarifarios en paralelo en hilos de fondo y avisa con señales"""
+    loaded = Signal(str, object)
+    failed = Signal(str, str)
+
+    def __init__(self, names=(DECAS, TODO_INCLUIDO), parent=None):
+        super().__init__(parent)
+        self.names = tuple(names)
+
+    def start(self, names=None):
+        """Carga todos los tarifarios, o solo ``names`` (p. ej. el que cambió en disco)"""
+        names = self.names if names is None else tuple(names)
+        executor = ThreadPoolExecutor(max_workers=len(names), thread_name_prefix="tariffs")
+        for name in names:
+            future = executor.submit(load_dataset, name)
+            future.add_done_callback(lambda f, n=name: self._finished(n, f))
+        executor.shutdown(wait=False)
+
+    def _finished(self, name, future):
+        # Se ejecuta en el hilo de carga; las señales llegan encoladas al hilo de la interfaz
+        try:
+            index = future.result()
+        except Exception as e:
+            self.failed.emit(name, str(e))
+            return
+        self.loaded.emit(name, index)
+
+class TariffWatcher(QObject):
+    """Vigila los CSV de los tarifarios y avisa cuál cambió, una vez por ráfaga de escrituras"""
+    changed = Signal(str)
+
+    def __init__(self, delay_ms=RELOAD_DELAY_MS, parent=None):
+        super().__init__(parent)
+        self.delay_ms = delay_ms
+        self._datasets = {}      # ruta del CSV -> tarifario
+        self._timers = {}
+        self._watcher = QFileSystemWatcher(self)
+        self._watcher.fileChanged.connect(self._on_file_changed)
+        self._watcher.directoryChanged.connect(self._on_directory_changed)
+
+    def watch(self, name):
+        path = dataset_path(name)
+        if path in self._datasets:
+            return
+        self._datasets[path] = name
+        self._watcher.addPath(path)
+        # La carpeta avisa cuando el archivo se reemplaza o vuelve a aparecer
+        self._watcher.addPath(os.path.dirname(path))
+
+    def _on_file_changed(self, path):
+        name = self._datasets.get(path)
+        if name is None:
+            return
+        # Los editores que guardan reemplazando el archivo hacen que el vigilante lo suelte
+        if path not in self._watcher.files() and os.path.exists(path):
+            self._watcher.addPath(path)
+        timer = self._timers.get(name)
+        if timer is None:
+            timer = self._timers[name] = QTimer(self)
+            timer.setSingleShot(True)
+            timer.timeout.connect(lambda n=name: self.changed.emit(n))
+        timer.start(self.delay_ms)
+
+    def _on_directory_changed(self, directory):
+        watched = set(self._watcher.files())
+        for path in self._datasets:
+            if os.path.dirname(path) == directory and path not in watched and os.path.exists(path):
+                self._on_file_changed(path)
@@ -1,12 +1,23 @@
-import os
-import pandas as pd
 from PySide6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QLabel, 
                               QComboBox, QSpinBox, QGroupBox, QCalendarWidget,
                               QPushButton, QCheckBox, QScrollArea, QDialog,
-                              QTextEdit, QFrame, QLineEdit, QCompleter)
-from PySide6.QtCore import QDate, Qt, QPoint
-from PySide6.QtGui import QPalette, QColor, QTextCharFormat
+                              QTextEdit, QFrame, QLineEdit, QPlainTextEdit, QFileDialog)
+from PySide6.QtCore import QDate, Qt
+import numpy as np
+from PySide6.QtGui import QColor, QTextCharFormat
 from decameron_styles import GROUPBOX_STYLE, COMBOBOX_STYLE, LABEL_STYLE
+from models import ComparisonModel, HotelSearchProxyModel, shared_hotel_model
+from widgets import ComparisonDialog, FlexibleDatesDialog
+from pricing.breakdown import night_runs
+from pricing.cache import quote_cache
+from pricing.compare import compare_all_inclusive
+from pricing.flexible import cheapest_all_inclusive_check_ins, cheapest_all_inclusive_group_check_ins
+from pricing.groups import (GroupQuote, format_guests, parse_guests, quote_all_inclusive_group,
+                            read_guests_csv)
+from pricing.search import HotelSearchIndex
+from pricing.seasons import AUTO_SEASON
+from pricing.tariffs import DAY_TYPES, SEASONS
+from recalc import RecalcScheduler
 
 class RangeCalendarWidget(QCalendarWidget):
     def __init__(self, parent=None):
@@ -142,48 +153,24 @@ class TodoIncluidoTab(QWidget):
         self.check_in_date = self.shared_state.check_in
         self.check_out_date = self.shared_state.check_out
         
-        self.current_prices = {'weekday': 0, 'weekend': 0}
-        self.calculation_details = ""
+        # Última cotización y su HTML de detalles, generado solo al abrir el popup
+        self.quote = None
+        self._details_html = None
         self.children_age_widgets = []
         self.active_date_input = None
         
+        # Un solo recálculo por ráfaga de señales; oculta, la pestaña solo queda pendiente
+        self.recalc = RecalcScheduler(self.calculate_total, active=False, parent=self)
+        
         # Primero configuramos la UI
         self.setup_ui()
         
-        # Luego cargamos los datos
-        try:
-            csv_path = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'assets', 'data', 'todo_incluido.csv')
-            print(f"Intentando cargar CSV desde: {csv_path}")
-            print(f"El archivo existe: {os.path.exists(csv_path)}")
-            
-            self.df = pd.read_csv(csv_path)
-            print(f"CSV cargado exitosamente. Columnas: {self.df.columns.tolist()}")
-            
-            # Inicializar los combos después de cargar los datos
-            hoteles = sorted(self.df['Hotel'].unique())
-            print(f"Agregando {len(hoteles)} hoteles al combo")
-            
-            # Limpiar y añadir items al combobox existente
-            self.hotel_combo.clear()
-            self.hotel_combo.addItems(hoteles)
-            
-            # Establecer valores iniciales desde shared_state
-            if self.shared_state.hotel:
-                self.hotel_combo.setCurrentText(self.shared_state.hotel)
-            else:
-                # Si no hay hotel seleccionado, establecer Isleño como default
-                default_index = self.hotel_combo.findText("DECAMERON ISLEÑO")
-                if default_index >= 0:
-                    self.hotel_combo.setCurrentIndex(default_index)
-                    self.shared_state.hotel = "DECAMERON ISLEÑO"
-            
-            self.season_combo.clear()
-            self.season_combo.addItems(["Baja", "Media", "Alta"])
-            self.season_combo.setCurrentText(self.shared_state.season)
-            
-        except Exception as e:
-            print(f"Error cargando datos: {str(e)}")
-            raise
+        # Las tarifas llegan después desde el cargador en segundo plano (set_tariffs)
+        self.tariffs = None
+        self.hotel_model = None
+        self.season_combo.addItems(list(SEASONS) + [AUTO_SEASON])
+        self.season_combo.setCurrentText(self.shared_state.season)
+        self.set_loading("Cargando tarifas...")
             
         # Finalmente configuramos las conexiones
         self.setup_connections()
@@ -196,6 +183,42 @@ class TodoIncluidoTab(QWidget):
         self.calendar.setMinimumWidth(300)
         self.setup_calendar_style()
 
+    def set_loading(self, message):
+        """Deshabilita la selección mientras no hay tarifas y muestra el estado"""
+        self.hotel_combo.setEnabled(False)
+        self.season_combo.setEnabled(False)
+        self.room_combo.setEnabled(False)
+        self.result_label.setText(message)
+
+    def show_load_error(self, message):
+        self.result_label.setText(f"Error cargando tarifas: {message}")
+
+    def set_tariffs(self, tariffs):
+        """Recibe el índice de tarifas y habilita la pestaña"""
+        self.tariffs = tariffs
+        
+        # Llenar el combo sin disparar cambios intermedios en el shared_state
+        self.hotel_combo.blockSignals(True)
+        self.hotel_model = shared_hotel_model(self.tariffs)
+        self.hotel_search.set_hotels(self.hotel_model, HotelSearchIndex.from_tariffs(self.tariffs))
+        
+        # Establecer valores iniciales desde shared_state
+        if self.shared_state.hotel:
+            self.hotel_combo.setCurrentText(self.shared_state.hotel)
+        else:
+            # Si no hay hotel seleccionado, establecer Isleño como default
+            default_index = self.hotel_combo.findText("DECAMERON ISLEÑO")
+            if default_index >= 0:
+                self.hotel_combo.setCurrentIndex(default_index)
+        self.hotel_combo.blockSignals(False)
+        
+        self.hotel_combo.setEnabled(True)
+        self.season_combo.setEnabled(True)
+        self.room_combo.setEnabled(True)
+        if not self.shared_state.hotel:
+            self.shared_state.hotel = self.hotel_combo.currentText()
+        self.update_rooms()
+
     def setup_ui(self):    
         # Crear un QScrollArea
         scroll = QScrollArea()
@@ -225,11 +248,8 @@ class TodoIncluidoTab(QWidget):
         self.hotel_combo.setEditable(True)
         self.hotel_combo.setInsertPolicy(QComboBox.NoInsert)
         self.hotel_combo.setStyleSheet(COMBOBOX_STYLE)
-        completer = QCompleter(self.hotel_combo.model(), self.hotel_combo)
-        completer.setCaseSensitivity(Qt.CaseInsensitive)
-        completer.setFilterMode(Qt.MatchContains)
-        completer.setCompletionMode(QCompleter.PopupCompletion)
-        self.hotel_combo.setCompleter(completer)
+        # Búsqueda sin tildes por nombre, país y categoría (el índice llega con las tarifas)
+        self.hotel_search = HotelSearchProxyModel.install(self.hotel_combo)
         
         season_label = QLabel("Temporada:")
         season_label.setStyleSheet(LABEL_STYLE)
@@ -303,6 +323,29 @@ class TodoIncluidoTab(QWidget):
         people_group.setLayout(people_layout)
         layout.addWidget(people_group)
         
+        # Modo grupo: huéspedes escritos o importados de un CSV, sin un control por persona
+        group_group = QGroupBox("Grupo")
+        group_group.setStyleSheet(GROUPBOX_STYLE)
+        group_layout = QVBoxLayout()
+        self.group_checkbox = QCheckBox("Cotizar un grupo (edades por habitación)")
+        group_layout.addWidget(self.group_checkbox)
+        self.group_text = QPlainTextEdit()
+        self.group_text.setPlaceholderText(
+            "Una línea por habitación; sin habitación se usa la elegida arriba.\n"
+            "Superior: 30xA, 12x8, 4\n"
+            "A = adulto sin edad, 30xA = 30 adultos, 12x8 = 12 niños de 8 años")
+        self.group_text.setMinimumHeight(100)
+        group_layout.addWidget(self.group_text)
+        group_buttons_layout = QHBoxLayout()
+        self.import_group_button = QPushButton("Importar CSV...")
+        group_buttons_layout.addWidget(self.import_group_button)
+        group_buttons_layout.addStretch()
+        group_layout.addLayout(group_buttons_layout)
+        group_group.setLayout(group_layout)
+        layout.addWidget(group_group)
+        self.group_text.hide()
+        self.import_group_button.hide()
+        
         # Grupo de fechas
         dates_group = QGroupBox("Selección de Fechas")
         dates_group.setStyleSheet(GROUPBOX_STYLE)
@@ -344,6 +387,10 @@ class TodoIncluidoTab(QWidget):
         """)
         
         dates_layout.addWidget(date_container)
+        
+        # Búsqueda de las entradas más baratas con la misma cantidad de noches
+        self.flexible_dates_button = QPushButton("Buscar fechas más baratas")
+        dates_layout.addWidget(self.flexible_dates_button)
         dates_group.setLayout(dates_layout)
         layout.addWidget(dates_group)
         
@@ -390,6 +437,10 @@ class TodoIncluidoTab(QWidget):
         self.details_button = QPushButton("Ver Detalles del Cálculo")
         layout.addWidget(self.details_button)
         
+        # Botón para comparar todos los hoteles con las mismas fechas y personas
+        self.compare_button = QPushButton("Comparar Hoteles")
+        layout.addWidget(self.compare_button)
+        
         # Resultados
         self.result_label = QLabel()
         self.result_label.setStyleSheet("font-size: 14px; margin-top: 10px;")
@@ -408,15 +459,18 @@ class TodoIncluidoTab(QWidget):
         self.hotel_combo.currentTextChanged.connect(self._on_hotel_changed)
         self.season_combo.currentTextChanged.connect(self._on_season_changed)
         
-        self.hotel_combo.currentIndexChanged.connect(self.update_rooms)
-        self.room_combo.currentIndexChanged.connect(self.calculate_total)
+        self.room_combo.currentIndexChanged.connect(self.recalc.schedule)
         self.offer_2x1_checkbox.toggled.connect(self.on_offer_changed)
         self.discount_checkbox.toggled.connect(self.on_discount_toggled)
-        self.discount_spinbox.valueChanged.connect(self.calculate_total)
-        self.dollar_value.valueChanged.connect(self.calculate_total)
-        self.adults_spin.valueChanged.connect(self.calculate_total)
-        self.children_spin.valueChanged.connect(self.calculate_total)
+        self.discount_spinbox.valueChanged.connect(self.recalc.schedule_debounced)
+        self.dollar_value.valueChanged.connect(self.recalc.schedule_debounced)
+        self.adults_spin.valueChanged.connect(self.recalc.schedule_debounced)
         self.details_button.clicked.connect(self.show_details_popup)
+        self.flexible_dates_button.clicked.connect(self.show_flexible_dates)
+        self.compare_button.clicked.connect(self.show_comparison)
+        self.group_checkbox.toggled.connect(self.set_group_mode)
+        self.group_text.textChanged.connect(self.recalc.schedule_debounced)
+        self.import_group_button.clicked.connect(self.import_group_csv)
 
     def show_calendar(self, date_input):
         if not self.calendar:
@@ -447,7 +501,7 @@ class TodoIncluidoTab(QWidget):
                 
                 self.check_in_date = check_in
                 self.check_out_date = check_out
-                self.calculate_total()
+                self.recalc.schedule()
         except:
             pass
 
@@ -458,51 +512,178 @@ class TodoIncluidoTab(QWidget):
             # Si es el campo de entrada, actualizar también la fecha de salida
             if self.active_date_input == self.check_in_input:
                 self.check_in_date = date
-                self.shared_state.check_in = date
                 next_date = date.addDays(1)
                 self.check_out_date = next_date
-                self.shared_state.check_out = next_date
                 self.check_out_input.setText(next_date.toString("yyyy-MM-dd"))
+                # Ambas fechas en un solo cambio, sin cotizar un par inconsistente
+                with self.shared_state.batch():
+                    self.shared_state.check_in = date
+                    self.shared_state.check_out = next_date
             else:
                 self.check_out_date = date
                 self.shared_state.check_out = date
             
             self.calendar.hide()
             self.active_date_input = None
-            self.calculate_total()
-
-    def on_check_in_changed(self, date):
-        """Recibe notificación de cambio de fecha de entrada desde shared state"""
-        if date != self.check_in_date:
-            self.check_in_date = date
-            self.check_in_input.setText(date.toString("yyyy-MM-dd"))
-            self.calculate_total()
-
-    def on_check_out_changed(self, date):
-        """Recibe notificación de cambio de fecha de salida desde shared state"""
-        if date != self.check_out_date:
-            self.check_out_date = date
-            self.check_out_input.setText(date.toString("yyyy-MM-dd"))
-            self.calculate_total()
+            self.recalc.schedule()
+
+    def show_flexible_dates(self):
+        """Muestra las entradas más baratas de los próximos meses para la estadía actual"""
+        nights = self.check_in_date.daysTo(self.check_out_date)
+        if self.tariffs is None or nights <= 0 or not self.room_combo.currentText():
+            return
+        
+        quote = self.quote
+        try:
+            if isinstance(quote, GroupQuote):
+                # En modo grupo cada tipo de habitación pesa según los huéspedes que pagan
+                options = cheapest_all_inclusive_group_check_ins(
+                    self.tariffs, quote.hotel, self.season_combo.currentText(), nights,
+                    QDate.currentDate().toPython(), {line.room: line.shares for line in quote.lines})
+            else:
+                options = cheapest_all_inclusive_check_ins(
+                    self.tariffs, self.hotel_combo.currentText(), self.room_combo.currentText(),
+                    self.season_combo.currentText(), nights, QDate.currentDate().toPython())
+        except ValueError as e:
+            # Hotel, habitación o temporada que el tarifario no tiene
+            self.result_label.setText(str(e))
+            return
+        
+        if isinstance(quote, GroupQuote):
+            format_cost = lambda cost: f"Total USD ${cost:,.2f}"
+        elif quote is not None and quote.subtotal:
+            # El total de la cotización es proporcional al precio base por persona
+            factor = quote.total_usd / quote.subtotal
+            format_cost = lambda cost: f"Total USD ${cost * factor:,.2f}"
+        else:
+            format_cost = lambda cost: f"${cost:,.2f} por persona"
+        dialog = FlexibleDatesDialog(options, format_cost, self)
+        if dialog.exec() and dialog.selected is not None:
+            self.set_stay(QDate(dialog.selected.check_in), QDate(dialog.selected.check_out))
+
+    def show_comparison(self):
+        """Cotiza todos los hoteles y habitaciones con la selección actual en una tabla ordenable"""
+        if self.tariffs is None or self.check_in_date.daysTo(self.check_out_date) <= 0:
+            return
+        
+        try:
+            adults, ages = self.people()
+            comparison = compare_all_inclusive(
+                self.tariffs, self.season_combo.currentText(),
+                self.check_in_date.toPython(), self.check_out_date.toPython(),
+                adults=adults, children_ages=ages,
+                offer_2x1=self.offer_2x1_checkbox.isChecked(),
+                discount=self.discount_spinbox.value() if self.discount_checkbox.isChecked() else 0,
+                cop_per_usd=self.dollar_value.value())
+        except ValueError as e:
+            # Fechas fuera del calendario de temporadas
+            self.result_label.setText(str(e))
+            return
+        usd = lambda value: f"${value:,.2f}"
+        model = ComparisonModel([
+            ("Hotel", comparison.hotels, str),
+            ("Habitación", comparison.rooms, str),
+            ("Entre semana", comparison.weekday_rate, usd),
+            ("Fin de semana", comparison.weekend_rate, usd),
+            ("Por persona", comparison.price_per_person, usd),
+            ("Total USD", comparison.total_usd, usd),
+            ("Total COP", comparison.total_cop, lambda value: f"${value:,.0f}"),
+        ])
+        dialog = ComparisonDialog(f"Comparación de hoteles - temporada {self.season_combo.currentText()}", model, self)
+        if dialog.exec() and dialog.selected is not None:
+            self.hotel_combo.setCurrentText(comparison.hotels[dialog.selected])
+            self.room_combo.setCurrentText(comparison.rooms[dialog.selected])
+
+    def people(self):
+        """(adultos, edades de los niños) de la selección; en modo grupo, de todo el grupo"""
+        if not self.group_checkbox.isChecked():
+            ages = [age_container.itemAt(1).widget().value() for age_container in self.children_age_widgets]
+            return self.adults_spin.value(), ages
+        ages, _ = parse_guests(self.group_text.toPlainText(), self.room_combo.currentText())
+        adults = np.isnan(ages)
+        return int(adults.sum()), ages[~adults].tolist()
+
+    def set_group_mode(self, enabled):
+        """Muestra el texto del grupo y deshabilita los controles de una sola habitación"""
+        self.group_text.setVisible(enabled)
+        self.import_group_button.setVisible(enabled)
+        self.adults_spin.setEnabled(not enabled)
+        self.children_spin.setEnabled(not enabled)
+        for age_container in self.children_age_widgets:
+            age_container.itemAt(1).widget().setEnabled(not enabled)
+        self.recalc.schedule()
+
+    def import_group_csv(self):
+        """Lee un CSV con una fila por huésped (columnas Edad y, opcional, Habitación)"""
+        path, _ = QFileDialog.getOpenFileName(self, "Importar huéspedes", "", "CSV (*.csv)")
+        if not path:
+            return
+        try:
+            ages, rooms = read_guests_csv(path, self.room_combo.currentText())
+        except (OSError, ValueError) as e:
+            self.result_label.setText(f"Error importando huéspedes: {e}")
+            return
+        self.group_text.setPlainText(format_guests(ages, rooms))
+
+    def set_stay(self, check_in, check_out):
+        """Cambia ambas fechas y las publica juntas en el shared state"""
+        self.check_in_input.setText(check_in.toString("yyyy-MM-dd"))
+        self.check_out_input.setText(check_out.toString("yyyy-MM-dd"))
+        self.check_in_date = check_in
+        self.check_out_date = check_out
+        with self.shared_state.batch():
+            self.shared_state.check_in = check_in
+            self.shared_state.check_out = check_out
+        self.recalc.schedule()
+
+    def on_state_changed(self, changes):
+        """Recibe en una sola notificación los cambios del shared state"""
+        if "hotel" in changes and changes["hotel"] != self.hotel_combo.currentText():
+            # El cambio de texto del combo actualiza habitaciones y precios (_on_hotel_changed)
+            self.hotel_combo.setCurrentText(changes["hotel"])
+        if "season" in changes and changes["season"] != self.season_combo.currentText():
+            self.season_combo.setCurrentText(changes["season"])
+        if "check_in" in changes and changes["check_in"] != self.check_in_date:
+            self.check_in_date = changes["check_in"]
+            self.check_in_input.setText(self.check_in_date.toString("yyyy-MM-dd"))
+        if "check_out" in changes and changes["check_out"] != self.check_out_date:
+            self.check_out_date = changes["check_out"]
+            self.check_out_input.setText(self.check_out_date.toString("yyyy-MM-dd"))
+        self.recalc.schedule()
+
+    def showEvent(self, event):
+        super().showEvent(event)
+        # Recalcular solo al hacerse visible si algo cambió mientras estaba oculta
+        self.recalc.set_active(True)
+
+    def hideEvent(self, event):
+        super().hideEvent(event)
+        self.recalc.set_active(False)
 
     def on_discount_toggled(self, checked):
         self.discount_spinbox.setEnabled(checked)
         if checked:
             self.offer_2x1_checkbox.setChecked(False)
-        self.calculate_total()
+        self.recalc.schedule()
 
     def on_offer_changed(self, checked):
         if checked:
             self.discount_checkbox.setChecked(False)
-        self.calculate_total()
+        self.recalc.schedule()
 
     def update_rooms(self):
-        hotel = self.hotel_combo.currentText()
-        self.room_combo.clear()
-        if hotel:
-            rooms = sorted(self.df[self.df['Hotel'] == hotel]['Tipo de Habitacion'].unique())
-            self.room_combo.addItems(rooms)
-            self.update_prices()
+        if self.tariffs is None:
+            return
+        # Cada hotel tiene su modelo de habitaciones ya armado; solo se cambia el del combo
+        rooms = self.hotel_model.room_model(self.tariffs.hotel_id(self.hotel_combo.currentText()))
+        if self.room_combo.model() is not rooms:
+            # Conservar la habitación elegida si el nuevo modelo la tiene (p. ej. al recargar tarifas)
+            room = self.room_combo.currentText()
+            self.room_combo.setModel(rooms)
+            room_index = self.room_combo.findText(room)
+            if room_index >= 0:
+                self.room_combo.setCurrentIndex(room_index)
+        self.update_prices()
             
     def update_prices(self):
         hotel = self.hotel_combo.currentText()
@@ -510,28 +691,8 @@ class TodoIncluidoTab(QWidget):
         season = self.season_combo.currentText()
         
         if hotel and room and season:
-            # Obtener precios para días entre semana
-            weekday_data = self.df[
-                (self.df['Hotel'] == hotel) & 
-                (self.df['Tipo de Habitacion'] == room) &
-                (self.df['Dias de la Semana'].str.contains('Entre Semana', na=False))
-            ]
-            
-            # Obtener precios para fin de semana
-            weekend_data = self.df[
-                (self.df['Hotel'] == hotel) & 
-                (self.df['Tipo de Habitacion'] == room) &
-                (self.df['Dias de la Semana'].str.contains('Fin de Semana', na=False))
-            ]
-            
-            if not weekday_data.empty:
-                self.current_prices['weekday'] = weekday_data[f'Tarifa {season}'].iloc[0]
-            if not weekend_data.empty:
-                self.current_prices['weekend'] = weekend_data[f'Tarifa {season}'].iloc[0]
-                
-            self.calculate_total()
-        else:
-            self.current_prices = {'weekday': 0, 'weekend': 0}
+            self.recalc.schedule()
+        elif self.tariffs is not None:
             self.result_label.setText("")
 
     def show_details_popup(self):
@@ -544,7 +705,7 @@ class TodoIncluidoTab(QWidget):
         
         details = QTextEdit()
         details.setReadOnly(True)
-        details.setHtml(self.calculation_details)
+        details.setHtml(self.calculation_details())
         
         layout.addWidget(details)
         
@@ -564,133 +725,181 @@ class TodoIncluidoTab(QWidget):
         nights = check_in_date.daysTo(check_out_date)
         
         if nights <= 0:
+            self.quote = None
             self.result_label.setText("Por favor seleccione fechas válidas")
             return
         
-        # Iniciar detalles del cálculo
+        if self.group_checkbox.isChecked():
+            self.calculate_group()
+            return
+        
+        ages = [age_container.itemAt(1).widget().value() for age_container in self.children_age_widgets]
+        try:
+            quote = quote_cache.quote_all_inclusive(
+                self.tariffs, self.hotel_combo.currentText(), self.room_combo.currentText(),
+                self.season_combo.currentText(), check_in_date.toPython(), check_out_date.toPython(),
+                adults=self.adults_spin.value(), children_ages=ages,
+                offer_2x1=self.offer_2x1_checkbox.isChecked(),
+                discount=self.discount_spinbox.value() if self.discount_checkbox.isChecked() else 0,
+                cop_per_usd=self.dollar_value.value())
+        except ValueError as e:
+            # Fechas fuera del calendario de temporadas o noches sin tarifa
+            self.quote = None
+            self.result_label.setText(str(e))
+            return
+        
+        # Los detalles para el popup se generan al abrirlo (calculation_details)
+        if quote is not self.quote:
+            self.quote = quote
+            self._details_html = None
+        
+        # Mostrar resultados resumidos
+        result_text = f"Total para {quote.nights} noches:\n"
+        result_text += f"{quote.adults} adultos, {len(quote.children)} niños\n"
+        result_text += f"USD ${quote.total_usd:.2f}\n"
+        result_text += f"COP ${quote.total_cop:,.0f}"
+        
+        self.result_label.setText(result_text)
+
+    def calculate_group(self):
+        """Cotiza el grupo escrito; los precios de todos los huéspedes se calculan con arreglos"""
+        try:
+            ages, rooms = parse_guests(self.group_text.toPlainText(), self.room_combo.currentText())
+            quote = quote_all_inclusive_group(
+                self.tariffs, self.hotel_combo.currentText(), self.season_combo.currentText(),
+                self.check_in_date.toPython(), self.check_out_date.toPython(), ages, rooms,
+                offer_2x1=self.offer_2x1_checkbox.isChecked(),
+                discount=self.discount_spinbox.value() if self.discount_checkbox.isChecked() else 0,
+                cop_per_usd=self.dollar_value.value())
+        except ValueError as e:
+            # Texto del grupo inválido, habitación que el hotel no tiene o fechas fuera del calendario
+            self.quote = None
+            self.result_label.setText(str(e))
+            return
+        
+        self.quote = quote
+        self._details_html = None
+        result_text = f"Grupo de {quote.guests} huéspedes para {quote.nights} noches:\n"
+        result_text += f"{quote.adults} adultos, {quote.children} niños\n"
+        for line in quote.lines:
+            result_text += f"{line.room}: {line.guests} huéspedes, USD ${line.total_usd:,.2f}\n"
+        result_text += f"USD ${quote.total_usd:,.2f}\n"
+        result_text += f"COP ${quote.total_cop:,.0f}"
+        self.result_label.setText(result_text)
+
+    def calculation_details(self):
+        """HTML de detalles de la cotización actual, generado una vez por cotización"""
+        if self.quote is None:
+            return ""
+        if self._details_html is None:
+            if isinstance(self.quote, GroupQuote):
+                self._details_html = self.build_group_details(self.quote)
+            else:
+                self._details_html = self.build_details(self.quote)
+        return self._details_html
+
+    def build_details(self, quote):
+        """Genera el HTML con el desglose de una cotización"""
         details = []
-        details.append(f"<h3>Detalles de la Reserva</h3>")
-        details.append(f"<p><b>Hotel:</b> {self.hotel_combo.currentText()}")
-        details.append(f"<b>Habitación:</b> {self.room_combo.currentText()}")
-        details.append(f"<b>Temporada:</b> {self.season_combo.currentText()}</p>")
-        details.append(f"<p><b>Fechas:</b> {check_in_date.toString('dd/MM/yyyy')} - {check_out_date.toString('dd/MM/yyyy')}")
-        details.append(f"<b>Total noches:</b> {nights}</p>")
-        details.append(f"<p><b>Personas:</b> {self.adults_spin.value()} adultos, {self.children_spin.value()} niños</p>")
-        
-        # Obtener precios base
-        weekday_price = float(self.current_prices.get('weekday', 0))
-        weekend_price = float(self.current_prices.get('weekend', 0))
+        details.append("<h3>Detalles de la Reserva</h3>")
+        details.append(f"<p><b>Hotel:</b> {quote.hotel}")
+        details.append(f"<b>Habitación:</b> {quote.room}")
+        seasons = ", ".join(f"{line.season} ({line.weekday_nights + line.weekend_nights} noches)"
+                            for line in quote.seasons)
+        details.append(f"<b>Temporada:</b> {quote.season}" + (f" - {seasons}" if quote.season == AUTO_SEASON else "") + "</p>")
+        details.append(f"<p><b>Fechas:</b> {quote.check_in.strftime('%d/%m/%Y')} - {quote.check_out.strftime('%d/%m/%Y')}")
+        details.append(f"<b>Total noches:</b> {quote.nights}</p>")
+        details.append(f"<p><b>Personas:</b> {quote.adults} adultos, {len(quote.children)} niños</p>")
         
         details.append("<h4>Desglose de Precios por noche</h4>")
-        details.append("<p><b>Tarifa entre semana:</b> ${:,.2f}<br>".format(weekday_price))
-        details.append("<b>Tarifa fin de semana:</b> ${:,.2f}</p>".format(weekend_price))
-        
-        # Calcular días entre semana y fines de semana
-        total = 0
-        weekday_count = 0
-        weekend_count = 0
-        current_date = check_in_date
-        
-        while current_date < check_out_date:
-            if current_date.dayOfWeek() >= 6:
-                total += weekend_price
-                weekend_count += 1
-            else:
-                total += weekday_price
-                weekday_count += 1
-            current_date = current_date.addDays(1)
-        
-        details.append(f"<p>Entre semana: {weekday_count} (${weekday_count * weekday_price:,.2f})<br>")
-        details.append(f"Fin de semana: {weekend_count} (${weekend_count * weekend_price:,.2f})</p>")
-        
-        subtotal = total
-        details.append(f"<p><b>Subtotal por noche:</b> ${subtotal:,.2f}</p>")
-        
-        # Calcular total para adultos
-        total_adults = subtotal
-        if self.offer_2x1_checkbox.isChecked():
-            total_adults = total_adults / 2
-            details.append(f"<p><b>Oferta 2x1 aplicada a adultos:</b> -${subtotal/2:,.2f}</p>")
-        elif self.discount_checkbox.isChecked():
-            discount = self.discount_spinbox.value() / 100.0
-            discount_amount = total_adults * discount
-            total_adults = total_adults * (1 - discount)
-            details.append(f"<p><b>Descuento {self.discount_spinbox.value()}% aplicado:</b> -${discount_amount:,.2f}</p>")
-        
-        # Multiplicar por número de adultos
-        total_adults = total_adults * self.adults_spin.value()
+        if len(quote.seasons) > 1:
+            # Tarifas de cada temporada; los totales por tipo de día usan el promedio por noche
+            for line in quote.seasons:
+                details.append(f"<p><b>{line.season}:</b> entre semana ${line.weekday_rate:,.2f}, "
+                               f"fin de semana ${line.weekend_rate:,.2f}</p>")
+        details.append("<p><b>Tarifa entre semana:</b> ${:,.2f}<br>".format(quote.weekday_rate))
+        details.append("<b>Tarifa fin de semana:</b> ${:,.2f}</p>".format(quote.weekend_rate))
+        
+        details.append(f"<p>Entre semana: {quote.weekday_nights} (${quote.weekday_nights * quote.weekday_rate:,.2f})<br>")
+        details.append(f"Fin de semana: {quote.weekend_nights} (${quote.weekend_nights * quote.weekend_rate:,.2f})</p>")
+        
+        # Noches consecutivas con la misma tarifa en una sola línea
+        rates = {line.season: (line.weekday_rate, line.weekend_rate) for line in quote.seasons}
+        runs = []
+        for run in night_runs(quote.check_in, quote.check_out, self.tariffs.weekend_days, season=quote.season):
+            fechas = run.first_night.strftime('%d/%m')
+            if run.nights > 1:
+                fechas += f" - {run.last_night.strftime('%d/%m')}"
+            rate = rates.get(run.season, (0.0, 0.0))[run.day_type]
+            tipo = DAY_TYPES[run.day_type] + (f" ({run.season})" if len(rates) > 1 else "")
+            runs.append(f"{fechas}: {run.nights} × {tipo} @ ${rate:,.2f}")
+        details.append("<p>" + "<br>".join(runs) + "</p>")
+        details.append(f"<p><b>Subtotal por noche:</b> ${quote.subtotal:,.2f}</p>")
+        
+        if quote.offer_2x1:
+            details.append(f"<p><b>Oferta 2x1 aplicada a adultos:</b> -${quote.adult_savings:,.2f}</p>")
+        elif quote.discount:
+            details.append(f"<p><b>Descuento {quote.discount}% aplicado:</b> -${quote.adult_savings:,.2f}</p>")
         
         details.append("<h4>Cálculo por Personas</h4>")
-        details.append(f"<p><b>Adultos ({self.adults_spin.value()}):</b><br>")
-        details.append(f"Precio por adulto: ${total_adults/self.adults_spin.value():,.2f}<br>")
-        details.append(f"Total adultos: ${total_adults:,.2f}</p>")
+        details.append(f"<p><b>Adultos ({quote.adults}):</b><br>")
+        details.append(f"Precio por adulto: ${quote.price_per_adult:,.2f}<br>")
+        details.append(f"Total adultos: ${quote.total_adults:,.2f}</p>")
         
-        # Calcular total para niños (sin aplicar 2x1)
-        total_children = 0
-        if self.children_spin.value() > 0:
+        if quote.children:
             details.append("<b>Niños:</b><br>")
-            for i, age_container in enumerate(self.children_age_widgets):
-                age_spin = age_container.itemAt(1).widget()
-                age = age_spin.value()
-                child_price = 0
-                if age >= 6 and age < 12:
-                    child_price = subtotal * 0.75  # Niños pagan 75% del precio base
-                    details.append(f"Niño {i+1} ({age} años) - 75% del precio base: ${child_price:,.2f}<br>")
-                elif age < 6:
-                    child_price = 0
-                    details.append(f"Niño {i+1} ({age} años) - Gratis<br>")
-                total_children += child_price
-            
-            details.append(f"Subtotal niños: ${total_children:,.2f}</p>")
-        
-        # Sumar total de adultos y niños
-        total = total_adults + total_children
-        
-        # Convertir a COP
-        total_cop = total * self.dollar_value.value()
+            for i, child in enumerate(quote.children):
+                if child.rate == 0:
+                    details.append(f"Niño {i+1} ({child.age} años) - Gratis<br>")
+                else:
+                    details.append(f"Niño {i+1} ({child.age} años) - {child.rate:.0%} del precio base: ${child.price:,.2f}<br>")
+            details.append(f"Subtotal niños: ${quote.total_children:,.2f}</p>")
         
         details.append("<h4>Total Final</h4>")
-        details.append(f"<p><b>Total USD:</b> ${total:,.2f}<br>")
-        details.append(f"<b>Total COP:</b> ${total_cop:,.0f}</p>")
+        details.append(f"<p><b>Total USD:</b> ${quote.total_usd:,.2f}<br>")
+        details.append(f"<b>Total COP:</b> ${quote.total_cop:,.0f}</p>")
         
-        # Guardar detalles para el popup
-        self.calculation_details = "<br>".join(details)
+        return "<br>".join(details)
+
+    def build_group_details(self, quote):
+        """Genera el HTML con el desglose de un grupo por tipo de habitación"""
+        details = []
+        details.append("<h3>Detalles del Grupo</h3>")
+        details.append(f"<p><b>Hotel:</b> {quote.hotel}")
+        details.append(f"<b>Temporada:</b> {quote.season}</p>")
+        details.append(f"<p><b>Fechas:</b> {quote.check_in.strftime('%d/%m/%Y')} - {quote.check_out.strftime('%d/%m/%Y')}")
+        details.append(f"<b>Total noches:</b> {quote.nights}</p>")
+        details.append(f"<p><b>Huéspedes:</b> {quote.guests} ({quote.adults} adultos, {quote.children} niños)</p>")
+        
+        if quote.offer_2x1:
+            details.append("<p><b>Oferta 2x1 aplicada a adultos</b></p>")
+        elif quote.discount:
+            details.append(f"<p><b>Descuento {quote.discount}% aplicado a adultos</b></p>")
+        
+        details.append("<h4>Por Habitación</h4>")
+        for line in quote.lines:
+            details.append(f"<p><b>{line.room}</b> ({line.guests} huéspedes)<br>")
+            details.append(f"Precio base por persona: ${line.subtotal:,.2f}<br>")
+            details.append(f"Adultos ({line.adults}) a ${line.price_per_adult:,.2f}: ${line.total_adults:,.2f}<br>")
+            if line.children:
+                details.append(f"Niños ({line.children}, {line.free_children} gratis): ${line.total_children:,.2f}<br>")
+            details.append(f"Subtotal: ${line.total_usd:,.2f}</p>")
         
-        # Mostrar resultados resumidos
-        result_text = f"Total para {nights} noches:\n"
-        result_text += f"{self.adults_spin.value()} adultos, {self.children_spin.value()} niños\n"
-        result_text += f"USD ${total:.2f}\n"
-        result_text += f"COP ${total_cop:,.0f}"
+        details.append("<h4>Total Final</h4>")
+        details.append(f"<p><b>Total USD:</b> ${quote.total_usd:,.2f}<br>")
+        details.append(f"<b>Total COP:</b> ${quote.total_cop:,.0f}</p>")
         
-        self.result_label.setText(result_text)
+        return "<br>".join(details)
 
     def _on_hotel_changed(self, hotel):
         """Actualiza el hotel en el shared state"""
         self.shared_state.hotel = hotel
         self.update_rooms()
-        self.update_prices()
-        self.calculate_total()
 
     def _on_season_changed(self, season):
         """Actualiza la temporada en el shared state"""
         self.shared_state.season = season
         self.update_prices()
-        self.calculate_total()
-
-    def on_hotel_changed(self, hotel):
-        """Recibe notificación de cambio de hotel desde shared state"""
-        if hotel != self.hotel_combo.currentText():
-            self.hotel_combo.setCurrentText(hotel)
-            self.update_rooms()
-            self.update_prices()
-            self.calculate_total()
-            
-    def on_season_changed(self, season):
-        """Recibe notificación de cambio de temporada desde shared state"""
-        if season != self.season_combo.currentText():
-            self.season_combo.setCurrentText(season)
-            self.update_prices()
-            self.calculate_total()
 
     def update_children_inputs(self, new_count):
         # Limpiar los spinboxes existentes
@@ -714,7 +923,7 @@ class TodoIncluidoTab(QWidget):
             age_spin = QSpinBox()
             age_spin.setRange(0, 11)
             age_spin.setValue(5)
-            age_spin.valueChanged.connect(self.calculate_total)
+            age_spin.valueChanged.connect(self.recalc.schedule_debounced)
             age_spin.wheelEvent = lambda event, s=age_spin: custom_wheel_event(s, event)
             age_spin.setFocusPolicy(Qt.ClickFocus)
             
@@ -728,7 +937,7 @@ class TodoIncluidoTab(QWidget):
             # Guardar referencia al contenedor
             self.children_age_widgets.append(age_container)
         
-        self.calculate_total()
+        self.recalc.schedule()
 
     def setup_calendar_style(self):
         self.calendar.setStyleSheet("""
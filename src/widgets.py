@@ -1,4 +1,6 @@
-from PySide6.QtWidgets import QWidget, QVBoxLayout, QLabel, QSizePolicy
+from PySide6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QLabel, QSizePolicy,
+                               QDialog, QListWidget, QPushButton, QTableView, QHeaderView,
+                               QAbstractItemView)
 from PySide6.QtCore import Qt
 from PySide6.QtGui import QPixmap
 import os
@@ -76,4 +78,84 @@ class BannerWidget(QWidget):
                 min(scaled_pixmap.height(), self.banner_label.height())
             )
         
-        self.banner_label.setPixmap(scaled_pixmap) 
\ No newline at end of file
+        self.banner_label.setPixmap(scaled_pixmap)
+
+class FlexibleDatesDialog(QDialog):
+    """Lista las entradas más baratas; al aceptar, selected es la opción elegida"""
+    def __init__(self, options, format_cost, parent=None):
+        super().__init__(parent)
+        self.setWindowTitle("Fechas flexibles")
+        self.setMinimumWidth(420)
+        self.options = options
+        self.selected = None
+        
+        layout = QVBoxLayout(self)
+        if options:
+            layout.addWidget(QLabel("Entradas más baratas para la misma cantidad de noches:"))
+        else:
+            layout.addWidget(QLabel("No hay tarifas para esta selección"))
+        
+        self.options_list = QListWidget()
+        for option in options:
+            self.options_list.addItem(f"{option.check_in.strftime('%d/%m/%Y')} - "
+                                      f"{option.check_out.strftime('%d/%m/%Y')}: {format_cost(option.cost)}")
+        self.options_list.setCurrentRow(0)
+        self.options_list.itemDoubleClicked.connect(self.accept)
+        layout.addWidget(self.options_list)
+        
+        buttons_layout = QHBoxLayout()
+        buttons_layout.addStretch()
+        use_button = QPushButton("Usar fechas")
+        use_button.setEnabled(bool(options))
+        use_button.clicked.connect(self.accept)
+        close_button = QPushButton("Cerrar")
+        close_button.clicked.connect(self.reject)
+        buttons_layout.addWidget(use_button)
+        buttons_layout.addWidget(close_button)
+        layout.addLayout(buttons_layout)
+
+    def accept(self):
+        row = self.options_list.currentRow()
+        if row >= 0:
+            self.selected = self.options[row]
+        super().accept()
+
+class ComparisonDialog(QDialog):
+    """Muestra una comparación entre hoteles; al aceptar, selected es la fila de datos elegida"""
+    def __init__(self, title, model, parent=None, hint=None, choose_text="Elegir hotel"):
+        super().__init__(parent)
+        self.setWindowTitle(title)
+        self.setMinimumSize(700, 500)
+        self.model = model
+        self.selected = None
+        
+        layout = QVBoxLayout(self)
+        layout.addWidget(QLabel(hint or "Haga clic en un encabezado para ordenar; doble clic para elegir el hotel."))
+        
+        self.table = QTableView()
+        self.table.setModel(model)
+        self.table.setSortingEnabled(True)
+        self.table.setSelectionBehavior(QAbstractItemView.SelectRows)
+        self.table.setSelectionMode(QAbstractItemView.SingleSelection)
+        self.table.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        self.table.verticalHeader().hide()
+        self.table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeToContents)
+        self.table.horizontalHeader().setStretchLastSection(True)
+        self.table.doubleClicked.connect(self.accept)
+        layout.addWidget(self.table)
+        
+        buttons_layout = QHBoxLayout()
+        buttons_layout.addStretch()
+        choose_button = QPushButton(choose_text)
+        choose_button.clicked.connect(self.accept)
+        close_button = QPushButton("Cerrar")
+        close_button.clicked.connect(self.reject)
+        buttons_layout.addWidget(choose_button)
+        buttons_layout.addWidget(close_button)
+        layout.addLayout(buttons_layout)
+
+    def accept(self):
+        rows = self.table.selectionModel().selectedRows()
+        if rows:
+            self.selected = self.model.source_row(rows[0].row())
+        super().accept()
@@ -0,0 +1,28 @@
+import random
+from datetime import date, timedelta
+
+import pytest
+
+from pricing import SEASONS, AUTO_SEASON, load_decas_tariffs, load_todo_incluido_tariffs
+
+
+@pytest.fixture(scope='session')
+def todo_incluido():
+    return load_todo_incluido_tariffs()
+
+
+@pytest.fixture(scope='session')
+def decas():
+    return load_decas_tariffs()
+
+
+def random_stay(rng, max_nights=21):
+    """(temporada, entrada, salida) dentro del calendario de temporadas"""
+    check_in = date(2025, 1, 1) + timedelta(days=rng.randint(0, 1300))
+    season = rng.choice(list(SEASONS) + [AUTO_SEASON])
+    return season, check_in, check_in + timedelta(days=rng.randint(1, max_nights))
+
+
+@pytest.fixture
+def rng():
+    return random.Random(20251018)
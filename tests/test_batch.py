@@ -0,0 +1,103 @@
+"""El lote cotiza igual que una cotización sola"""
+from datetime import date
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from pricing import (DECAS_ROOM_TYPES, SEASONS, WEEKEND, TariffIndex, cheapest_all_inclusive_check_ins,
+                     compare_all_inclusive, quote_all_inclusive, quote_decas)
+from pricing.batch import _flag, quote_all_inclusive_batch, quote_decas_batch
+
+from conftest import random_stay
+
+
+def _all_inclusive_itineraries(tariffs, rng, count):
+    rows = []
+    for _ in range(count):
+        hotel = rng.choice(tariffs.hotels)
+        season, check_in, check_out = random_stay(rng)
+        rows.append(dict(hotel=hotel, room=rng.choice(tariffs.rooms_of(hotel)), season=season,
+                         check_in=check_in, check_out=check_out, adults=rng.randint(1, 4),
+                         children_ages=[rng.randint(0, 17) for _ in range(rng.randint(0, 3))],
+                         offer_2x1=rng.random() < 0.3, discount=rng.choice([0, 0, 10, 25])))
+    return rows
+
+
+def _decas_itineraries(tariffs, rng, count):
+    rows = []
+    for _ in range(count):
+        season, check_in, check_out = random_stay(rng, max_nights=30)
+        hotel = rng.choice(tariffs.hotels)
+        rooms = {room: rng.randint(0, 2) if room in tariffs.rooms_of(hotel) else 0 for room in DECAS_ROOM_TYPES}
+        rows.append(dict(hotel=hotel, season=season, check_in=check_in, check_out=check_out, **rooms))
+    return rows
+
+
+def test_all_inclusive_batch_matches_single_quotes(todo_incluido, rng):
+    rows = _all_inclusive_itineraries(todo_incluido, rng, 200)
+    batch = quote_all_inclusive_batch(todo_incluido, pd.DataFrame(
+        [dict(row, children_ages=';'.join(map(str, row['children_ages']))) for row in rows]))
+    for i, row in enumerate(rows):
+        quote = quote_all_inclusive(todo_incluido, **row)
+        assert batch['total_usd'][i] == pytest.approx(quote.total_usd), row
+        assert batch['price_per_adult'][i] == pytest.approx(quote.price_per_adult), row
+
+
+def test_decas_batch_matches_single_quotes(decas, rng):
+    rows = _decas_itineraries(decas, rng, 200)
+    batch = quote_decas_batch(decas, pd.DataFrame(rows))
+    for i, row in enumerate(rows):
+        rooms = {room: row[room] for room in DECAS_ROOM_TYPES}
+        quote = quote_decas(decas, row['hotel'], row['season'], row['check_in'], row['check_out'], rooms)
+        assert batch['total_decas'][i] == pytest.approx(quote.total_decas), row
+        assert batch['total_with_admin'][i] == pytest.approx(quote.total_with_admin), row
+
+
+def test_batch_returns_nan_for_unknown_names(decas):
+    batch = quote_decas_batch(decas, pd.DataFrame([
+        dict(hotel='NOPE', season='Alta', check_in=date(2026, 1, 5), check_out=date(2026, 1, 8), Doble=1)]))
+    assert np.isnan(batch['total_decas'][0])
+
+
+def test_decas_batch_returns_nan_for_room_type_the_hotel_lacks(decas):
+    hotel = next(hotel for hotel in decas.hotels if decas.rooms_of(hotel) == ['Doble'])
+    stay = dict(hotel=hotel, season='Baja', check_in=date(2026, 1, 5), check_out=date(2026, 1, 8))
+    batch = quote_decas_batch(decas, pd.DataFrame([dict(stay, Doble=1, Triple=1), dict(stay, Doble=1, Triple=0)]))
+    assert np.isnan(batch['total_decas'][0])
+    assert batch['total_decas'][1] > 0
+
+
+def test_missing_rate_is_rejected_by_every_path(todo_incluido):
+    # Sin tarifa de fin de semana en Alta para una habitación que el hotel sí ofrece
+    hotel = todo_incluido.hotels[0]
+    room = todo_incluido.rooms_of(hotel)[0]
+    rates = todo_incluido.rates.copy()
+    rates[todo_incluido.hotel_id(hotel), todo_incluido.room_id(room), SEASONS.index('Alta'), WEEKEND] = np.nan
+    tariffs = TariffIndex(todo_incluido.hotels, todo_incluido.rooms, rates,
+                          weekend_days=todo_incluido.weekend_days)
+    # Lunes a jueves, y lunes a domingo con el viernes y el sábado sin tarifa
+    weekdays = dict(hotel=hotel, room=room, season='Alta', check_in=date(2026, 11, 2), check_out=date(2026, 11, 5))
+    week = dict(weekdays, check_out=date(2026, 11, 8))
+
+    batch = quote_all_inclusive_batch(tariffs, pd.DataFrame([weekdays, week]))
+    assert batch['total_usd'][0] == pytest.approx(quote_all_inclusive(tariffs, **weekdays).total_usd)
+    with pytest.raises(ValueError, match='no tiene tarifa'):
+        quote_all_inclusive(tariffs, **week)
+    assert np.isnan(batch['total_usd'][1])
+
+    comparison = compare_all_inclusive(tariffs, 'Alta', week['check_in'], week['check_out'])
+    assert (hotel, room) not in set(zip(comparison.hotels, comparison.rooms))
+    options = cheapest_all_inclusive_check_ins(tariffs, hotel, room, 'Alta', 3, date(2026, 11, 2),
+                                               window_days=14, limit=14)
+    assert options and all(option.check_out.weekday() in (2, 3, 4) for option in options)
+    for option in options:
+        assert option.cost == pytest.approx(
+            quote_all_inclusive(tariffs, hotel, room, 'Alta', option.check_in, option.check_out).subtotal)
+
+
+def test_flag_accepts_text_numbers_and_blanks():
+    df = pd.DataFrame({'text': ['sí', 'no', None, 'TRUE'], 'number': [1.0, np.nan, 0.0, 2.0]})
+    assert _flag(df, 'text', False).tolist() == [True, False, False, True]
+    assert _flag(df, 'number', True).tolist() == [True, True, False, True]
+    assert _flag(df, 'missing', True).tolist() == [True] * 4
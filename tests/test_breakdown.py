@@ -0,0 +1,17 @@
+"""Tramos del desglose detallado"""
+from datetime import date
+
+from pricing import AUTO_SEASON, SeasonCalendar, night_runs
+
+
+def test_night_runs_split_on_season_and_follow_the_calendar():
+    check_in, check_out = date(2026, 1, 5), date(2026, 1, 9)
+    high = SeasonCalendar.from_ranges([(date(2026, 1, 1), date(2026, 1, 6), 'Alta')])
+    runs = night_runs(check_in, check_out, season=AUTO_SEASON, calendar=high)
+    assert [(run.season, run.nights) for run in runs] == [('Alta', 2), ('Baja', 2)]
+    assert sum(run.nights for run in night_runs(check_in, check_out)) == 4
+
+    # Otro calendario para las mismas fechas no reusa los tramos guardados
+    mid = SeasonCalendar.from_ranges([(date(2026, 1, 1), date(2026, 1, 31), 'Media')])
+    runs = night_runs(check_in, check_out, season=AUTO_SEASON, calendar=mid)
+    assert [(run.season, run.nights) for run in runs] == [('Media', 4)]
@@ -0,0 +1,26 @@
+"""Caché de cotizaciones"""
+from datetime import date
+
+from pricing import AUTO_SEASON, SeasonCalendar, quote_decas
+from pricing.cache import QuoteCache
+from pricing.seasons import SEASON_CALENDAR_CSV, _calendars
+
+CHECK_IN, CHECK_OUT = date(2026, 11, 2), date(2026, 11, 5)
+
+
+def test_cache_reuses_quotes_for_equal_requests(decas):
+    cache = QuoteCache()
+    first = cache.quote_decas(decas, decas.hotels[0], 'Baja', CHECK_IN, CHECK_OUT, {'Doble': 1})
+    assert cache.quote_decas(decas, decas.hotels[0], 'Baja', CHECK_IN, CHECK_OUT, {'Doble': 1, 'Triple': 0}) is first
+    assert cache.info().hits == 1
+
+
+def test_cache_misses_after_season_calendar_reload(decas, monkeypatch):
+    cache = QuoteCache()
+    hotel = decas.hotels[0]
+    for season in ('Alta', 'Baja'):
+        calendar = SeasonCalendar.from_ranges([(date(2026, 1, 1), date(2026, 12, 31), season)])
+        monkeypatch.setitem(_calendars, SEASON_CALENDAR_CSV, calendar)
+        quote = cache.quote_decas(decas, hotel, AUTO_SEASON, CHECK_IN, CHECK_OUT, {'Doble': 1})
+        assert quote.total_decas == quote_decas(decas, hotel, season, CHECK_IN, CHECK_OUT, {'Doble': 1}).total_decas
+    assert cache.info().misses == 2
@@ -0,0 +1,26 @@
+"""Cotizador por línea de comandos"""
+import pandas as pd
+
+from pricing.cli import main
+
+
+def test_cli_prices_csv_file(tmp_path, capsys):
+    source = tmp_path / 'itinerarios.csv'
+    source.write_text('hotel,season,check_in,check_out,Doble\n'
+                      'DECAMERON PANACA,Alta,2026-01-05,2026-01-08,1\n', encoding='utf-8')
+    target = tmp_path / 'cotizaciones.jsonl'
+    assert main(['decas', str(source), '-o', str(target), '--output-format', 'jsonl']) == 0
+    result = pd.read_json(target, lines=True)
+    assert len(result) == 1 and result['total_decas'][0] > 0
+
+
+def test_cli_reports_missing_file(tmp_path, capsys):
+    assert main(['decas', str(tmp_path / 'no-existe.csv')]) == 1
+    assert 'Error de archivo' in capsys.readouterr().err
+
+
+def test_cli_reports_malformed_input(tmp_path, capsys):
+    source = tmp_path / 'roto.jsonl'
+    source.write_text('{"hotel": "DECAMERON PANACA"\n', encoding='utf-8')
+    assert main(['todo-incluido', str(source)]) == 2
+    assert 'No se pudo leer' in capsys.readouterr().err
@@ -0,0 +1,22 @@
+"""Comparación entre hoteles"""
+import pytest
+
+from pricing import compare_all_inclusive, compare_decas, quote_all_inclusive, quote_decas
+
+from conftest import random_stay
+
+
+def test_comparison_matches_single_quotes(todo_incluido, decas, rng):
+    for _ in range(10):
+        season, check_in, check_out = random_stay(rng)
+        comparison = compare_all_inclusive(todo_incluido, season, check_in, check_out, adults=2,
+                                           children_ages=[5, 9, 13], offer_2x1=True)
+        for hotel, room, total in list(zip(comparison.hotels, comparison.rooms, comparison.total_usd))[:20]:
+            quote = quote_all_inclusive(todo_incluido, hotel, room, season, check_in, check_out, adults=2,
+                                        children_ages=[5, 9, 13], offer_2x1=True)
+            assert total == pytest.approx(quote.total_usd)
+
+        rooms = {'Doble': 2, 'Triple': 1}
+        comparison = compare_decas(decas, season, check_in, check_out, rooms)
+        for hotel, total in zip(comparison.hotels, comparison.total_decas):
+            assert total == pytest.approx(quote_decas(decas, hotel, season, check_in, check_out, rooms).total_decas)
@@ -0,0 +1,96 @@
+from datetime import date
+
+import pytest
+
+from pricing import cheapest_room_mixes, quote_all_inclusive, quote_decas
+from pricing.engine import CHILD_RATE, child_rate, child_rates
+
+CHECK_IN, CHECK_OUT = date(2026, 11, 2), date(2026, 11, 5)
+
+
+@pytest.fixture(scope='module')
+def room(todo_incluido):
+    hotel = todo_incluido.hotels[0]
+    return hotel, todo_incluido.rooms_of(hotel)[0]
+
+
+@pytest.mark.parametrize('age, rate', [(0, 0.0), (5, 0.0), (6, CHILD_RATE), (11, CHILD_RATE), (12, 1.0), (40, 1.0)])
+def test_child_rate(age, rate):
+    assert child_rate(age) == rate
+    assert child_rates([age])[0] == rate
+
+
+def test_2x1_and_discount_apply_to_adults_only(todo_incluido, room):
+    hotel, room_name = room
+    full = quote_all_inclusive(todo_incluido, hotel, room_name, 'Alta', CHECK_IN, CHECK_OUT,
+                               adults=2, children_ages=[4, 8, 14])
+    subtotal = full.subtotal
+    assert subtotal > 0
+    assert full.total_usd == pytest.approx(subtotal * (2 + 0 + CHILD_RATE + 1))
+
+    offer = quote_all_inclusive(todo_incluido, hotel, room_name, 'Alta', CHECK_IN, CHECK_OUT,
+                                adults=2, children_ages=[4, 8, 14], offer_2x1=True, discount=30)
+    assert offer.discount == 0
+    assert offer.price_per_adult == pytest.approx(subtotal / 2)
+    assert offer.total_children == pytest.approx(full.total_children)
+
+    discount = quote_all_inclusive(todo_incluido, hotel, room_name, 'Alta', CHECK_IN, CHECK_OUT,
+                                   adults=2, children_ages=[14], discount=10)
+    assert discount.total_adults == pytest.approx(2 * subtotal * 0.9)
+    assert discount.total_children == pytest.approx(subtotal)
+
+
+def test_total_cop_uses_exchange_rate(todo_incluido, room):
+    quote = quote_all_inclusive(todo_incluido, *room, 'Media', CHECK_IN, CHECK_OUT, cop_per_usd=4200)
+    assert quote.total_cop == pytest.approx(quote.total_usd * 4200)
+
+
+@pytest.mark.parametrize('hotel, room_name, season, message', [
+    ('NOPE', None, 'Alta', 'Hotel desconocido'),
+    (None, 'NOPE', 'Alta', 'Habitación desconocida'),
+    (None, None, 'baja', 'Temporada desconocida'),
+])
+def test_all_inclusive_rejects_unknown_names(todo_incluido, room, hotel, room_name, season, message):
+    with pytest.raises(ValueError, match=message):
+        quote_all_inclusive(todo_incluido, hotel or room[0], room_name or room[1], season, CHECK_IN, CHECK_OUT)
+
+
+@pytest.mark.parametrize('hotel, rooms, season, message', [
+    ('NOPE', {'Doble': 1}, 'Alta', 'Hotel desconocido'),
+    (None, {'Dobles': 1}, 'Alta', 'Habitación desconocida'),
+    (None, {'Doble': 1}, 'baja', 'Temporada desconocida'),
+])
+def test_decas_rejects_unknown_names(decas, hotel, rooms, season, message):
+    with pytest.raises(ValueError, match=message):
+        quote_decas(decas, hotel or decas.hotels[0], season, CHECK_IN, CHECK_OUT, rooms)
+
+
+def test_all_inclusive_rejects_room_of_another_hotel(todo_incluido):
+    # La habitación existe en otros hoteles pero no en este
+    assert 'Beach View / Ocean View' not in todo_incluido.rooms_of('DECAMERON PANACA')
+    with pytest.raises(ValueError, match='no tiene habitación'):
+        quote_all_inclusive(todo_incluido, 'DECAMERON PANACA', 'Beach View / Ocean View', 'Alta',
+                            CHECK_IN, CHECK_OUT)
+
+
+def test_decas_rejects_room_type_the_hotel_lacks(decas):
+    hotel = next(hotel for hotel in decas.hotels if decas.rooms_of(hotel) == ['Doble'])
+    with pytest.raises(ValueError, match='no tiene habitación Triple'):
+        quote_decas(decas, hotel, 'Baja', CHECK_IN, CHECK_OUT, {'Doble': 1, 'Triple': 1})
+    # Los tipos sin habitaciones pedidas no se validan, y la mezcla de habitaciones solo usa los que ofrece
+    assert quote_decas(decas, hotel, 'Baja', CHECK_IN, CHECK_OUT, {'Doble': 1, 'Triple': 0}).total_decas > 0
+    mixes = cheapest_room_mixes(decas, hotel, 'Baja', CHECK_IN, CHECK_OUT, 5)
+    assert mixes and all(set(mix.rooms) == {'Doble'} for mix in mixes)
+
+
+def test_decas_rejects_empty_stay(decas):
+    with pytest.raises(ValueError):
+        quote_decas(decas, decas.hotels[0], 'Alta', CHECK_IN, CHECK_IN, {'Doble': 1})
+
+
+def test_decas_admin_fee_has_minimum(decas):
+    quote = quote_decas(decas, decas.hotels[0], 'Baja', CHECK_IN, CHECK_OUT, {'Doble': 1})
+    assert quote.admin_decas == max(70, quote.total_decas)
+    assert quote.total_with_admin == pytest.approx(quote.total_usd + quote.admin_usd)
+    without = quote_decas(decas, decas.hotels[0], 'Baja', CHECK_IN, CHECK_OUT, {'Doble': 1}, include_admin=False)
+    assert without.total_with_admin == pytest.approx(without.total_usd)
@@ -0,0 +1,26 @@
+"""Búsqueda de la fecha de entrada más barata"""
+from datetime import date
+
+import pytest
+
+from pricing import cheapest_all_inclusive_check_ins, cheapest_decas_check_ins, quote_all_inclusive, quote_decas
+
+
+def test_flexible_dates_match_single_quotes(todo_incluido, decas, rng):
+    first = date(2026, 1, 1)
+    for _ in range(10):
+        season = rng.choice(['Baja', 'Media', 'Automática'])
+        nights = rng.randint(3, 16)
+        hotel = rng.choice(todo_incluido.hotels)
+        room = todo_incluido.rooms_of(hotel)[0]
+        for option in cheapest_all_inclusive_check_ins(todo_incluido, hotel, room, season, nights, first,
+                                                       window_days=90):
+            quote = quote_all_inclusive(todo_incluido, hotel, room, season, option.check_in, option.check_out)
+            assert option.cost == pytest.approx(quote.subtotal)
+
+        hotel = rng.choice(decas.hotels)
+        rooms = {'Doble': 1, 'Cuádruple': rng.randint(0, 2) if 'Cuádruple' in decas.rooms_of(hotel) else 0}
+        for option in cheapest_decas_check_ins(decas, hotel, season, nights, first, rooms, window_days=90):
+            quote = quote_decas(decas, hotel, season, option.check_in, option.check_out, rooms,
+                                include_admin=False)
+            assert option.cost == pytest.approx(quote.total_decas)
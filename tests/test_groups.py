@@ -0,0 +1,106 @@
+"""Cotización de grupos grandes huésped por huésped"""
+from datetime import date
+
+import numpy as np
+import pytest
+
+from pricing import (cheapest_all_inclusive_group_check_ins, parse_guests, quote_all_inclusive,
+                     quote_all_inclusive_group, read_guests_csv)
+from pricing.engine import CHILD_RATE, guest_rates
+from pricing.groups import format_guests
+
+CHECK_IN, CHECK_OUT = date(2026, 11, 2), date(2026, 11, 5)
+
+
+def test_parse_guests_reads_counts_adults_and_rooms():
+    ages, rooms = parse_guests("A, 2x8, 4\nSuite: 3xA 14", "Estándar")
+    assert np.isnan(ages).tolist() == [True, False, False, False, True, True, True, False]
+    assert ages[~np.isnan(ages)].tolist() == [8, 8, 4, 14]
+    assert rooms.tolist() == ["Estándar"] * 4 + ["Suite"] * 4
+
+
+def test_parse_guests_rejects_unknown_tokens():
+    with pytest.raises(ValueError, match="Línea 2"):
+        parse_guests("A\nfoo", "Estándar")
+
+
+def test_format_guests_round_trip():
+    ages, rooms = parse_guests("A, A, 8, 4, 14\nSuite: 3xA, 2x7", "Estándar")
+    again_ages, again_rooms = parse_guests(format_guests(ages, rooms), "Estándar")
+    assert sorted(map(str, zip(again_ages, again_rooms))) == sorted(map(str, zip(ages, rooms)))
+
+
+def test_read_guests_csv(tmp_path):
+    path = tmp_path / "grupo.csv"
+    path.write_text("Edad,Habitación\n,Suite\n8,\n35,Suite\n", encoding="utf-8")
+    ages, rooms = read_guests_csv(path, "Estándar")
+    assert np.isnan(ages[0]) and ages[1:].tolist() == [8, 35]
+    assert rooms.tolist() == ["Suite", "Estándar", "Suite"]
+
+
+@pytest.mark.parametrize('offer_2x1, discount', [(True, 0), (False, 20), (False, 0)])
+def test_group_guests_with_age_follow_child_rules(todo_incluido, offer_2x1, discount):
+    # Un huésped de 12 años o más paga el precio completo sin oferta, igual que en una reserva
+    hotel = todo_incluido.hotels[0]
+    room = todo_incluido.rooms_of(hotel)[0]
+    single = quote_all_inclusive(todo_incluido, hotel, room, 'Alta', CHECK_IN, CHECK_OUT, adults=1,
+                                 children_ages=[14], offer_2x1=offer_2x1, discount=discount)
+    group = quote_all_inclusive_group(todo_incluido, hotel, 'Alta', CHECK_IN, CHECK_OUT, [np.nan, 14], room,
+                                      offer_2x1=offer_2x1, discount=discount)
+    assert group.total_usd == pytest.approx(single.total_usd)
+    assert group.prices[1] == pytest.approx(single.subtotal)
+    assert (group.adults, group.children) == (1, 1)
+
+
+def test_group_room_names_ignore_case(todo_incluido):
+    hotel = todo_incluido.hotels[0]
+    room = todo_incluido.rooms_of(hotel)[0]
+    group = quote_all_inclusive_group(todo_incluido, hotel, 'Alta', CHECK_IN, CHECK_OUT, [np.nan, 8],
+                                      [room.upper(), room.lower()])
+    assert [line.room for line in group.lines] == [room]
+
+
+@pytest.mark.parametrize('ages, rooms, message', [
+    ([], 'Estándar', 'no tiene huéspedes'),
+    ([-1], 'Estándar', 'negativas'),
+    ([30, 8], ['Estándar'], 'habitación'),
+    ([30], 'Suite Presidencial', 'no tiene habitación'),
+])
+def test_group_rejects_invalid_input(todo_incluido, ages, rooms, message):
+    hotel = next(hotel for hotel in todo_incluido.hotels if 'Estándar' in todo_incluido.rooms_of(hotel))
+    with pytest.raises(ValueError, match=message):
+        quote_all_inclusive_group(todo_incluido, hotel, 'Alta', CHECK_IN, CHECK_OUT, ages, rooms)
+
+
+def test_guest_rates_give_promotions_only_to_guests_without_age():
+    ages = [np.nan, 3, 8, 14]
+    assert guest_rates(ages).tolist() == [1.0, 0.0, CHILD_RATE, 1.0]
+    assert guest_rates(ages, offer_2x1=True).tolist() == [0.5, 0.0, CHILD_RATE, 1.0]
+    assert guest_rates(ages, discount=20).tolist() == [0.8, 0.0, CHILD_RATE, 1.0]
+    # Si se indican ambos, prevalece el 2x1
+    assert guest_rates(ages, offer_2x1=True, discount=20)[0] == 0.5
+
+
+def test_group_matches_single_quotes(todo_incluido):
+    hotel = next(hotel for hotel in todo_incluido.hotels if len(todo_incluido.rooms_of(hotel)) >= 2)
+    first_room, second_room = todo_incluido.rooms_of(hotel)[:2]
+    ages = [np.nan, np.nan, 14, 8, 4, np.nan, 7]
+    rooms = [first_room] * 5 + [second_room] * 2
+    check_in, check_out = date(2026, 3, 28), date(2026, 4, 4)
+    for offer_2x1, discount in ((False, 0), (True, 0), (False, 15)):
+        group = quote_all_inclusive_group(todo_incluido, hotel, 'Automática', check_in, check_out, ages, rooms,
+                                          offer_2x1, discount)
+        first = quote_all_inclusive(todo_incluido, hotel, first_room, 'Automática', check_in, check_out,
+                                    adults=2, children_ages=[14, 8, 4], offer_2x1=offer_2x1, discount=discount)
+        second = quote_all_inclusive(todo_incluido, hotel, second_room, 'Automática', check_in, check_out,
+                                     adults=1, children_ages=[7], offer_2x1=offer_2x1, discount=discount)
+        assert group.lines[0].total_usd == pytest.approx(first.total_usd)
+        assert group.total_usd == pytest.approx(first.total_usd + second.total_usd)
+        assert group.adults == 3 and group.children == 4
+
+        shares = {line.room: line.shares for line in group.lines}
+        for option in cheapest_all_inclusive_group_check_ins(todo_incluido, hotel, 'Automática', 7, check_in,
+                                                             shares, window_days=30, limit=3):
+            moved = quote_all_inclusive_group(todo_incluido, hotel, 'Automática', option.check_in,
+                                              option.check_out, ages, rooms, offer_2x1, discount)
+            assert option.cost == pytest.approx(moved.total_usd)
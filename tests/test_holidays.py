@@ -0,0 +1,33 @@
+"""Festivos de Colombia y tipo de día de cada noche"""
+from datetime import date
+
+import pytest
+
+from pricing.holidays import colombian_holidays, easter_sunday
+from pricing.nights import count_nights, night_types
+from pricing.tariffs import WEEKDAY, WEEKEND
+
+
+@pytest.mark.parametrize('year, easter', [(2024, date(2024, 3, 31)), (2025, date(2025, 4, 20)),
+                                          (2026, date(2026, 4, 5)), (2038, date(2038, 4, 25))])
+def test_easter_sunday(year, easter):
+    assert easter_sunday(year) == easter
+
+
+def test_colombian_holidays_2026():
+    holidays = colombian_holidays(2026)
+    assert len(holidays) == 18
+    # Reyes se traslada al lunes 12 de enero; Jueves y Viernes Santo no se trasladan
+    assert {date(2026, 1, 12), date(2026, 4, 2), date(2026, 4, 3), date(2026, 7, 20)} <= holidays
+    assert date(2026, 1, 6) not in holidays
+
+
+def test_night_before_holiday_is_weekend():
+    # Domingo 11 de enero de 2026, víspera del festivo de Reyes
+    assert night_types(date(2026, 1, 11), date(2026, 1, 13)) == [WEEKEND, WEEKDAY]
+    assert count_nights(date(2026, 1, 9), date(2026, 1, 13)) == (1, 3)
+
+
+def test_count_nights_outside_calendar_uses_weekly_pattern():
+    # Solo viernes y sábado, sin festivos
+    assert count_nights(date(2150, 1, 1), date(2150, 1, 15)) == (10, 4)
@@ -0,0 +1,60 @@
+"""Mezcla de habitaciones más barata contra búsqueda exhaustiva"""
+import itertools
+import random
+from datetime import date
+
+import numpy as np
+import pytest
+
+from pricing import ROOM_CAPACITY, cheapest_room_mixes, quote_decas
+from pricing.room_mix import cheapest_mixes
+
+
+def brute_mixes(costs, capacities, guests, max_rooms, limit):
+    ranges = [range(1) if np.isnan(cost) else range((guests if bound is None else min(bound, guests)) + 1)
+              for cost, bound in zip(costs, max_rooms)]
+    mixes = []
+    for counts in itertools.product(*ranges):
+        capacity = sum(count * size for count, size in zip(counts, capacities))
+        # Sin habitaciones de sobra: quitar cualquiera deja huéspedes sin lugar
+        if capacity < guests or any(count and capacity - size >= guests
+                                    for count, size in zip(counts, capacities)):
+            continue
+        mixes.append((sum(count * cost for count, cost in zip(counts, costs) if count), counts))
+    mixes.sort(key=lambda mix: (round(mix[0], 6), sum(mix[1]), mix[1]))
+    return mixes[:limit]
+
+
+def test_cheapest_mixes_match_brute_force():
+    rng = random.Random(0)
+    for _ in range(300):
+        costs = [float(rng.randint(1, 40)) for _ in range(3)]
+        if rng.random() < 0.2:
+            costs[rng.randrange(3)] = np.nan
+        capacities = [rng.randint(1, 5) for _ in range(3)]
+        max_rooms = [rng.choice([None, None, 0, 1, 2, 3, 5]) for _ in range(3)]
+        guests, limit = rng.randint(1, 18), rng.randint(1, 12)
+        found = cheapest_mixes(costs, capacities, guests, max_rooms, limit)
+        expected = brute_mixes(costs, capacities, guests, max_rooms, limit)
+        assert [(round(cost, 6), counts) for cost, counts in found] == \
+            [(round(cost, 6), counts) for cost, counts in expected], (costs, capacities, max_rooms, guests)
+
+
+def test_cheapest_mixes_rejects_empty_group():
+    with pytest.raises(ValueError):
+        cheapest_mixes([1.0], [2], 0)
+
+
+def test_room_mixes_fit_the_group(decas):
+    hotel = decas.hotels[0]
+    check_in, check_out = date(2026, 3, 28), date(2026, 4, 4)
+    mixes = cheapest_room_mixes(decas, hotel, 'Automática', check_in, check_out, 11,
+                                capacity={'Cuádruple': 3}, max_rooms={'Triple': 1})
+    assert mixes
+    assert [mix.total_decas for mix in mixes] == sorted(mix.total_decas for mix in mixes)
+    capacity = {**ROOM_CAPACITY, 'Cuádruple': 3}
+    for mix in mixes:
+        assert mix.rooms.get('Triple', 0) <= 1
+        assert mix.capacity == sum(capacity[room] * count for room, count in mix.rooms.items()) >= 11
+        quote = quote_decas(decas, hotel, 'Automática', check_in, check_out, mix.rooms, include_admin=False)
+        assert mix.total_decas == pytest.approx(quote.total_decas)
@@ -0,0 +1,46 @@
+"""Calendario de temporadas por noche"""
+from datetime import date
+
+from pricing import AUTO_SEASON, SEASONS, load_season_calendar, quote_decas, reload_season_calendar
+from pricing.seasons import stay_profile
+
+
+def test_stay_spanning_seasons_counts_each_night(decas):
+    # 2025-01-12 es el último día de Alta; desde el 13 es Media
+    check_in, check_out = date(2025, 1, 10), date(2025, 1, 15)
+    profile = stay_profile(check_in, check_out, AUTO_SEASON)
+    assert profile[SEASONS.index('Alta')].sum() == 3
+    assert profile[SEASONS.index('Media')].sum() == 2
+
+    hotel = decas.hotels[0]
+    split = quote_decas(decas, hotel, AUTO_SEASON, check_in, check_out, {'Doble': 1})
+    high = quote_decas(decas, hotel, 'Alta', check_in, date(2025, 1, 13), {'Doble': 1})
+    mid = quote_decas(decas, hotel, 'Media', date(2025, 1, 13), check_out, {'Doble': 1})
+    assert split.total_decas == high.total_decas + mid.total_decas
+
+
+def test_decas_counts_nights_without_rate(decas):
+    # Los Radisson no tienen tarifa de temporada Alta
+    hotel = next(hotel for hotel in decas.hotels if 'MIRAFLORES' in hotel)
+    check_in, check_out = date(2026, 11, 2), date(2026, 11, 5)
+    quote = quote_decas(decas, hotel, 'Alta', check_in, check_out, {'Doble': 1})
+    line, = quote.lines
+    assert line.unpriced_nights == 3
+    assert quote.total_decas == 0
+
+    priced = quote_decas(decas, hotel, 'Baja', check_in, check_out, {'Doble': 1})
+    assert priced.lines[0].unpriced_nights == 0
+    assert priced.total_decas > 0
+
+
+def test_reload_season_calendar_picks_up_changes(tmp_path):
+    csv_path = tmp_path / 'temporadas.csv'
+    csv_path.write_text('Desde,Hasta,Temporada\n2026-01-01,2026-01-10,Alta\n', encoding='utf-8')
+    assert load_season_calendar(str(csv_path)).season_on(date(2026, 1, 5)) == 'Alta'
+
+    csv_path.write_text('Desde,Hasta,Temporada\n2026-01-01,2026-01-10,Media\n', encoding='utf-8')
+    assert load_season_calendar(str(csv_path)).season_on(date(2026, 1, 5)) == 'Alta'
+    calendar = reload_season_calendar(str(csv_path))
+    assert calendar.season_on(date(2026, 1, 5)) == 'Media'
+    # La recarga deja en la caché el calendario que leyó
+    assert load_season_calendar(str(csv_path)) is calendar
@@ -0,0 +1,125 @@
+import asyncio
+import json
+from datetime import date
+
+import pytest
+
+from pricing import quote_decas
+from pricing.server import QuoteServer, QuoteService
+
+STAY = {'check_in': '2026-11-02', 'check_out': '2026-11-05'}
+
+
+async def _exchange(server, raw):
+    """Envía bytes crudos y devuelve [(estado, cuerpo JSON)] de las respuestas"""
+    reader, writer = await asyncio.open_connection('127.0.0.1', server.port)
+    writer.write(raw)
+    await writer.drain()
+    responses = []
+    while True:
+        status_line = await reader.readline()
+        if not status_line:
+            break
+        headers = {}
+        while (line := await reader.readline()) not in (b'\r\n', b''):
+            name, _, value = line.decode('latin-1').partition(':')
+            headers[name.strip().lower()] = value.strip()
+        body = await reader.readexactly(int(headers['content-length']))
+        responses.append((int(status_line.split()[1]), json.loads(body)))
+        if headers.get('connection') == 'close':
+            break
+    writer.close()
+    return responses
+
+
+def _post(path, payload, close=True):
+    body = payload if isinstance(payload, bytes) else json.dumps(payload).encode()
+    connection = 'close' if close else 'keep-alive'
+    return (f"POST {path} HTTP/1.1\r\nConnection: {connection}\r\nContent-Length: {len(body)}\r\n\r\n"
+            .encode() + body)
+
+
+@pytest.fixture
+def exchange(todo_incluido, decas):
+    service = QuoteService(todo_incluido, decas)
+
+    def run(raw, routes=None):
+        async def main():
+            server = QuoteServer(service, max_workers=2, keep_alive_timeout=2)
+            server.routes.update(routes or {})
+            await server.start(port=0)
+            try:
+                return await _exchange(server, raw)
+            finally:
+                await server.close()
+        return asyncio.run(main())
+    return run
+
+
+def test_decas_quote_matches_engine(exchange, decas):
+    hotel = decas.hotels[0]
+    (status, body), = exchange(_post('/quote/decas', {'hotel': hotel, 'season': 'Automática',
+                                                      'rooms': {'Doble': 2}, **STAY}))
+    assert status == 200
+    quote = quote_decas(decas, hotel, 'Automática', date(2026, 11, 2), date(2026, 11, 5), {'Doble': 2})
+    assert body['total_decas'] == pytest.approx(quote.total_decas)
+
+
+def test_keep_alive_serves_several_requests(exchange):
+    responses = exchange(b"GET /health HTTP/1.1\r\n\r\n" + _post('/quote/decas/batch', {'itineraries': []}))
+    assert [status for status, _ in responses] == [200, 200]
+    assert responses[1][1] == []
+
+
+def test_batch_returns_null_for_unknown_hotel(exchange):
+    (status, body), = exchange(_post('/quote/decas/batch', {'itineraries': [
+        {'hotel': 'NOPE', 'season': 'Alta', 'rooms': {'Doble': 1}, **STAY}]}))
+    assert status == 200
+    assert body[0]['total_decas'] is None
+
+
+# HOTEL se reemplaza por un hotel del tarifario
+@pytest.mark.parametrize('path, payload, status, message', [
+    ('/quote/todo-incluido', {'hotel': 'NOPE', 'room': 'Estándar', 'season': 'Alta', **STAY}, 400, 'Hotel desconocido'),
+    ('/quote/todo-incluido', {'hotel': 'DECAMERON PANACA', 'room': 'Beach View / Ocean View', 'season': 'Alta',
+                              **STAY}, 400, 'no tiene habitación'),
+    ('/quote/decas', {'hotel': 'NOPE', 'season': 'Alta', 'rooms': {'Doble': 1}, **STAY}, 400, 'Hotel desconocido'),
+    ('/quote/decas', {'hotel': 'HOTEL', 'season': 'baja', 'rooms': {'Doble': 1}, **STAY}, 400, 'Temporada desconocida'),
+    ('/quote/decas', {'hotel': 'HOTEL', 'season': 'Alta', 'rooms': {'Dobles': 1}, **STAY}, 400, 'Habitación desconocida'),
+    ('/quote/decas', {'hotel': 'HOTEL', 'season': 'Alta', 'rooms': ['Doble'], **STAY}, 400, "'rooms'"),
+    ('/quote/decas', {'hotel': 'HOTEL', 'season': 'Alta', 'rooms': {'Doble': 1}}, 400, "'check_in'"),
+    ('/quote/decas', {'hotel': 'HOTEL', 'season': 'Alta', 'rooms': {'Doble': 1}, **STAY, 'check_out': 'mañana'},
+     400, 'Fecha inválida'),
+    ('/quote/decas/batch', {'itineraries': [{'rooms': ['Doble']}]}, 400, "'rooms'"),
+    ('/quote/decas/batch', {'itineraries': {}}, 400, "'itineraries'"),
+])
+def test_invalid_quotes_are_client_errors(exchange, decas, path, payload, status, message):
+    if payload.get('hotel') == 'HOTEL':
+        payload = dict(payload, hotel=decas.hotels[0])
+    (got, body), = exchange(_post(path, payload))
+    assert got == status
+    assert message in body['error']
+
+
+@pytest.mark.parametrize('raw, status', [
+    (b"POST /quote/decas HTTP/1.1\r\nConnection: close\r\nContent-Length: abc\r\n\r\n", 400),
+    (b"POST /quote/decas HTTP/1.1\r\nConnection: close\r\nContent-Length: -5\r\n\r\n", 400),
+    (_post('/quote/decas', b'{not json'), 400),
+    (_post('/quote/decas', b'[1, 2]'), 400),
+    (b"GARBAGE\r\n\r\n", 400),
+    (b"GET /quote/decas HTTP/1.1\r\nConnection: close\r\n\r\n", 405),
+    (b"GET /nope HTTP/1.1\r\nConnection: close\r\n\r\n", 404),
+])
+def test_malformed_requests_get_a_response(exchange, raw, status):
+    (got, body), *_ = exchange(raw)
+    assert got == status
+    assert body['error']
+
+
+def test_unexpected_errors_answer_500_and_close(exchange):
+    def crash(body):
+        raise RuntimeError("boom")
+
+    responses = exchange(_post('/quote/decas', {}, close=False) + b"GET /health HTTP/1.1\r\n\r\n",
+                         routes={('POST', '/quote/decas'): crash})
+    assert responses == [(500, {'error': "Error interno del servidor"})]
@@ -0,0 +1,65 @@
+"""Bloques de semana completa contra búsqueda exhaustiva"""
+from datetime import date
+from functools import lru_cache
+
+import numpy as np
+import pytest
+
+from pricing import quote_decas
+from pricing.weeks import WEEK_NIGHTS, block_starts, cheapest_split
+
+
+def brute_split(nightly, weekly):
+    @lru_cache(maxsize=None)
+    def cost(night):
+        if night >= len(nightly):
+            return 0.0
+        options = [nightly[night] + cost(night + 1)]
+        if night + WEEK_NIGHTS <= len(nightly) and not np.isnan(weekly[night]):
+            options.append(weekly[night] + cost(night + WEEK_NIGHTS))
+        return min(options)
+    return cost(0)
+
+
+def test_cheapest_split_matches_brute_force():
+    rng = np.random.default_rng(1)
+    for _ in range(300):
+        nights = rng.integers(1, 22)
+        nightly = rng.integers(1, 20, nights).astype(float)
+        weekly = rng.integers(40, 120, nights).astype(float)
+        weekly[rng.random(nights) < 0.3] = np.nan
+        cost, took = cheapest_split(nightly, weekly)
+        assert cost == pytest.approx(brute_split(tuple(nightly), tuple(weekly)))
+
+        # Los bloques elegidos reproducen el costo
+        starts = block_starts(took)
+        covered = np.zeros(nights, dtype=bool)
+        for start in starts:
+            assert not covered[start:start + WEEK_NIGHTS].any()
+            covered[start:start + WEEK_NIGHTS] = True
+        assert nightly[~covered].sum() + weekly[starts].sum() == pytest.approx(cost)
+
+
+def test_cheapest_split_is_vectorized():
+    rng = np.random.default_rng(2)
+    nightly = rng.integers(1, 20, (5, 15)).astype(float)
+    weekly = rng.integers(40, 120, (5, 15)).astype(float)
+    costs, _ = cheapest_split(nightly, weekly)
+    assert costs.tolist() == pytest.approx([cheapest_split(n, w)[0] for n, w in zip(nightly, weekly)])
+
+
+def test_decas_quote_uses_cheaper_week_blocks(decas):
+    # Semana Santa: los festivos entre semana se cobran como fin de semana y el bloque sale más barato
+    check_in, check_out = date(2026, 3, 28), date(2026, 4, 11)
+    with_blocks = 0
+    for hotel in decas.hotels:
+        line = quote_decas(decas, hotel, 'Baja', check_in, check_out, {'Doble': 2}).lines[0]
+        nightly = sum(season.amount for season in line.seasons)
+        assert line.decas_per_room == pytest.approx(nightly - line.week_savings)
+        assert line.week_savings >= 0
+        assert line.decas == pytest.approx(2 * line.decas_per_room)
+        if line.week_blocks:
+            with_blocks += 1
+            assert line.week_savings > 0
+            assert all(block.first_night >= check_in for block in line.week_blocks)
+    assert with_blocks > 0